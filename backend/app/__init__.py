@@ -1,20 +1,51 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_cors import CORS
 from app.config import Config
+from app.db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 
-def create_app():
+def create_app(schema_mode=None):
+    """schema_mode overrides STARTUP_SCHEMA_MODE, e.g. 'skip' for the migration CLI"""
     app = Flask(__name__)
     app.config.from_object(Config)
+    if schema_mode is not None:
+        app.config['STARTUP_SCHEMA_MODE'] = schema_mode
+    
+    from app.utils import pool_metrics, replica, compression, query_stats, profiler, cors
+    from app.utils.events import availability_broker, prune_availability_changes
+    from app.utils.rate_limit import rate_limiter
+    from app.utils.metrics import request_metrics
+    from app.utils.scheduler import scheduler
+    from app.utils.concert_status import update_concert_statuses
+    from app.utils.order_archive import archive_orders
+    from app.utils.seating import release_expired_holds
+    from app.utils.waitlist import promote_waitlist
+    pool_metrics.configure(app)
     
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
-    CORS(app)
+    cors.init_app(app)
+    
+    pool_metrics.init_app(app, db)
+    query_stats.init_app(app, db)
+    replica.init_app(app)
+    availability_broker.init_app(app)
+    # Metrics before compression: after_request hooks run in reverse, so sizes are measured compressed
+    request_metrics.init_app(app)
+    compression.init_app(app)
+    rate_limiter.init_app(app)
+    profiler.init_app(app)
+    scheduler.init_app(app)
+    scheduler.add_job('concert_status', app.config['CONCERT_STATUS_INTERVAL'], update_concert_statuses)
+    if app.config['ORDER_ARCHIVE_ENABLED']:
+        scheduler.add_job('order_archive', app.config['ORDER_ARCHIVE_INTERVAL'], archive_orders)
+    scheduler.add_job('seat_hold_sweep', app.config['SEAT_HOLD_SWEEP_INTERVAL'], release_expired_holds)
+    scheduler.add_job('waitlist', app.config['WAITLIST_INTERVAL'], promote_waitlist)
+    scheduler.add_job('availability_changes_prune', 60, prune_availability_changes)
     
     # Register blueprints
     from app.routes.auth import auth_bp
@@ -22,15 +53,27 @@ def create_app():
     from app.routes.tickets import tickets_bp
     from app.routes.orders import orders_bp
     from app.routes.admin import admin_bp
+    from app.routes.seating import seating_bp
+    from app.routes.waitlist import waitlist_bp
+    from app.routes.metrics import metrics_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(concerts_bp, url_prefix='/api/concerts')
     app.register_blueprint(tickets_bp, url_prefix='/api/tickets')
     app.register_blueprint(orders_bp, url_prefix='/api/orders')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(seating_bp, url_prefix='/api/seating')
+    app.register_blueprint(waitlist_bp, url_prefix='/api/waitlist')
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # Create tables, or just verify the schema version in production
+    schema_mode = app.config['STARTUP_SCHEMA_MODE']
+    if schema_mode == 'create':
+        with app.app_context():
+            db.create_all()
+    elif schema_mode == 'verify':
+        from app.utils.database import verify_schema_version
+        with app.app_context():
+            verify_schema_version()
     
     return app
\ No newline at end of file
@@ -0,0 +1,422 @@
+"""
+Asyncio serving path for the catalogue reads.
+
+GET /api/concerts, /api/concerts/<id>, /api/concerts/<id>/tickets and
+/api/tickets/<id> are answered by async handlers on an async SQLAlchemy
+engine (aiomysql / aiosqlite), so a single process can keep thousands of
+slow clients waiting on the database. The availability SSE stream
+(/api/concerts/<id>/availability/stream) is served here too: an idle
+subscriber is a coroutine waiting on the broker, not a worker thread.
+Every other request is handed to the regular Flask app through an
+ASGI-to-WSGI adapter.
+
+The handlers keep the guarantees of the Flask views they mirror: request
+metrics under the Flask endpoint name, query stats and @query_budget,
+@replica_read routing (with the signed last-write marker), any
+@rate_limit policy on the view, ROW_SERIALIZATION, compression and CORS.
+The header logic itself lives with the Flask hooks (RateLimiter.enforce,
+query_stats.report, compression.negotiate_body, cors.cors_headers) and is
+only called from here; tests/test_asgi.py compares the headers of both.
+
+    uvicorn asgi:app --workers 4       (see backend/asgi.py)
+"""
+import asyncio
+import functools
+import json
+import re
+import traceback
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from flask_jwt_extended import decode_token
+from app.db_routing import choose_replica
+from app.models.concert import Concert
+from app.models.ticket_type import TicketType
+from app.models.rows import ConcertRow, TicketTypeRow
+from app.models.serialization import Fieldset, FieldsetError
+from app.utils.helpers import pagination_meta
+from app.utils.metrics import request_metrics
+from app.utils.query_stats import QueryStats, request_stats, report, listen
+from app.utils.rate_limit import rate_limiter
+from app.utils.replica import LAST_WRITE_HEADER, LAST_WRITE_COOKIE, marker_is_fresh
+from app.utils.compression import choose_encoding, compression_level, negotiate_body, StreamCompressor
+from app.utils.cors import cors_headers
+from app.utils.availability import AVAILABILITY_FIELDS
+from app.utils.events import availability_broker
+
+# Sync driver -> async driver for the same database
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+# Engine options the async pool understands
+ASYNC_ENGINE_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping', 'isolation_level')
+
+def async_database_url(database_uri):
+    url = make_url(database_uri)
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url
+    if url.drivername not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for {url.drivername}; set ASYNC_DATABASE_URL')
+    return url.set(drivername=ASYNC_DRIVERS[url.drivername])
+
+
+class AsyncCatalogueApp:
+    """ASGI application: async catalogue handlers in front of the Flask app"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        # Match Flask's jsonify: indented in debug, compact otherwise
+        self.json_options = {'indent': 2} if flask_app.debug else {'separators': (',', ':')}
+        
+        config = flask_app.config
+        self.engine = self.create_engine(
+            config.get('ASYNC_DATABASE_URL') or config['SQLALCHEMY_DATABASE_URI'],
+            config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        )
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        
+        # Same replicas as SQLALCHEMY_BINDS / REPLICA_BIND_KEYS
+        self.replica_engines = {
+            key: self.create_engine(config['SQLALCHEMY_BINDS'][key]['url'], config['SQLALCHEMY_BINDS'][key])
+            for key in config.get('REPLICA_BIND_KEYS') or []
+        }
+        self.replica_session_factories = {
+            key: async_sessionmaker(engine, expire_on_commit=False) for key, engine in self.replica_engines.items()
+        }
+        
+        if config['QUERY_STATS_ENABLED']:
+            for engine in [self.engine, *self.replica_engines.values()]:
+                listen(engine.sync_engine)
+        
+        # (pattern, handler, endpoint of the Flask view it mirrors, message of its 500)
+        self.routes = [
+            (re.compile(r'^/api/concerts/?$'), self.get_concerts, 'concerts.get_concerts',
+             'Failed to retrieve concerts'),
+            (re.compile(r'^/api/concerts/(\d+)$'), self.get_concert, 'concerts.get_concert',
+             'Failed to retrieve concert'),
+            (re.compile(r'^/api/concerts/(\d+)/tickets$'), self.get_concert_tickets, 'concerts.get_concert_tickets',
+             'Failed to retrieve concert tickets'),
+            (re.compile(r'^/api/tickets/(\d+)$'), self.get_ticket, 'tickets.get_ticket',
+             'Failed to retrieve ticket type'),
+        ]
+        self.streams = [
+            (re.compile(r'^/api/concerts/(\d+)/availability/stream$'), self.stream_availability),
+        ]
+
+    @staticmethod
+    def create_engine(database_uri, engine_options):
+        url = async_database_url(database_uri)
+        options = {key: value for key, value in engine_options.items() if key in ASYNC_ENGINE_OPTIONS}
+        if url.get_backend_name() == 'mysql':
+            url = url.update_query_dict({'charset': 'utf8mb4'})
+        return create_async_engine(url, **options)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, handler in self.streams:
+                match = pattern.match(scope['path'])
+                if match:
+                    return await handler(scope, receive, send, *(int(group) for group in match.groups()))
+            for pattern, handler, endpoint, failure in self.routes:
+                match = pattern.match(scope['path'])
+                if match:
+                    ids = [int(group) for group in match.groups()]
+                    return await self.serve(scope, send, handler, endpoint, failure, ids)
+        
+        return await self.wsgi(scope, receive, send)
+
+    async def serve(self, scope, send, handler, endpoint, failure, ids):
+        """Run a handler with the request hooks of the Flask view it mirrors"""
+        config = self.flask_app.config
+        view = self.flask_app.view_functions[endpoint]
+        started_at = request_metrics.begin(endpoint) if request_metrics.enabled else None
+        status, size = 500, None
+        try:
+            headers = []
+            policy = getattr(view, 'rate_limit', None)
+            if policy is not None and rate_limiter.enabled:
+                policy_name, key = policy
+                # The redis backend is a network round trip: keep it off the event loop
+                limit_headers, refusal = await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(rate_limiter.enforce, policy_name, key, self.client_key(scope, key))
+                )
+                headers += limit_headers.items()
+                if refusal is not None:
+                    status = 429
+                    size = await self.respond(scope, send, self.envelope(False, refusal), status, headers)
+                    return
+            
+            sessions = self.session_factory
+            replica_keys = config.get('REPLICA_BIND_KEYS')
+            if replica_keys and getattr(view, 'replica_read', False) and not self.wrote_recently(scope):
+                sessions = self.replica_session_factories[choose_replica(replica_keys)]
+            
+            args = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            stats = QueryStats() if config['QUERY_STATS_ENABLED'] else None
+            token = request_stats.set(stats)
+            try:
+                body, status = await handler(sessions, args, *ids)
+            except FieldsetError as e:
+                body, status = self.envelope(False, str(e)), 400
+            except Exception as e:
+                print(f"❌ {endpoint} failed on the asyncio path: {str(e)}")
+                print(traceback.format_exc())
+                body, status = self.envelope(False, failure), 500
+            finally:
+                request_stats.reset(token)
+            
+            if stats is not None and stats.count:  # Like g.query_stats, only set once a statement ran
+                budget = getattr(view, 'query_budget', None)
+                headers += report(stats, endpoint, budget, config).items()
+            
+            size = await self.respond(scope, send, body, status, headers)
+        finally:
+            if started_at is not None:
+                request_metrics.finish(endpoint, scope['method'], status, started_at, size)
+
+    @staticmethod
+    def header(scope, name):
+        return b', '.join(value for key, value in scope['headers'] if key == name).decode('latin-1')
+
+    def wrote_recently(self, scope):
+        """replica.wrote_recently() for an ASGI scope"""
+        token = self.header(scope, LAST_WRITE_HEADER.lower().encode())
+        if not token:
+            cookie = SimpleCookie(self.header(scope, b'cookie'))
+            token = cookie[LAST_WRITE_COOKIE].value if LAST_WRITE_COOKIE in cookie else None
+        return marker_is_fresh(token, self.flask_app.config)
+
+    def client_key(self, scope, key):
+        """RateLimiter.client_key() for an ASGI scope"""
+        if key == 'user':
+            authorization = self.header(scope, b'authorization')
+            if authorization.startswith('Bearer '):
+                try:
+                    with self.flask_app.app_context():
+                        claims = decode_token(authorization[len('Bearer '):])
+                    return f"user:{claims[self.flask_app.config['JWT_IDENTITY_CLAIM']]}"
+                except Exception:
+                    pass  # Invalid token: keyed by IP, like the Flask side
+        
+        forwarded = self.header(scope, b'x-forwarded-for')
+        if rate_limiter.trust_proxy and forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+        client = scope.get('client')
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for engine in [self.engine, *self.replica_engines.values()]:
+                    await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def envelope(success, message, data=None):
+        # Same envelope as success_response / error_response
+        response = {'success': success, 'message': message}
+        if data is not None:
+            response['data'] = data
+        return response
+
+    def response_headers(self, scope, headers):
+        """Encode (name, value) pairs for http.response.start, CORS headers last as flask_cors adds them"""
+        headers = [*headers, *cors_headers(self.header(scope, b'origin') or None)]
+        return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+    async def respond(self, scope, send, body, status, extra_headers=()):
+        """Send a JSON response; returns its size on the wire"""
+        payload = (json.dumps(body, sort_keys=True, **self.json_options) + '\n').encode('utf-8')
+        headers = [('Content-Type', 'application/json'), *extra_headers]
+        
+        config = self.flask_app.config
+        if config['COMPRESSION_ENABLED']:
+            payload, encoding, vary = negotiate_body(payload, self.header(scope, b'accept-encoding'), config)
+            if vary:
+                headers.append(('Vary', 'Accept-Encoding'))
+            if encoding:
+                headers.append(('Content-Encoding', encoding))
+        
+        headers.append(('Content-Length', str(len(payload))))
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': self.response_headers(scope, headers)
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+        return len(payload)
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def stream_availability(self, scope, receive, send, concert_id):
+        """Async twin of concerts.stream_concert_availability"""
+        try:
+            async with self.session_factory() as session:
+                exists = await session.scalar(select(Concert.concert_id).where(Concert.concert_id == concert_id))
+                rows = (await session.execute(
+                    select(TicketType.ticket_type_id, TicketType.price, TicketType.quantity_available)
+                    .where(TicketType.concert_id == concert_id)
+                    .order_by(TicketType.ticket_type_id)
+                )).all() if exists else []
+        except Exception as e:
+            print(f"❌ Availability stream failed on the asyncio path: {str(e)}")
+            print(traceback.format_exc())
+            return await self.respond(scope, send, self.envelope(False, 'Failed to open availability stream'), 500)
+        if not exists:
+            return await self.respond(scope, send, self.envelope(False, 'Concert not found'), 404)
+        
+        initial_payload = availability_broker.encode(
+            concert_id, [(ticket_type_id, float(price), available) for ticket_type_id, price, available in rows]
+        )
+        config = self.flask_app.config
+        keepalive = config['SSE_KEEPALIVE_INTERVAL']
+        headers = [
+            ('Content-Type', 'text/event-stream; charset=utf-8'),
+            ('Cache-Control', 'no-cache'),
+            ('X-Accel-Buffering', 'no'),
+        ]
+        compressor = None
+        if config['COMPRESSION_ENABLED']:
+            headers.append(('Vary', 'Accept-Encoding'))
+            encoding = choose_encoding(self.header(scope, b'accept-encoding'), config['COMPRESSION_ALGORITHMS'])
+            if encoding:
+                # Sync-flushed per event, like compress_stream on the Flask side
+                compressor = StreamCompressor(encoding, compression_level(config, encoding))
+                headers.append(('Content-Encoding', encoding))
+        
+        async def send_event(text):
+            body = text.encode('utf-8')
+            await send({
+                'type': 'http.response.body',
+                'body': compressor.compress(body, flush=True) if compressor else body,
+                'more_body': True
+            })
+        
+        subscriber = availability_broker.subscribe(concert_id, asyncio.get_running_loop())
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': self.response_headers(scope, headers)})
+            await send_event(initial_payload)
+            while not disconnected.done():
+                waiter = asyncio.ensure_future(subscriber.wait_async(keepalive))
+                await asyncio.wait({waiter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not waiter.done():
+                    waiter.cancel()
+                    break
+                payload = waiter.result()
+                await send_event(payload if payload is not None else ': keepalive\n\n')
+        except OSError:
+            pass  # Client went away mid-send
+        finally:
+            availability_broker.unsubscribe(subscriber)
+            disconnected.cancel()
+
+    @staticmethod
+    def int_arg(args, name, default):
+        try:
+            return int(args[name][0])
+        except (KeyError, IndexError, ValueError):
+            return default
+
+    @staticmethod
+    def fieldset_arg(args, model):
+        """Sparse fieldset of fields= / include= (see app/models/serialization.py)"""
+        fieldset = Fieldset.parse(args.get('fields', []), args.get('include', []))
+        model.check_fieldset(fieldset)
+        return fieldset
+
+    # Handlers (mirror app/routes/concerts.py and app/routes/tickets.py)
+
+    async def get_concerts(self, sessions, args):
+        page = self.int_arg(args, 'page', 1)
+        per_page = self.int_arg(args, 'per_page', 10)
+        status = args.get('status', [None])[0]
+        search = args.get('search', [None])[0]
+        fieldset = self.fieldset_arg(args, Concert)
+        criteria = Concert.catalogue_filters(status, search)
+        
+        async with sessions() as session:
+            total = await session.scalar(select(func.count(Concert.concert_id)).where(*criteria))
+            if self.flask_app.config['ROW_SERIALIZATION']:
+                def fetch_rows(sync_session):
+                    query = sync_session.query(Concert).filter(*criteria).order_by(*Concert.catalogue_order())
+                    query = ConcertRow.query(query, fieldset).offset((page - 1) * per_page).limit(per_page)
+                    return ConcertRow.from_result(query.all(), fieldset, session=sync_session)
+                concerts = await session.run_sync(fetch_rows)
+            else:
+                concerts = (await session.scalars(
+                    select(Concert).where(*criteria)
+                    .order_by(*Concert.catalogue_order())
+                    .offset((page - 1) * per_page).limit(per_page)
+                    .options(*Concert.fieldset_options(fieldset))
+                )).all()
+            items = [concert.to_dict(fieldset) for concert in concerts]
+        
+        result = {'items': items, 'pagination': pagination_meta(page, per_page, total)}
+        return self.envelope(True, 'Concerts retrieved successfully', result), 200
+
+    async def get_concert(self, sessions, args, concert_id):
+        fieldset = self.fieldset_arg(args, Concert)
+        async with sessions() as session:
+            concert = await session.get(Concert, concert_id, options=Concert.fieldset_options(fieldset))
+            if not concert:
+                return self.envelope(False, 'Concert not found'), 404
+            concert_data = concert.to_dict(fieldset)
+        
+        return self.envelope(True, 'Concert retrieved successfully', concert_data), 200
+
+    async def get_concert_tickets(self, sessions, args, concert_id):
+        fieldset = self.fieldset_arg(args, TicketType)
+        async with sessions() as session:
+            exists = await session.scalar(select(Concert.concert_id).where(Concert.concert_id == concert_id))
+            if not exists:
+                return self.envelope(False, 'Concert not found'), 404
+            if self.flask_app.config['ROW_SERIALIZATION']:
+                tickets = await session.run_sync(
+                    lambda sync_session: TicketTypeRow.fetch(
+                        fieldset, TicketType.concert_id == concert_id, session=sync_session
+                    )
+                )
+            else:
+                tickets = (await session.scalars(
+                    select(TicketType).where(TicketType.concert_id == concert_id)
+                    .options(*TicketType.fieldset_options(fieldset))
+                )).all()
+            tickets_data = [ticket.to_dict(fieldset) for ticket in tickets]
+        
+        return self.envelope(True, 'Concert tickets retrieved successfully', tickets_data), 200
+
+    async def get_ticket(self, sessions, args, ticket_id):
+        fieldset = self.fieldset_arg(args, TicketType)
+        async with sessions() as session:
+            ticket = await session.get(TicketType, ticket_id, options=TicketType.fieldset_options(fieldset))
+            if not ticket:
+                return self.envelope(False, 'Ticket type not found'), 404
+            ticket_data = ticket.to_dict(fieldset)
+        
+        return self.envelope(True, 'Ticket type retrieved successfully', ticket_data), 200
+
+
+def create_asgi_app(flask_app=None):
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app()
+    return AsyncCatalogueApp(flask_app)
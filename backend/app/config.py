@@ -3,6 +3,43 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def engine_options(database_uri):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from DB_* environment variables"""
+    options = {
+        'pool_pre_ping': env_bool('DB_POOL_PRE_PING', True)
+    }
+    
+    # SQLite uses SingletonThreadPool/StaticPool which reject queue pool sizing
+    if not database_uri.startswith('sqlite'):
+        options.update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800))  # Below MySQL wait_timeout
+        })
+    
+    isolation_level = os.environ.get('DB_ISOLATION_LEVEL')
+    if isolation_level:
+        options['isolation_level'] = isolation_level.strip().upper()
+    
+    return options
+
+def replica_binds(database_uri):
+    """Build SQLALCHEMY_BINDS entries for DATABASE_REPLICA_URLS (comma separated)"""
+    urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    return {
+        f'replica_{index}': {'url': url, **engine_options(url)}
+        for index, url in enumerate(urls, start=1)
+    }
+
 class Config:
     # FIX: Gunakan secret key yang sama untuk kedua konfigurasi
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string-dev-only'
@@ -10,4 +47,109 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'mysql+pymysql://root:@localhost/concert_app2'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_ACCESS_TOKEN_EXPIRES = False  # Token tidak expire untuk development
\ No newline at end of file
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    
+    # create: db.create_all() on boot (development), verify: one schema version check, skip: nothing
+    STARTUP_SCHEMA_MODE = os.environ.get('STARTUP_SCHEMA_MODE', 'create').strip().lower()
+    
+    # Read replicas for replica_read GET handlers
+    SQLALCHEMY_BINDS = replica_binds(SQLALCHEMY_DATABASE_URI)
+    REPLICA_BIND_KEYS = list(SQLALCHEMY_BINDS)
+    REPLICA_STALENESS_WINDOW = float(os.environ.get('REPLICA_STALENESS_WINDOW', 5))  # Seconds a writer stays on the primary
+    
+    # Async catalogue reads (asgi.py); derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    JWT_ACCESS_TOKEN_EXPIRES = False  # Token tidak expire untuk development
+    
+    # Batch availability endpoint (GET /api/concerts/availability)
+    AVAILABILITY_CACHE_TTL = float(os.environ.get('AVAILABILITY_CACHE_TTL', 2))
+    AVAILABILITY_MAX_IDS = int(os.environ.get('AVAILABILITY_MAX_IDS', 300))
+    
+    # Live availability stream (GET /api/concerts/<id>/availability/stream)
+    SSE_MIN_INTERVAL = float(os.environ.get('SSE_MIN_INTERVAL', 0.25))  # Max ~4 updates/sec per concert
+    SSE_KEEPALIVE_INTERVAL = float(os.environ.get('SSE_KEEPALIVE_INTERVAL', 15))
+    SSE_CHANGE_RETENTION = int(os.environ.get('SSE_CHANGE_RETENTION', 300))  # Seconds availability_changes rows are kept
+    SSE_SHARED_FANOUT = env_bool('SSE_SHARED_FANOUT', True)  # Off: no availability_changes rows, streams only see local writes
+    
+    # Response compression (br only when the Brotli package is installed)
+    COMPRESSION_ENABLED = env_bool('COMPRESSION_ENABLED', True)
+    COMPRESSION_ALGORITHMS = [name.strip() for name in os.environ.get('COMPRESSION_ALGORITHMS', 'br,gzip').split(',') if name.strip()]
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # Bytes; smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_MIMETYPES = [
+        'application/json', 'text/event-stream', 'text/csv', 'text/plain', 'text/html'
+    ]
+    
+    # Background jobs (see app/utils/scheduler.py); one leader per job across all processes and nodes
+    SCHEDULER_ENABLED = env_bool('SCHEDULER_ENABLED', True)
+    SCHEDULER_LEASE_GRACE = float(os.environ.get('SCHEDULER_LEASE_GRACE', 30))  # Lease = job interval + this; renewed while a job runs
+    
+    # Concert status transitions by date/time (see app/utils/concert_status.py)
+    CONCERT_STATUS_INTERVAL = float(os.environ.get('CONCERT_STATUS_INTERVAL', 60))
+    CONCERT_DURATION_HOURS = float(os.environ.get('CONCERT_DURATION_HOURS', 4))  # ongoing -> completed after this
+    CONCERT_TIMEZONE = os.environ.get('CONCERT_TIMEZONE')  # e.g. Asia/Jakarta; concert dates are local, default server time
+    
+    # Hot/cold order archival (see app/utils/order_archive.py), run by the scheduler
+    ORDER_ARCHIVE_ENABLED = env_bool('ORDER_ARCHIVE_ENABLED', True)
+    ORDER_ARCHIVE_INTERVAL = float(os.environ.get('ORDER_ARCHIVE_INTERVAL', 3600))
+    ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get('ORDER_ARCHIVE_AFTER_DAYS', 30))  # Days after the concert date
+    ORDER_ARCHIVE_BATCH_SIZE = int(os.environ.get('ORDER_ARCHIVE_BATCH_SIZE', 500))  # Orders per transaction
+    ORDER_ARCHIVE_MAX_BATCHES = int(os.environ.get('ORDER_ARCHIVE_MAX_BATCHES', 200))  # Per run
+    ORDER_ARCHIVE_SLEEP = float(os.environ.get('ORDER_ARCHIVE_SLEEP', 0.1))  # Pause between batches
+    
+    # List endpoints serialize slotted row objects instead of ORM instances (see app/models/rows.py)
+    ROW_SERIALIZATION = env_bool('ROW_SERIALIZATION', True)
+    
+    # Assigned seating (see app/utils/seating.py)
+    SEAT_HOLD_TTL = int(os.environ.get('SEAT_HOLD_TTL', 600))  # Seconds a hold waits for its order
+    SEAT_HOLD_MAX_SEATS = int(os.environ.get('SEAT_HOLD_MAX_SEATS', 10))  # Contiguous seats per hold
+    SEAT_HOLD_USER_MAX_HOLDS = int(os.environ.get('SEAT_HOLD_USER_MAX_HOLDS', 3))  # Open holds per user and concert
+    SEAT_HOLD_USER_MAX_SEATS = int(os.environ.get('SEAT_HOLD_USER_MAX_SEATS', 10))  # Seats held per user and concert
+    SEAT_HOLD_RETRIES = int(os.environ.get('SEAT_HOLD_RETRIES', 20))  # Retries after losing a race for a section
+    SEAT_HOLD_SKIP_LOCKED = env_bool('SEAT_HOLD_SKIP_LOCKED', False)  # FOR UPDATE SKIP LOCKED; MySQL 8+ / MariaDB 10.6+
+    SEAT_HOLD_SWEEP_INTERVAL = float(os.environ.get('SEAT_HOLD_SWEEP_INTERVAL', 60))  # Expired-hold release job
+    
+    # Waitlist for sold-out ticket types (see app/utils/waitlist.py), promoted by the scheduler
+    WAITLIST_INTERVAL = float(os.environ.get('WAITLIST_INTERVAL', 10))
+    WAITLIST_CLAIM_WINDOW = int(os.environ.get('WAITLIST_CLAIM_WINDOW', 900))  # Seconds to claim an offer
+    WAITLIST_BATCH_SIZE = int(os.environ.get('WAITLIST_BATCH_SIZE', 100))  # Entries offered per transaction
+    WAITLIST_MAX_QUANTITY = int(os.environ.get('WAITLIST_MAX_QUANTITY', 10))  # Tickets per entry
+    WAITLIST_LOOKAHEAD = int(os.environ.get('WAITLIST_LOOKAHEAD', 20))  # Entries too large for the stock passed over per run
+    
+    # Bulk concert import (POST /api/concerts/import, import_concerts.py)
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))  # Concerts per multi-row INSERT + commit
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 1000))  # Row errors listed in the response
+    
+    # Token-bucket rate limits, "<burst>/<seconds>" per client (see app/utils/rate_limit.py)
+    RATE_LIMIT_ENABLED = env_bool('RATE_LIMIT_ENABLED', True)
+    RATE_LIMIT_STORAGE_URL = os.environ.get('RATE_LIMIT_STORAGE_URL', 'memory://')  # redis://host:6379/0 for several nodes
+    RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))  # Per process, memory:// only
+    RATE_LIMIT_TRUST_PROXY = env_bool('RATE_LIMIT_TRUST_PROXY', False)  # Key by X-Forwarded-For behind a reverse proxy
+    RATE_LIMITS = {
+        'login': os.environ.get('RATE_LIMIT_LOGIN', '10/60'),  # Per IP
+        'create_order': os.environ.get('RATE_LIMIT_CREATE_ORDER', '5/60'),  # Per user
+        'ticket_pdf': os.environ.get('RATE_LIMIT_TICKET_PDF', '20/60'),  # Per user, download + preview
+        'seat_hold': os.environ.get('RATE_LIMIT_SEAT_HOLD', '20/60'),  # Per user
+    }
+    
+    # Per-request SQL statement counting (see app/utils/query_stats.py)
+    QUERY_STATS_ENABLED = env_bool('QUERY_STATS_ENABLED', True)
+    QUERY_STATS_HEADERS = env_bool('QUERY_STATS_HEADERS', env_bool('FLASK_DEBUG'))  # X-DB-* response headers, dev only
+    QUERY_STATS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_STATS_N_PLUS_ONE_THRESHOLD', 5))  # Same statement this often
+    QUERY_BUDGET_STRICT = env_bool('QUERY_BUDGET_STRICT', False)  # Raise QueryBudgetExceeded instead of logging
+    
+    # On-demand request profiling (see app/utils/profiler.py); off unless a token or sample rate is set
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')  # Requests with "X-Profile-Token: <token>" are profiled
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # Fraction of all requests, e.g. 0.001
+    PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+    PROFILE_FORMAT = os.environ.get('PROFILE_FORMAT', 'speedscope')  # speedscope or collapsed
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(BACKEND_DIR, 'profiles')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))
+    PROFILE_MAX_CONCURRENT = int(os.environ.get('PROFILE_MAX_CONCURRENT', 2))  # Per process
+    
+    # Request metrics at GET /metrics (Prometheus text format)
+    METRICS_ENABLED = env_bool('METRICS_ENABLED', True)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Require "Authorization: Bearer <token>" when set
+    METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR')  # Shared by gunicorn workers, see serve.py
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
@@ -0,0 +1,34 @@
+import random
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads from replica-enabled requests to a replica bind.
+    
+    A request opts in through the replica_read decorator, which sets
+    g.db_replica_key. Anything that writes (pending objects, flushes, or a
+    session that already wrote in this request) stays on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica_key = self._replica_key()
+            if replica_key is not None:
+                return self._db.engines[replica_key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_key(self):
+        if not has_request_context():
+            return None
+        replica_key = g.get('db_replica_key')
+        if replica_key is None:
+            return None
+        if self._flushing or self.info.get('wrote') or self.new or self.dirty or self.deleted:
+            return None
+        return replica_key
+
+
+def choose_replica(replica_keys):
+    return random.choice(replica_keys) if replica_keys else None
@@ -3,5 +3,13 @@ from .concert import Concert
 from .ticket_type import TicketType
 from .order import Order
 from .order_item import OrderItem
+from .order_archive import ArchivedOrder, ArchivedOrderItem
+from .seat_map import SeatMap, SeatSection, SeatRow
+from .seat_inventory import SeatInventory, SeatHold
+from .waitlist import WaitlistEntry
+from .ticket import Ticket
+from .availability_change import AvailabilityChange
+from .schema_migration import SchemaMigration
+from .scheduler_lease import SchedulerLease
 
-__all__ = ['User', 'Concert', 'TicketType', 'Order', 'OrderItem']
\ No newline at end of file
+__all__ = ['User', 'Concert', 'TicketType', 'Order', 'OrderItem', 'ArchivedOrder', 'ArchivedOrderItem', 'SeatMap', 'SeatSection', 'SeatRow', 'SeatInventory', 'SeatHold', 'WaitlistEntry', 'Ticket', 'AvailabilityChange', 'SchemaMigration', 'SchedulerLease']
\ No newline at end of file
@@ -0,0 +1,18 @@
+from app import db
+from datetime import datetime
+
+class AvailabilityChange(db.Model):
+    """
+    A concert whose ticket availability changed, appended after the commit.
+    Every process's availability broker polls this table, so SSE
+    subscribers on any worker see changes made by any other
+    (see app/utils/events.py).
+    """
+    __tablename__ = 'availability_changes'
+    __table_args__ = (
+        db.Index('idx_availability_changes_created_at', 'created_at'),  # Pruning
+    )
+
+    change_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    concert_id = db.Column(db.Integer, nullable=False)       # No foreign key: deleted concerts publish too
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # UTC
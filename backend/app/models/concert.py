@@ -1,8 +1,13 @@
 from app import db
 from datetime import datetime
+from app.models.serialization import SerializerMixin
 
-class Concert(db.Model):
+class Concert(SerializerMixin, db.Model):
     __tablename__ = 'concerts'
+    __table_args__ = (
+        db.Index('idx_c_status_date_time', 'status', 'date', 'time'),   # Catalogue filter + ordering
+        db.Index('idx_c_date_time', 'date', 'time'),                    # Unfiltered catalogue
+    )
     
     concert_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(255), nullable=False)
@@ -18,17 +23,41 @@ class Concert(db.Model):
     # Relationships
     ticket_types = db.relationship('TicketType', backref='concert', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'concert_id': self.concert_id,
-            'title': self.title,
-            'description': self.description,
-            'venue': self.venue,
-            'date': self.date.isoformat() if self.date else None,
-            'time': self.time.strftime('%H:%M:%S') if self.time else None,
-            'banner_image': self.banner_image,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'ticket_types': [ticket.to_dict() for ticket in self.ticket_types] if self.ticket_types else []
-        }
\ No newline at end of file
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('concert_id', 'title', 'description', 'venue', 'date', 'time', 'banner_image', 'status',
+                        'created_at', 'updated_at')
+    serialize_relations = ('ticket_types',)
+    serialize_include = ('ticket_types',)
+    
+    @classmethod
+    def catalogue_filters(cls, status=None, search=None):
+        """Filter criteria of the catalogue list (shared by the Flask and async read paths)"""
+        criteria = []
+        
+        # Filter by status
+        if status and status in ['upcoming', 'ongoing', 'completed']:
+            criteria.append(cls.status == status)
+        
+        # Search by title or venue
+        if search:
+            search_term = f"%{search}%"
+            criteria.append(db.or_(cls.title.ilike(search_term), cls.venue.ilike(search_term)))
+        
+        return criteria
+    
+    @classmethod
+    def starts_before(cls, moment):
+        """Concerts whose date + time is at or before moment (naive, concert local time)"""
+        return db.or_(
+            cls.date < moment.date(),
+            db.and_(cls.date == moment.date(), cls.time <= moment.time())
+        )
+    
+    @classmethod
+    def catalogue_order(cls):
+        return (cls.date.desc(), cls.time.desc())
+    
+    @classmethod
+    def to_dict_options(cls):
+        """Eager loads for everything to_dict() touches, so lists don't lazy-load per row"""
+        return (db.selectinload(cls.ticket_types),)
@@ -1,11 +1,12 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.orm import declared_attr
+from app.models.serialization import SerializerMixin
 
-class Order(db.Model):
-    __tablename__ = 'orders'
+class OrderColumns(SerializerMixin):
+    """Columns and serialization shared by orders and orders_archive"""
     
     order_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
     total_amount = db.Column(db.DECIMAL(10, 2), nullable=False)
     status = db.Column(db.Enum('pending', 'payment_submitted', 'paid', 'cancelled'), default='pending')  # UPDATE: Tambah status baru
     payment_method = db.Column(db.String(50))
@@ -15,21 +16,34 @@ class Order(db.Model):
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     updated_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    archived = False
+    
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('order_id', 'user_id', 'total_amount', 'status', 'payment_method', 'payment_submitted_at',
+                        'payment_verified_at', 'admin_notes', 'created_at', 'updated_at', 'archived')
+    serialize_relations = ('order_items', 'user')
+    serialize_include = ('order_items', 'user')
+    
+    @declared_attr
+    def user_id(cls):
+        return db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+
+class Order(OrderColumns, db.Model):
+    __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('idx_o_user_created_at', 'user_id', 'created_at'),     # get_user_orders
+        db.Index('idx_o_status_created_at', 'status', 'created_at'),    # Admin order list & dashboard
+        db.Index('idx_o_created_at', 'created_at'),                     # Unfiltered admin order list
+    )
+    
     # Relationships
     order_items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'order_id': self.order_id,
-            'user_id': self.user_id,
-            'total_amount': float(self.total_amount),
-            'status': self.status,
-            'payment_method': self.payment_method,
-            'payment_submitted_at': self.payment_submitted_at.isoformat() if self.payment_submitted_at else None,
-            'payment_verified_at': self.payment_verified_at.isoformat() if self.payment_verified_at else None,
-            'admin_notes': self.admin_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'order_items': [item.to_dict() for item in self.order_items] if self.order_items else [],
-            'user': self.user.to_dict() if self.user else None
-        }
\ No newline at end of file
+    @classmethod
+    def to_dict_options(cls):
+        """Eager loads for everything to_dict() touches, so lists don't lazy-load per row"""
+        from app.models.order_item import OrderItem
+        return (
+            db.selectinload(cls.order_items).selectinload(OrderItem.ticket_type),
+            db.joinedload(cls.user),
+        )
@@ -0,0 +1,41 @@
+from app import db
+from app.models.order import OrderColumns
+from app.models.order_item import OrderItemColumns
+
+class ArchivedOrder(OrderColumns, db.Model):
+    """Orders of completed concerts, moved out of the hot table (see app/utils/order_archive.py)"""
+    __tablename__ = 'orders_archive'
+    __table_args__ = (
+        db.Index('idx_oa_user_created_at', 'user_id', 'created_at'),
+        db.Index('idx_oa_status_created_at', 'status', 'created_at'),
+        db.Index('idx_oa_created_at', 'created_at'),
+    )
+    
+    # Ids are kept from the hot table, so links and PDFs still resolve
+    order_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    
+    archived = True
+    
+    # Relationships
+    order_items = db.relationship('ArchivedOrderItem', backref='order', lazy=True)
+    user = db.relationship('User', viewonly=True)
+    
+    @classmethod
+    def to_dict_options(cls):
+        return (
+            db.selectinload(cls.order_items).selectinload(ArchivedOrderItem.ticket_type),
+            db.joinedload(cls.user),
+        )
+
+class ArchivedOrderItem(OrderItemColumns, db.Model):
+    __tablename__ = 'order_items_archive'
+    __table_args__ = (
+        db.Index('idx_oia_order_id', 'order_id'),
+        db.Index('idx_oia_ticket_type_id', 'ticket_type_id'),
+    )
+    
+    order_item_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders_archive.order_id'), nullable=False)
+    
+    # Relationships
+    ticket_type = db.relationship('TicketType', viewonly=True)
@@ -1,27 +1,38 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.orm import declared_attr
+from app.models.serialization import SerializerMixin
 
-class OrderItem(db.Model):
-    __tablename__ = 'order_items'
+class OrderItemColumns(SerializerMixin):
+    """Columns and serialization shared by order_items and order_items_archive"""
     
     order_item_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.order_id'), nullable=False)
-    ticket_type_id = db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     price_per_unit = db.Column(db.DECIMAL(10, 2), nullable=False)
     subtotal = db.Column(db.DECIMAL(10, 2), nullable=False)
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     updated_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            'order_item_id': self.order_item_id,
-            'order_id': self.order_id,
-            'ticket_type_id': self.ticket_type_id,
-            'quantity': self.quantity,
-            'price_per_unit': float(self.price_per_unit),
-            'subtotal': float(self.subtotal),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'ticket_type': self.ticket_type.to_dict() if self.ticket_type else None
-        }
\ No newline at end of file
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('order_item_id', 'order_id', 'ticket_type_id', 'quantity', 'price_per_unit', 'subtotal',
+                        'created_at', 'updated_at')
+    serialize_relations = ('ticket_type',)
+    serialize_include = ('ticket_type',)
+    
+    @declared_attr
+    def ticket_type_id(cls):
+        return db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
+    
+    @classmethod
+    def to_dict_options(cls):
+        """Eager loads for everything to_dict() touches, so lists don't lazy-load per row"""
+        return (db.joinedload(cls.ticket_type),)
+
+class OrderItem(OrderItemColumns, db.Model):
+    __tablename__ = 'order_items'
+    __table_args__ = (
+        db.Index('idx_oi_order_id', 'order_id'),
+        db.Index('idx_oi_ticket_type_id', 'ticket_type_id'),
+    )
+    
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.order_id'), nullable=False)
@@ -0,0 +1,202 @@
+"""
+Slotted, read-only row objects for read-heavy list endpoints.
+
+ConcertRow, TicketTypeRow, OrderRow and OrderItemRow (plus UserRow and the
+archive variants) serialize exactly like their models (same serialize_*
+declarations and to_dict(fieldset)), but are built straight from column
+tuples: no identity map, instance state or change tracking, and one
+__slots__ object per row instead of an ORM instance with its __dict__.
+
+query() narrows a query of the model to the columns the response needs
+and outer-joins the nested many-to-one relationships (Order.user,
+OrderItem.ticket_type) into the same statement; from_result() builds the
+rows and loads nested one-to-many relationships (Concert.ticket_types,
+Order.order_items) with one IN query per level, like selectinload.
+"""
+from collections import defaultdict
+from app.models.serialization import Serializable
+from app.models.user import User
+from app.models.concert import Concert
+from app.models.ticket_type import TicketType
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.order_archive import ArchivedOrder, ArchivedOrderItem
+
+IN_CHUNK_SIZE = 500
+
+
+def row_slots(model):
+    """Slots of a row class: the model's serialized columns and relationships"""
+    columns = model.__table__.c
+    return tuple(name for name in model.serialize_fields if name in columns) + tuple(model.serialize_relations)
+
+
+class ModelRow(Serializable):
+    __slots__ = ()
+    model = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.serialize_fields = cls.model.serialize_fields
+        cls.serialize_relations = cls.model.serialize_relations
+        cls.serialize_include = cls.model.serialize_include
+
+    def __init__(self, names, values):
+        for name, value in zip(names, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self):
+        keys = ', '.join(f'{column.key}={getattr(self, column.key, None)!r}' for column in self.model.__mapper__.primary_key)
+        return f'<{type(self).__name__} {keys}>'
+
+    @classmethod
+    def mapped_class(cls):
+        return cls.model
+
+    @classmethod
+    def relation(cls, name):
+        """(row class, local column, remote column) of a single-column relationship"""
+        relationship = cls.model.__mapper__.relationships[name]
+        (local, remote), = relationship.local_remote_pairs
+        return ROW_CLASSES[relationship.mapper.class_], local, remote
+
+    @classmethod
+    def joined(cls, fieldset):
+        """Nested many-to-one relationships, which query() joins into the row's own statement"""
+        relationships = cls.model.__mapper__.relationships
+        return [(name, nested) for name, nested in cls.included(fieldset).items() if not relationships[name].uselist]
+
+    @classmethod
+    def column_names(cls, fieldset=None, required=()):
+        """Columns the response needs: primary key first, then fields, join keys and required"""
+        columns = cls.model.__table__.c
+        names = [column.key for column in cls.model.__mapper__.primary_key]
+        if fieldset is None or fieldset.fields is None:
+            names += [name for name in cls.serialize_fields if name in columns]
+        else:
+            names += [name for name in cls.serialize_fields if name in fieldset.fields and name in columns]
+        for name in cls.included(fieldset):
+            names.append(cls.relation(name)[1].key)
+        names += required
+        return list(dict.fromkeys(names))
+
+    @classmethod
+    def query(cls, query, fieldset=None, required=()):
+        """A filtered / ordered query of the model, narrowed to plain rows for from_result() (no limit yet)"""
+        table = cls.model.__table__
+        query = query.with_entities(*[table.c[name] for name in cls.column_names(fieldset, required)])
+        for name, nested in cls.joined(fieldset):
+            target, local, remote = cls.relation(name)
+            alias = target.model.__table__.alias(f'{name}_row')
+            query = query.outerjoin(alias, local == alias.c[remote.key])
+            query = query.add_columns(*[alias.c[column] for column in target.column_names(nested)])
+        return query
+
+    @classmethod
+    def from_result(cls, result, fieldset=None, required=(), session=None):
+        """Rows from the tuples of query(), with nested relationships loaded (through session, default db.session)"""
+        names = cls.column_names(fieldset, required)
+        joined = []
+        for name, nested in cls.joined(fieldset):
+            target = cls.relation(name)[0]
+            joined.append((name, nested, target, target.column_names(nested)))
+
+        rows = []
+        children = defaultdict(list)
+        for values in result:
+            row = cls(names, values)
+            offset = len(names)
+            for name, nested, target, target_names in joined:
+                child_values = values[offset:offset + len(target_names)]
+                offset += len(target_names)
+                # Primary key comes first; NULL means no related row
+                child = target(target_names, child_values) if child_values[0] is not None else None
+                object.__setattr__(row, name, child)
+                if child is not None:
+                    children[name].append(child)
+            rows.append(row)
+
+        for name, nested, target, _ in joined:
+            target.load_relations(children[name], nested, session=session)
+        cls.load_relations(rows, fieldset, skip_joined=True, session=session)
+        return rows
+
+    @classmethod
+    def fetch(cls, fieldset, *criteria, required=(), session=None):
+        """Rows matching criteria, in primary key order"""
+        primary_key = [getattr(cls.model, column.key) for column in cls.model.__mapper__.primary_key]
+        query = cls.model.query if session is None else session.query(cls.model)
+        query = cls.query(query.filter(*criteria).order_by(*primary_key), fieldset, required)
+        return cls.from_result(query.all(), fieldset, required, session)
+
+    @classmethod
+    def load_relations(cls, rows, fieldset=None, skip_joined=False, session=None):
+        """Load nested relationships of rows with one IN query each (per IN_CHUNK_SIZE keys)"""
+        if not rows:
+            return
+        relationships = cls.model.__mapper__.relationships
+        for name, nested in cls.included(fieldset).items():
+            uselist = relationships[name].uselist
+            if skip_joined and not uselist:
+                continue
+            target, local, remote = cls.relation(name)
+            keys = sorted({getattr(row, local.key) for row in rows} - {None})
+            found = []
+            for start in range(0, len(keys), IN_CHUNK_SIZE):
+                found += target.fetch(nested, remote.in_(keys[start:start + IN_CHUNK_SIZE]), required=(remote.key,), session=session)
+
+            if uselist:
+                grouped = defaultdict(list)
+                for child in found:
+                    grouped[getattr(child, remote.key)].append(child)
+                for row in rows:
+                    object.__setattr__(row, name, grouped.get(getattr(row, local.key), []))
+            else:
+                by_key = {getattr(child, remote.key): child for child in found}
+                for row in rows:
+                    object.__setattr__(row, name, by_key.get(getattr(row, local.key)))
+
+
+class UserRow(ModelRow):
+    model = User
+    __slots__ = row_slots(User)
+
+
+class ConcertRow(ModelRow):
+    model = Concert
+    __slots__ = row_slots(Concert)
+
+
+class TicketTypeRow(ModelRow):
+    model = TicketType
+    __slots__ = row_slots(TicketType)
+
+
+class OrderRow(ModelRow):
+    model = Order
+    __slots__ = row_slots(Order)
+    archived = False
+
+
+class OrderItemRow(ModelRow):
+    model = OrderItem
+    __slots__ = row_slots(OrderItem)
+
+
+class ArchivedOrderRow(OrderRow):
+    model = ArchivedOrder
+    __slots__ = ()
+    archived = True
+
+
+class ArchivedOrderItemRow(OrderItemRow):
+    model = ArchivedOrderItem
+    __slots__ = ()
+
+
+ROW_CLASSES = {row.model: row for row in (
+    UserRow, ConcertRow, TicketTypeRow, OrderRow, OrderItemRow, ArchivedOrderRow, ArchivedOrderItemRow
+)}
@@ -0,0 +1,16 @@
+from app import db
+
+class SchedulerLease(db.Model):
+    """Leader lease per background job, so only one process runs it (see app/utils/scheduler.py)"""
+    __tablename__ = 'scheduler_leases'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    holder = db.Column(db.String(255), nullable=False)      # hostname:pid of the current leader
+    expires_at = db.Column(db.DateTime, nullable=False)     # UTC; anyone may take the lease after this
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'holder': self.holder,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
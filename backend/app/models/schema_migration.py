@@ -0,0 +1,32 @@
+from app import db
+from datetime import datetime
+
+# Highest data_migrations version this code expects to be applied
+SCHEMA_VERSION = 9
+
+class SchemaMigration(db.Model):
+    """Progress and checkpoint of each data migration (see data_migrations/)"""
+    __tablename__ = 'schema_migrations'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, unique=True)
+    status = db.Column(db.Enum('running', 'completed', 'failed'), nullable=False, default='running')
+    step = db.Column(db.Integer, nullable=False, default=0)         # Index of the next step to run
+    last_pk = db.Column(db.BigInteger, nullable=False, default=0)   # Backfill checkpoint inside that step
+    rows_done = db.Column(db.BigInteger, nullable=False, default=0)
+    started_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    updated_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.TIMESTAMP, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'status': self.status,
+            'step': self.step,
+            'last_pk': self.last_pk,
+            'rows_done': self.rows_done,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,82 @@
+import base64
+from app import db
+from datetime import datetime
+
+class SeatInventory(db.Model):
+    """
+    Seat availability of one section for one concert: bit i of `taken` is
+    set while section seat i is held or sold. Writers bump `version`, so a
+    bitmap read earlier can only be written back if nobody changed it since.
+    """
+    __tablename__ = 'seat_inventory'
+    __table_args__ = (
+        db.Index('idx_si_ticket_type_id', 'ticket_type_id'),
+    )
+
+    concert_id = db.Column(db.Integer, db.ForeignKey('concerts.concert_id'), primary_key=True)
+    section_id = db.Column(db.Integer, db.ForeignKey('seat_sections.section_id'), primary_key=True)
+    ticket_type_id = db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
+    taken = db.Column(db.LargeBinary, nullable=False)           # Little-endian bitmap, seat_count bits
+    seats_available = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'concert_id': self.concert_id,
+            'section_id': self.section_id,
+            'ticket_type_id': self.ticket_type_id,
+            'seats_available': self.seats_available,
+            'taken': base64.b64encode(self.taken).decode('ascii')
+        }
+
+class SeatHold(db.Model):
+    """
+    Contiguous seats taken in a section's bitmap: 'held' until expires_at
+    while the buyer checks out, 'ordered' once linked to an order item,
+    'released' when the bits were cleared again.
+    """
+    __tablename__ = 'seat_holds'
+    __table_args__ = (
+        db.Index('idx_sh_status_expires_at', 'status', 'expires_at'),     # Expired-hold sweep
+        db.Index('idx_sh_order_item_id', 'order_item_id'),
+        db.Index('idx_sh_concert_section', 'concert_id', 'section_id'),
+    )
+
+    hold_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    concert_id = db.Column(db.Integer, db.ForeignKey('concerts.concert_id'), nullable=False)
+    section_id = db.Column(db.Integer, db.ForeignKey('seat_sections.section_id'), nullable=False)
+    row_id = db.Column(db.Integer, db.ForeignKey('seat_rows.row_id'), nullable=False)
+    first_seat = db.Column(db.Integer, nullable=False)          # Section index of the first seat
+    quantity = db.Column(db.Integer, nullable=False)
+    ticket_type_id = db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    # order_items or order_items_archive (ids survive archival), so no foreign key
+    order_item_id = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.Enum('held', 'ordered', 'released'), nullable=False, default='held')
+    expires_at = db.Column(db.DateTime, nullable=True)          # UTC; only for 'held'
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Relationships
+    row = db.relationship('SeatRow', lazy='joined', viewonly=True)
+    section = db.relationship('SeatSection', lazy='joined', viewonly=True)
+
+    @property
+    def seat_numbers(self):
+        first = self.first_seat - self.row.seat_offset + 1
+        return list(range(first, first + self.quantity))
+
+    def to_dict(self):
+        return {
+            'hold_id': self.hold_id,
+            'concert_id': self.concert_id,
+            'ticket_type_id': self.ticket_type_id,
+            'section_id': self.section_id,
+            'section': self.section.name if self.section else None,
+            'row': self.row.label if self.row else None,
+            'seats': self.seat_numbers if self.row else [],
+            'quantity': self.quantity,
+            'status': self.status,
+            'order_item_id': self.order_item_id,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
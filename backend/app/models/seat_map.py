@@ -0,0 +1,68 @@
+from app import db
+from datetime import datetime
+from app.models.serialization import SerializerMixin
+
+class SeatMap(SerializerMixin, db.Model):
+    """Venue layout for assigned seating: sections of rows of numbered seats (see app/utils/seating.py)"""
+    __tablename__ = 'seat_maps'
+
+    seat_map_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(100), nullable=False)
+    venue = db.Column(db.String(255), nullable=False)
+    seat_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Relationships
+    sections = db.relationship('SeatSection', backref='seat_map', lazy=True, cascade='all, delete-orphan',
+                               order_by='SeatSection.rank')
+
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('seat_map_id', 'name', 'venue', 'seat_count', 'created_at')
+    serialize_relations = ('sections',)
+    serialize_include = ('sections',)
+
+    @classmethod
+    def to_dict_options(cls):
+        return (db.selectinload(cls.sections).selectinload(SeatSection.rows),)
+
+class SeatSection(SerializerMixin, db.Model):
+    """
+    A block of rows sold at one ticket type per concert. Its seats are
+    numbered 0 .. seat_count - 1 across its rows (front row first), which
+    is the bit index in the section's availability bitmap.
+    """
+    __tablename__ = 'seat_sections'
+    __table_args__ = (
+        db.Index('idx_ss_seat_map_id', 'seat_map_id'),
+    )
+
+    section_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    seat_map_id = db.Column(db.Integer, db.ForeignKey('seat_maps.seat_map_id'), nullable=False)
+    name = db.Column(db.String(50), nullable=False)
+    rank = db.Column(db.Integer, nullable=False, default=0)      # Best-available searches lower ranks first
+    seat_count = db.Column(db.Integer, nullable=False)
+
+    # Relationships
+    rows = db.relationship('SeatRow', backref='section', lazy=True, cascade='all, delete-orphan',
+                           order_by='SeatRow.position')
+
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('section_id', 'seat_map_id', 'name', 'rank', 'seat_count')
+    serialize_relations = ('rows',)
+    serialize_include = ('rows',)
+
+class SeatRow(SerializerMixin, db.Model):
+    __tablename__ = 'seat_rows'
+    __table_args__ = (
+        db.Index('idx_sr_section_position', 'section_id', 'position'),
+    )
+
+    row_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    section_id = db.Column(db.Integer, db.ForeignKey('seat_sections.section_id'), nullable=False)
+    label = db.Column(db.String(10), nullable=False)
+    position = db.Column(db.Integer, nullable=False)             # 0 = front row
+    seat_offset = db.Column(db.Integer, nullable=False)          # Section index of seat number 1
+    seat_count = db.Column(db.Integer, nullable=False)
+
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('row_id', 'section_id', 'label', 'position', 'seat_offset', 'seat_count')
@@ -0,0 +1,154 @@
+"""
+JSON serialization of models, with sparse fieldsets.
+
+Each model lists the fields to_dict() emits (serialize_fields), the
+relationships a client may nest (serialize_relations) and the ones nested
+by default (serialize_include). A Fieldset parsed from the fields= and
+include= query parameters narrows one response:
+
+    ?fields=order_id,status,order_items.quantity&include=user
+
+Dotted names address nested objects, and naming a nested field includes
+its relationship. With a fieldset, only the requested relationships are
+nested and fieldset_options() loads only the requested columns (primary
+keys and the foreign keys of included relationships are always loaded,
+primary keys are always emitted). Without one, to_dict() keeps the full
+default shape.
+"""
+from datetime import date, time
+from decimal import Decimal
+from sqlalchemy.orm import load_only, selectinload, joinedload
+
+
+class FieldsetError(ValueError):
+    pass
+
+
+class Fieldset:
+    """Requested fields (None = all) and included relationships at one level of a response"""
+    __slots__ = ('fields', 'include')
+
+    def __init__(self):
+        self.fields = None
+        self.include = {}
+
+    @classmethod
+    def parse(cls, fields=(), include=()):
+        """Fieldset from fields= / include= values (comma separated); None when neither is given"""
+        fields = [name.strip() for value in fields for name in value.split(',') if name.strip()]
+        include = [name.strip() for value in include for name in value.split(',') if name.strip()]
+        if not fields and not include:
+            return None
+
+        root = cls()
+        for path in include:
+            root.nested(path.split('.'))
+        for path in fields:
+            *relations, name = path.split('.')
+            node = root.nested(relations)
+            node.fields = (node.fields or set()) | {name}
+        return root
+
+    @classmethod
+    def from_args(cls, args):
+        """Fieldset from Flask request.args"""
+        return cls.parse(args.getlist('fields'), args.getlist('include'))
+
+    def nested(self, relations):
+        node = self
+        for name in relations:
+            node = node.include.setdefault(name, Fieldset())
+        return node
+
+
+def serialize_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.strftime('%H:%M:%S')
+    return value
+
+
+class Serializable:
+    """to_dict() from the serialize_* declarations; shared by models and their row objects (app/models/rows.py)"""
+    __slots__ = ()
+    serialize_fields = ()
+    serialize_relations = ()
+    serialize_include = ()
+
+    @classmethod
+    def mapped_class(cls):
+        return cls
+
+    @classmethod
+    def included(cls, fieldset):
+        """{relationship: nested fieldset} nested by to_dict(fieldset)"""
+        if fieldset is None:
+            return {name: None for name in cls.serialize_include}
+        return fieldset.include
+
+    def to_dict(self, fieldset=None):
+        mapper = self.mapped_class().__mapper__
+        if fieldset is None or fieldset.fields is None:
+            fields = self.serialize_fields
+        else:
+            primary_keys = {column.key for column in mapper.primary_key}
+            fields = [name for name in self.serialize_fields if name in fieldset.fields or name in primary_keys]
+
+        data = {name: serialize_value(getattr(self, name)) for name in fields}
+        for name, nested in self.included(fieldset).items():
+            value = getattr(self, name)
+            if mapper.relationships[name].uselist:
+                data[name] = [item.to_dict(nested) for item in value] if value else []
+            else:
+                data[name] = value.to_dict(nested) if value else None
+        return data
+
+
+class SerializerMixin(Serializable):
+    __slots__ = ()
+
+    @classmethod
+    def relation_model(cls, name):
+        return cls.__mapper__.relationships[name].mapper.class_
+
+    @classmethod
+    def check_fieldset(cls, fieldset, prefix=''):
+        """Raise FieldsetError for fields or relationships this model doesn't serialize"""
+        if fieldset is None:
+            return
+        for name in sorted(fieldset.fields or ()):
+            if name not in cls.serialize_fields:
+                raise FieldsetError(f"Unknown field '{prefix}{name}'")
+        for name, nested in fieldset.include.items():
+            if name not in cls.serialize_relations:
+                raise FieldsetError(f"Unknown relationship '{prefix}{name}'")
+            cls.relation_model(name).check_fieldset(nested, f'{prefix}{name}.')
+
+    @classmethod
+    def to_dict_options(cls):
+        """Eager loads for everything to_dict() touches by default"""
+        return ()
+
+    @classmethod
+    def fieldset_options(cls, fieldset):
+        """Loader options for to_dict(fieldset): only the requested columns and relationships"""
+        if fieldset is None:
+            return cls.to_dict_options()
+
+        mapper = cls.__mapper__
+        options = []
+        if fieldset.fields is not None:
+            keys = {column.key for column in mapper.primary_key}
+            keys.update(name for name in fieldset.fields if name in mapper.column_attrs)
+            for name in fieldset.include:
+                keys.update(column.key for column in mapper.relationships[name].local_columns)
+            options.append(load_only(*[getattr(cls, key) for key in sorted(keys)]))
+
+        for name, nested in fieldset.include.items():
+            relationship = mapper.relationships[name]
+            loader = selectinload if relationship.uselist else joinedload
+            options.append(loader(getattr(cls, name)).options(*cls.relation_model(name).fieldset_options(nested)))
+        return options
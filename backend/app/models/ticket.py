@@ -0,0 +1,53 @@
+from app import db
+from datetime import datetime
+
+class Ticket(db.Model):
+    """
+    One admitted person: issued per unit of each order item when the order
+    is paid (see app/utils/tickets.py). `code` is what the QR code and the
+    printed ticket carry, and what check-in, transfer and reprint look up.
+    """
+    __tablename__ = 'tickets'
+    __table_args__ = (
+        db.UniqueConstraint('code', name='uq_tickets_code'),
+        db.UniqueConstraint('order_item_id', 'seq', name='uq_tickets_order_item_seq'),  # Issued once per unit
+        db.Index('idx_tickets_order_id', 'order_id'),
+        db.Index('idx_tickets_user_id', 'user_id'),
+    )
+
+    ticket_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    code = db.Column(db.String(10), nullable=False)             # Crockford base32, 50 random bits
+    # orders / order_items or their archive tables (ids survive archival), so no foreign keys
+    order_id = db.Column(db.Integer, nullable=False)
+    order_item_id = db.Column(db.Integer, nullable=False)
+    seq = db.Column(db.SmallInteger, nullable=False)            # 1 .. order item quantity
+    ticket_type_id = db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)  # Current holder
+    seat = db.Column(db.String(80), nullable=True)              # e.g. "Floor, row C, seat 12"; assigned seating only
+    status = db.Column(db.Enum('valid', 'checked_in'), nullable=False, default='valid')
+    checked_in_at = db.Column(db.DateTime, nullable=True)       # UTC
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Relationships
+    ticket_type = db.relationship('TicketType', lazy='joined', viewonly=True)
+
+    @property
+    def display_code(self):
+        """XXXXX-XXXXX, as printed"""
+        return f'{self.code[:5]}-{self.code[5:]}'
+
+    def to_dict(self):
+        return {
+            'ticket_id': self.ticket_id,
+            'code': self.display_code,
+            'order_id': self.order_id,
+            'order_item_id': self.order_item_id,
+            'ticket_type_id': self.ticket_type_id,
+            'ticket_type': self.ticket_type.name if self.ticket_type else None,
+            'concert_id': self.ticket_type.concert_id if self.ticket_type else None,
+            'user_id': self.user_id,
+            'seat': self.seat,
+            'status': self.status,
+            'checked_in_at': self.checked_in_at.isoformat() if self.checked_in_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
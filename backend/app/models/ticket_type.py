@@ -1,8 +1,12 @@
 from app import db
 from datetime import datetime
+from app.models.serialization import SerializerMixin
 
-class TicketType(db.Model):
+class TicketType(SerializerMixin, db.Model):
     __tablename__ = 'ticket_types'
+    __table_args__ = (
+        db.Index('idx_tt_concert_id', 'concert_id'),
+    )
     
     ticket_type_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     concert_id = db.Column(db.Integer, db.ForeignKey('concerts.concert_id'), nullable=False)
@@ -16,14 +20,7 @@ class TicketType(db.Model):
     # Relationships
     order_items = db.relationship('OrderItem', backref='ticket_type', lazy=True)
     
-    def to_dict(self):
-        return {
-            'ticket_type_id': self.ticket_type_id,
-            'concert_id': self.concert_id,
-            'name': self.name,
-            'price': float(self.price),
-            'quantity_total': self.quantity_total,
-            'quantity_available': self.quantity_available,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+    # Serialization (see app/models/serialization.py); the concert is only nested on request
+    serialize_fields = ('ticket_type_id', 'concert_id', 'name', 'price', 'quantity_total', 'quantity_available',
+                        'created_at', 'updated_at')
+    serialize_relations = ('concert',)
@@ -1,9 +1,14 @@
 from app import db
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from app.models.serialization import SerializerMixin
 
-class User(db.Model):
+class User(SerializerMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('idx_u_role_created_at', 'role', 'created_at'),        # Admin user list & dashboard
+        db.Index('idx_u_created_at', 'created_at'),                     # Unfiltered admin user list
+    )
     
     user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False)
@@ -17,6 +22,9 @@ class User(db.Model):
     # Relationships
     orders = db.relationship('Order', backref='user', lazy=True, cascade='all, delete-orphan')
     
+    # Serialization (see app/models/serialization.py)
+    serialize_fields = ('user_id', 'name', 'email', 'role', 'phone', 'created_at', 'updated_at')
+    
     def set_password(self, password):
         """Set password with proper hashing"""
         try:
@@ -37,14 +45,3 @@ class User(db.Model):
         except Exception as e:
             print(f"Error checking password for user {self.email}: {str(e)}")
             return False
-    
-    def to_dict(self):
-        return {
-            'user_id': self.user_id,
-            'name': self.name,
-            'email': self.email,
-            'role': self.role,
-            'phone': self.phone,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
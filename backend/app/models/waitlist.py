@@ -0,0 +1,47 @@
+from app import db
+from datetime import datetime
+
+class WaitlistEntry(db.Model):
+    """
+    A buyer queued for a sold-out ticket type (see app/utils/waitlist.py):
+    'waiting' in entry_id order, 'offered' while quantity tickets are set
+    aside until offer_expires_at, then 'claimed' (order_id), 'expired' or
+    'cancelled'.
+    """
+    __tablename__ = 'waitlist_entries'
+    __table_args__ = (
+        db.Index('idx_wl_ticket_type_status', 'ticket_type_id', 'status', 'entry_id'),  # FIFO head per tier
+        db.Index('idx_wl_status_offer_expires_at', 'status', 'offer_expires_at'),      # Expired-offer sweep
+        db.Index('idx_wl_user_status', 'user_id', 'status'),
+    )
+
+    entry_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    ticket_type_id = db.Column(db.Integer, db.ForeignKey('ticket_types.ticket_type_id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.Enum('waiting', 'offered', 'claimed', 'expired', 'cancelled'), nullable=False, default='waiting')
+    offered_at = db.Column(db.DateTime, nullable=True)          # UTC
+    offer_expires_at = db.Column(db.DateTime, nullable=True)    # UTC; only while 'offered'
+    # orders or orders_archive (ids survive archival), so no foreign key
+    order_id = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Relationships
+    ticket_type = db.relationship('TicketType', lazy='joined', viewonly=True)
+
+    def to_dict(self, position=None):
+        data = {
+            'entry_id': self.entry_id,
+            'ticket_type_id': self.ticket_type_id,
+            'ticket_type': self.ticket_type.name if self.ticket_type else None,
+            'concert_id': self.ticket_type.concert_id if self.ticket_type else None,
+            'quantity': self.quantity,
+            'status': self.status,
+            'offered_at': self.offered_at.isoformat() if self.offered_at else None,
+            'offer_expires_at': self.offer_expires_at.isoformat() if self.offer_expires_at else None,
+            'order_id': self.order_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+        if self.status == 'waiting':
+            data['position'] = position
+        return data
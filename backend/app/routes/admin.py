@@ -1,19 +1,33 @@
+import os
 import traceback
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, send_from_directory
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select
 from app import db
 from app.models.user import User
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.concert import Concert
 from app.models.ticket_type import TicketType
+from app.models.serialization import FieldsetError
+from app.models.rows import UserRow
 from app.utils.auth import admin_required
-from app.utils.helpers import success_response, error_response, paginate_query
+from app.utils.replica import replica_read
+from app.utils.query_stats import query_budget
+from app.utils.helpers import success_response, error_response, paginate_query, request_fieldset
+from app.utils.events import availability_broker
+from app.utils.inventory import reserve_tickets, release_tickets, change_order_status
+from app.utils.seating import SeatingError, release_order_seats
+from app.utils.tickets import issue_tickets
+from app.utils.order_archive import ORDER_LIST_VIEWS, paginate_orders, paid_items, scalar_across
+from app.utils.pool_metrics import pool_snapshot
+from app.utils.profiler import list_profiles, PROFILE_NAME
 
 admin_bp = Blueprint('admin', __name__)
 
 @admin_bp.route('/dashboard', methods=['GET'])
+@query_budget(8)
+@replica_read
 @admin_required
 def get_dashboard_stats(current_user):
     try:
@@ -23,37 +37,35 @@ def get_dashboard_stats(current_user):
         # Total concerts
         total_concerts = Concert.query.count()
         
+        # Order figures include archived orders (each is one statement over both tables)
         # Total orders
-        total_orders = Order.query.count()
+        total_orders = scalar_across(lambda O, I: select(func.count()).select_from(O))
         
         # Total revenue
-        total_revenue = db.session.query(func.sum(Order.total_amount)).filter_by(status='paid').scalar() or 0
+        total_revenue = scalar_across(lambda O, I: select(func.sum(O.total_amount)).where(O.status == 'paid'))
         
         # Recent orders (last 7 days)
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        recent_orders = Order.query.filter(Order.created_at >= seven_days_ago).count()
+        recent_orders = scalar_across(lambda O, I: select(func.count()).select_from(O).where(O.created_at >= seven_days_ago))
         
         # Revenue this month
         start_of_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_revenue = db.session.query(func.sum(Order.total_amount)).filter(
-            Order.status == 'paid',
-            Order.created_at >= start_of_month
-        ).scalar() or 0
+        monthly_revenue = scalar_across(lambda O, I: select(func.sum(O.total_amount)).where(
+            O.status == 'paid',
+            O.created_at >= start_of_month
+        ))
         
         # Top selling concerts
+        items = paid_items()
         top_concerts = db.session.query(
             Concert.title,
             Concert.venue,
-            func.count(OrderItem.order_item_id).label('total_tickets_sold'),
-            func.sum(OrderItem.subtotal).label('total_revenue')
+            func.count(items.c.order_item_id).label('total_tickets_sold'),
+            func.sum(items.c.subtotal).label('total_revenue')
         ).join(
             TicketType, Concert.concert_id == TicketType.concert_id
         ).join(
-            OrderItem, TicketType.ticket_type_id == OrderItem.ticket_type_id
-        ).join(
-            Order, OrderItem.order_id == Order.order_id
-        ).filter(
-            Order.status == 'paid'
+            items, TicketType.ticket_type_id == items.c.ticket_type_id
         ).group_by(
             Concert.concert_id
         ).order_by(
@@ -81,6 +93,8 @@ def get_dashboard_stats(current_user):
         return error_response('Failed to retrieve dashboard stats', 500)
 
 @admin_bp.route('/users', methods=['GET'])
+@query_budget(3)
+@replica_read
 @admin_required
 def get_all_users(current_user):
     try:
@@ -88,9 +102,10 @@ def get_all_users(current_user):
         per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search', None)
         role = request.args.get('role', None)
+        fieldset = request_fieldset(User)
         
         # Base query
-        query = User.query
+        query = User.query.options(*User.fieldset_options(fieldset))
         
         # Filter by role
         if role and role in ['user', 'admin']:
@@ -110,30 +125,35 @@ def get_all_users(current_user):
         query = query.order_by(User.created_at.desc())
         
         # Paginate
-        result = paginate_query(query, page, per_page)
+        result = paginate_query(query, page, per_page, fieldset, rows=UserRow)
         
         return success_response(result, 'Users retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve users', 500)
 
 @admin_bp.route('/users/<int:user_id>', methods=['GET'])
+@query_budget(4)
+@replica_read
 @admin_required
 def get_user(current_user, user_id):
     try:
-        user = User.query.get(user_id)
+        fieldset = request_fieldset(User)
+        user = User.query.options(*User.fieldset_options(fieldset)).get(user_id)
         
         if not user:
             return error_response('User not found', 404)
         
-        # Get user statistics
-        user_orders = Order.query.filter_by(user_id=user_id).count()
-        user_total_spent = db.session.query(func.sum(Order.total_amount)).filter_by(
-            user_id=user_id, 
-            status='paid'
-        ).scalar() or 0
+        # Get user statistics, archived orders included
+        user_orders = scalar_across(lambda O, I: select(func.count()).select_from(O).where(O.user_id == user_id))
+        user_total_spent = scalar_across(lambda O, I: select(func.sum(O.total_amount)).where(
+            O.user_id == user_id,
+            O.status == 'paid'
+        ))
         
-        user_data = user.to_dict()
+        user_data = user.to_dict(fieldset)
         user_data['statistics'] = {
             'total_orders': user_orders,
             'total_spent': float(user_total_spent)
@@ -141,6 +161,8 @@ def get_user(current_user, user_id):
         
         return success_response(user_data, 'User retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve user', 500)
 
@@ -174,28 +196,34 @@ def update_user(current_user, user_id):
         return error_response('Failed to update user', 500)
 
 @admin_bp.route('/orders', methods=['GET'])
+@query_budget(9)
+@replica_read
 @admin_required
 def get_all_orders(current_user):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', None)
-        
-        # Base query
-        query = Order.query
-        
-        # Filter by status
-        if status and status in ['pending', 'payment_submitted', 'paid', 'cancelled']:
-            query = query.filter(Order.status == status)
-        
-        # Order by created_at desc
-        query = query.order_by(Order.created_at.desc())
-        
-        # Paginate
-        result = paginate_query(query, page, per_page)
+        view = request.args.get('view', 'full')
+        if view not in ORDER_LIST_VIEWS:
+            return error_response(f"view must be one of: {', '.join(ORDER_LIST_VIEWS)}", 400)
+        fieldset = request_fieldset(Order)
+        if fieldset and view == 'summary':
+            return error_response('fields and include only apply to view=full', 400)
+        
+        def criteria(order_model):
+            # Filter by status
+            if status and status in ['pending', 'payment_submitted', 'paid', 'cancelled']:
+                return [order_model.status == status]
+            return []
+        
+        # Newest first, across current and archived orders
+        result = paginate_orders(criteria, page, per_page, view, fieldset)
         
         return success_response(result, 'Orders retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve orders', 500)
 
@@ -245,6 +273,18 @@ def verify_payment(current_user, order_id):
                 400
             )
         
+        # Concerts whose availability changes with this transition
+        changed_concert_ids = set()
+        
+        # Only the request whose guarded UPDATE moves the order may issue or give back its tickets
+        values = {'admin_notes': admin_notes}
+        if new_status == 'paid':
+            values['payment_verified_at'] = datetime.utcnow()
+        if not change_order_status(order_id, ('pending', 'payment_submitted'), new_status, **values):
+            print(f"❌ Order #{order_id} was changed by another request")
+            db.session.rollback()
+            return error_response('Order was changed by another request', 409)
+        
         # Handle status transition logic
         if new_status == 'paid':
             print("✅ Approving payment...")
@@ -264,32 +304,34 @@ def verify_payment(current_user, order_id):
                 # Reserve tickets again
                 for order_item in order.order_items:
                     ticket_type = order_item.ticket_type
-                    ticket_type.quantity_available -= order_item.quantity
+                    if not reserve_tickets(ticket_type.ticket_type_id, order_item.quantity):
+                        db.session.rollback()
+                        return error_response(f'Not enough tickets available for {ticket_type.name}', 400)
+                    changed_concert_ids.add(ticket_type.concert_id)
                     print(f"🎫 Reserved {order_item.quantity} tickets for {ticket_type.name}")
             
-            # Update order status
-            order.status = 'paid'
-            order.payment_verified_at = datetime.utcnow()
-            order.admin_notes = admin_notes
+            # One ticket row (and code) per admitted person, in a single INSERT
+            issued = issue_tickets(order)
+            print(f"🎟️ Issued {issued} ticket codes")
             
         elif new_status == 'cancelled':
             print("❌ Rejecting payment...")
             
-            # If changing from paid to cancelled, restore ticket quantities
-            if order.status == 'paid':
-                print("🔄 Restoring ticket quantities...")
-                for order_item in order.order_items:
-                    ticket_type = order_item.ticket_type
-                    ticket_type.quantity_available += order_item.quantity
-                    print(f"🎫 Restored {order_item.quantity} tickets for {ticket_type.name}")
-            
-            # Update order status
-            order.status = 'cancelled'
-            order.admin_notes = admin_notes
+            # The tickets were taken when the order was placed; give them (and any seats) back,
+            # the waitlist job offers them to the next buyers in line
+            print("🔄 Restoring ticket quantities...")
+            for order_item in order.order_items:
+                ticket_type = order_item.ticket_type
+                release_tickets(ticket_type.ticket_type_id, order_item.quantity)
+                changed_concert_ids.add(ticket_type.concert_id)
+                print(f"🎫 Restored {order_item.quantity} tickets for {ticket_type.name}")
+            release_order_seats([order_item.order_item_id for order_item in order.order_items])
         
         # Commit changes
         db.session.commit()
         
+        availability_broker.publish(*changed_concert_ids)
+        
         action_text = "approved" if new_status == 'paid' else "rejected"
         success_message = f'Payment {action_text} successfully'
         
@@ -297,6 +339,9 @@ def verify_payment(current_user, order_id):
         
         return success_response(order.to_dict(), success_message)
         
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
     except Exception as e:
         print(f"❌ Error in verify_payment: {str(e)}")
         print(f"🔍 Traceback: {traceback.format_exc()}")
@@ -304,6 +349,8 @@ def verify_payment(current_user, order_id):
         return error_response('Failed to verify payment. Please check server logs for details.', 500)
 
 @admin_bp.route('/sales-report', methods=['GET'])
+@query_budget(2)
+@replica_read
 @admin_required
 def get_sales_report(current_user):
     try:
@@ -312,28 +359,11 @@ def get_sales_report(current_user):
         end_date = request.args.get('end_date')
         concert_id = request.args.get('concert_id', type=int)
         
-        # Base query for paid orders
-        query = db.session.query(
-            Concert.title.label('concert_title'),
-            Concert.venue,
-            Concert.date.label('concert_date'),
-            TicketType.name.label('ticket_name'),
-            TicketType.price,
-            func.sum(OrderItem.quantity).label('total_sold'),
-            func.sum(OrderItem.subtotal).label('total_revenue')
-        ).select_from(Order).join(
-            OrderItem, Order.order_id == OrderItem.order_id
-        ).join(
-            TicketType, OrderItem.ticket_type_id == TicketType.ticket_type_id
-        ).join(
-            Concert, TicketType.concert_id == Concert.concert_id
-        ).filter(Order.status == 'paid')
-        
         # Date range filter
+        start = end = None
         if start_date:
             try:
                 start = datetime.strptime(start_date, '%Y-%m-%d')
-                query = query.filter(Order.created_at >= start)
             except ValueError:
                 return error_response('Invalid start_date format. Use YYYY-MM-DD', 400)
         
@@ -341,10 +371,25 @@ def get_sales_report(current_user):
             try:
                 end = datetime.strptime(end_date, '%Y-%m-%d')
                 end = end.replace(hour=23, minute=59, second=59)
-                query = query.filter(Order.created_at <= end)
             except ValueError:
                 return error_response('Invalid end_date format. Use YYYY-MM-DD', 400)
         
+        # Base query for paid orders, current and archived
+        items = paid_items(start, end)
+        query = db.session.query(
+            Concert.title.label('concert_title'),
+            Concert.venue,
+            Concert.date.label('concert_date'),
+            TicketType.name.label('ticket_name'),
+            TicketType.price,
+            func.sum(items.c.quantity).label('total_sold'),
+            func.sum(items.c.subtotal).label('total_revenue')
+        ).select_from(items).join(
+            TicketType, items.c.ticket_type_id == TicketType.ticket_type_id
+        ).join(
+            Concert, TicketType.concert_id == Concert.concert_id
+        )
+        
         # Concert filter
         if concert_id:
             query = query.filter(Concert.concert_id == concert_id)
@@ -392,4 +437,50 @@ def get_sales_report(current_user):
         }, 'Sales report generated successfully')
         
     except Exception as e:
-        return error_response('Failed to generate sales report', 500)
\ No newline at end of file
+        return error_response('Failed to generate sales report', 500)
+
+@admin_bp.route('/db-pool', methods=['GET'])
+@admin_required
+def get_db_pool_stats(current_user):
+    try:
+        return success_response(pool_snapshot(current_app), 'Database pool stats retrieved successfully')
+        
+    except Exception as e:
+        return error_response('Failed to retrieve database pool stats', 500)
+
+@admin_bp.route('/profiles', methods=['GET'])
+@admin_required
+def get_profiles(current_user):
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        endpoint = request.args.get('endpoint', None)
+        
+        profiles = list_profiles(current_app.config['PROFILE_DIR'])
+        if endpoint:
+            profiles = [profile for profile in profiles if profile['endpoint'] == endpoint]
+        
+        for profile in profiles:
+            profile['created_at'] = datetime.utcfromtimestamp(profile['created_at']).isoformat()
+        
+        return success_response(profiles[:limit], 'Profiles retrieved successfully')
+        
+    except Exception as e:
+        return error_response('Failed to retrieve profiles', 500)
+
+@admin_bp.route('/profiles/<path:name>', methods=['GET'])
+@admin_required
+def download_profile(current_user, name):
+    try:
+        # Only files the profiler wrote, never arbitrary paths
+        if not PROFILE_NAME.match(name):
+            return error_response('Profile not found', 404)
+        
+        directory = current_app.config['PROFILE_DIR']
+        if not os.path.isfile(os.path.join(directory, name)):
+            return error_response('Profile not found', 404)
+        
+        return send_from_directory(directory, name, as_attachment=True)
+        
+    except Exception as e:
+        return error_response('Failed to download profile', 500)
+
@@ -2,8 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.models.serialization import FieldsetError
 from app.utils.auth import user_required
-from app.utils.helpers import success_response, error_response
+from app.utils.rate_limit import rate_limit
+from app.utils.helpers import success_response, error_response, request_fieldset
 import re
 import traceback
 
@@ -77,6 +79,7 @@ def register():
         return error_response('Registration failed', 500)
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit('login', key='ip')
 def login():
     try:
         print("=== LOGIN REQUEST DEBUG ===")
@@ -144,7 +147,10 @@ def login():
 @user_required
 def get_profile(current_user):
     try:
-        return success_response(current_user.to_dict(), 'Profile retrieved successfully')
+        fieldset = request_fieldset(User)
+        return success_response(current_user.to_dict(fieldset), 'Profile retrieved successfully')
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print(f"Profile error: {str(e)}")
         print(traceback.format_exc())
@@ -1,63 +1,105 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response
 from datetime import datetime, date, time
 from app import db
 from app.models.concert import Concert
 from app.models.ticket_type import TicketType
 from app.models.order_item import OrderItem
+from app.models.serialization import FieldsetError
+from app.models.rows import ConcertRow, TicketTypeRow
 from app.utils.auth import admin_required, user_required
-from app.utils.helpers import success_response, error_response, paginate_query
+from app.utils.replica import replica_read
+from app.utils.query_stats import query_budget
+from app.utils.helpers import success_response, error_response, paginate_query, request_fieldset
+from app.utils.availability import get_availability, AVAILABILITY_FIELDS
+from app.utils.events import availability_broker
+from app.utils.inventory import InventoryError, resize_tier, move_capacity
+from app.utils.order_archive import ticket_type_has_orders
+from app.utils.seating import seated_ticket_type_ids, clear_concert_seating
+from app.utils.waitlist import clear_waitlist
+from app.utils.concert_import import (
+    ConcertImporter, IMPORT_FORMATS, detect_format, iter_records, open_text, validate_concert
+)
 
 concerts_bp = Blueprint('concerts', __name__)
 
 @concerts_bp.route('', methods=['GET'])
+@query_budget(3)
+@replica_read
 def get_concerts():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', None)
         search = request.args.get('search', None)
+        fieldset = request_fieldset(Concert)
         
-        # Base query
-        query = Concert.query
-        
-        # Filter by status
-        if status and status in ['upcoming', 'ongoing', 'completed']:
-            query = query.filter(Concert.status == status)
-        
-        # Search by title or venue
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Concert.title.ilike(search_term),
-                    Concert.venue.ilike(search_term)
-                )
-            )
-        
-        # Order by date
-        query = query.order_by(Concert.date.desc(), Concert.time.desc())
+        # Filter by status / search, order by date
+        query = Concert.query.filter(*Concert.catalogue_filters(status, search))
+        query = query.order_by(*Concert.catalogue_order()).options(*Concert.fieldset_options(fieldset))
         
         # Paginate
-        result = paginate_query(query, page, per_page)
+        result = paginate_query(query, page, per_page, fieldset, rows=ConcertRow)
         
         return success_response(result, 'Concerts retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve concerts', 500)
 
+@concerts_bp.route('/availability', methods=['GET'])
+@query_budget(1)
+@replica_read
+def get_concerts_availability():
+    try:
+        # Accept ids=1,2,3 as well as repeated ids=1&ids=2
+        raw_ids = []
+        for value in request.args.getlist('ids'):
+            raw_ids.extend(part for part in value.split(',') if part.strip())
+        
+        if not raw_ids:
+            return error_response('ids is required', 400)
+        
+        try:
+            concert_ids = list(dict.fromkeys(int(value) for value in raw_ids))
+        except ValueError:
+            return error_response('ids must be a comma separated list of integers', 400)
+        
+        max_ids = current_app.config['AVAILABILITY_MAX_IDS']
+        if len(concert_ids) > max_ids:
+            return error_response(f'At most {max_ids} concert ids can be requested at once', 400)
+        
+        availability = get_availability(concert_ids)
+        
+        return success_response({
+            'fields': AVAILABILITY_FIELDS,
+            'availability': {
+                str(concert_id): availability.get(concert_id, [])
+                for concert_id in concert_ids
+            }
+        }, 'Concert availability retrieved successfully')
+        
+    except Exception as e:
+        return error_response('Failed to retrieve concert availability', 500)
+
 @concerts_bp.route('/<int:concert_id>', methods=['GET'])
+@query_budget(2)
+@replica_read
 def get_concert(concert_id):
     try:
-        concert = Concert.query.get(concert_id)
+        fieldset = request_fieldset(Concert)
+        concert = Concert.query.options(*Concert.fieldset_options(fieldset)).get(concert_id)
         
         if not concert:
             return error_response('Concert not found', 404)
         
         # Include ticket types in the response
-        concert_data = concert.to_dict()
+        concert_data = concert.to_dict(fieldset)
         
         return success_response(concert_data, 'Concert retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve concert', 500)
 
@@ -67,33 +109,13 @@ def create_concert(current_user):
     try:
         data = request.get_json()
         
-        # Validasi input
-        required_fields = ['title', 'venue', 'date', 'time']
-        for field in required_fields:
-            if not data.get(field):
-                return error_response(f'{field} is required', 400)
-        
-        # Parse date and time
+        # Same rules as the bulk import (app/utils/concert_import.py)
         try:
-            concert_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-            concert_time = datetime.strptime(data['time'], '%H:%M').time()
-        except ValueError:
-            return error_response('Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time', 400)
-        
-        # Validasi tanggal tidak boleh di masa lalu
-        if concert_date < date.today():
-            return error_response('Concert date cannot be in the past', 400)
-        
-        # Buat concert baru
-        concert = Concert(
-            title=data['title'].strip(),
-            description=data.get('description', '').strip(),
-            venue=data['venue'].strip(),
-            date=concert_date,
-            time=concert_time,
-            banner_image=data.get('banner_image', '').strip(),
-            status=data.get('status', 'upcoming')
-        )
+            values = validate_concert(data)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        concert = Concert(**values)
         
         db.session.add(concert)
         db.session.commit()
@@ -104,6 +126,48 @@ def create_concert(current_user):
         db.session.rollback()
         return error_response('Failed to create concert', 500)
 
+@concerts_bp.route('/import', methods=['POST'])
+@admin_required
+def import_concerts(current_user):
+    """
+    Bulk-create concerts and their ticket types from a CSV or JSON file, sent as the
+    "file" field of a multipart form or as the raw request body (?format=csv|json).
+    """
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            import_format = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+        else:
+            stream = request.stream
+            import_format = request.args.get('format') or detect_format(mimetype=request.mimetype)
+        
+        if import_format not in IMPORT_FORMATS:
+            return error_response('Unknown file format. Use ?format=csv or ?format=json', 400)
+        
+        config = current_app.config
+        importer = ConcertImporter(
+            batch_size=request.args.get('batch_size', config['IMPORT_BATCH_SIZE'], type=int),
+            dry_run=request.args.get('dry_run', 'false').lower() in ('1', 'true', 'yes'),
+            max_errors=config['IMPORT_MAX_ERRORS']
+        )
+        if importer.batch_size <= 0:
+            return error_response('batch_size must be greater than 0', 400)
+        
+        summary = importer.run(iter_records(open_text(stream), import_format))
+        
+        print(f"📥 Concert import by {current_user.email}: {summary['concerts_created']} concerts, "
+              f"{summary['ticket_types_created']} ticket types, {summary['rows_failed']} failed rows")
+        
+        message = 'Import validated' if importer.dry_run else 'Import finished'
+        if summary['rows_failed']:
+            message += f" with {summary['rows_failed']} failed rows"
+        return success_response(summary, message)
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to import concerts', 500)
+
 @concerts_bp.route('/<int:concert_id>', methods=['PUT'])
 @admin_required
 def update_concert(current_user, concert_id):
@@ -175,18 +239,16 @@ def delete_concert(current_user, concert_id):
             # Get all ticket type IDs
             ticket_type_ids = [tt.ticket_type_id for tt in ticket_types]
             
-            # Check if any order items exist for these ticket types
-            existing_orders = OrderItem.query.filter(
-                OrderItem.ticket_type_id.in_(ticket_type_ids)
-            ).first()
-            
-            if existing_orders:
+            # Check if any order items exist for these ticket types, archived ones included
+            if ticket_type_has_orders(ticket_type_ids):
                 print(f"❌ Cannot delete concert #{concert_id}: Has existing orders")
                 return error_response('Cannot delete concert with existing orders', 400)
         
         print(f"✅ Concert #{concert_id} is safe to delete (no existing orders)")
         
-        # Delete the concert
+        # Delete the concert, after its seat bitmaps, unordered holds and waitlist entries
+        clear_concert_seating(concert_id)
+        clear_waitlist([tt.ticket_type_id for tt in ticket_types])
         db.session.delete(concert)
         db.session.commit()
         
@@ -204,6 +266,8 @@ def delete_concert(current_user, concert_id):
         return error_response('Failed to delete concert', 500)
 
 @concerts_bp.route('/<int:concert_id>/tickets', methods=['GET'])
+@query_budget(2)
+@replica_read
 def get_concert_tickets(concert_id):
     try:
         concert = Concert.query.get(concert_id)
@@ -211,14 +275,53 @@ def get_concert_tickets(concert_id):
         if not concert:
             return error_response('Concert not found', 404)
         
-        tickets = TicketType.query.filter_by(concert_id=concert_id).all()
-        tickets_data = [ticket.to_dict() for ticket in tickets]
+        fieldset = request_fieldset(TicketType)
+        if current_app.config['ROW_SERIALIZATION']:
+            tickets = TicketTypeRow.fetch(fieldset, TicketType.concert_id == concert_id)
+        else:
+            tickets = TicketType.query.filter_by(concert_id=concert_id).options(*TicketType.fieldset_options(fieldset)).all()
+        tickets_data = [ticket.to_dict(fieldset) for ticket in tickets]
         
         return success_response(tickets_data, 'Concert tickets retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve concert tickets', 500)
 
+@concerts_bp.route('/<int:concert_id>/availability/stream', methods=['GET'])
+def stream_concert_availability(concert_id):
+    # Each open stream holds a worker thread here; app/asgi.py serves the same stream as a coroutine
+    try:
+        concert = Concert.query.get(concert_id)
+        
+        if not concert:
+            return error_response('Concert not found', 404)
+        
+        # Snapshot is taken here so the stream itself never touches the database
+        initial_payload = availability_broker.encode(
+            concert_id, get_availability([concert_id]).get(concert_id, [])
+        )
+        keepalive = current_app.config['SSE_KEEPALIVE_INTERVAL']
+        subscriber = availability_broker.subscribe(concert_id)
+        
+        def stream():
+            try:
+                yield initial_payload
+                while True:
+                    payload = subscriber.wait(keepalive)
+                    yield payload if payload is not None else ': keepalive\n\n'
+            finally:
+                availability_broker.unsubscribe(subscriber)
+        
+        return Response(stream(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return error_response('Failed to open availability stream', 500)
+
 @concerts_bp.route('/<int:concert_id>/tickets', methods=['POST'])
 @admin_required
 def create_concert_ticket(current_user, concert_id):
@@ -262,8 +365,164 @@ def create_concert_ticket(current_user, concert_id):
         db.session.add(ticket_type)
         db.session.commit()
         
+        availability_broker.publish(concert_id)
+        
         return success_response(ticket_type.to_dict(), 'Ticket type created successfully', 201)
         
     except Exception as e:
         db.session.rollback()
-        return error_response('Failed to create ticket type', 500)
\ No newline at end of file
+        return error_response('Failed to create ticket type', 500)
+
+def _parse_tier(item):
+    """Validate one entry of a bulk tiers payload, with the same rules as create_concert_ticket"""
+    if not isinstance(item, dict):
+        raise InventoryError('Each tier must be an object', 400)
+    
+    tier = {'ticket_type_id': item.get('ticket_type_id')}
+    if tier['ticket_type_id'] is None:
+        for field in ['name', 'price', 'quantity_total']:
+            if field not in item:
+                raise InventoryError(f'{field} is required', 400)
+    
+    if 'name' in item:
+        if not isinstance(item['name'], str) or not item['name'].strip():
+            raise InventoryError('name is required', 400)
+        tier['name'] = item['name'].strip()
+    
+    try:
+        if 'price' in item:
+            tier['price'] = float(item['price'])
+            if tier['price'] <= 0:
+                raise InventoryError('Price must be greater than 0', 400)
+        if 'quantity_total' in item:
+            tier['quantity_total'] = int(item['quantity_total'])
+            if tier['quantity_total'] <= 0:
+                raise InventoryError('Quantity must be greater than 0', 400)
+    except (ValueError, TypeError):
+        raise InventoryError('Invalid price or quantity format', 400)
+    
+    return tier
+
+def _parse_move(item):
+    if not isinstance(item, dict) or 'from' not in item or 'to' not in item:
+        raise InventoryError('Each move needs "from", "to" and "quantity"', 400)
+    try:
+        quantity = int(item.get('quantity'))
+    except (ValueError, TypeError):
+        raise InventoryError('Invalid quantity format', 400)
+    if quantity <= 0:
+        raise InventoryError('Quantity must be greater than 0', 400)
+    return item['from'], item['to'], quantity
+
+def _resolve_tier(tiers, reference):
+    """A tier of the concert by ticket_type_id or by (unique) name"""
+    if isinstance(reference, str):
+        matches = [tier for tier in tiers.values() if tier.name == reference.strip()]
+        if len(matches) > 1:
+            raise InventoryError(f'Ticket type name "{reference}" is ambiguous, use its ticket_type_id', 400)
+        tier = matches[0] if matches else None
+    else:
+        tier = tiers.get(reference)
+    if tier is None:
+        raise InventoryError(f'Ticket type {reference} not found for this concert', 404)
+    return tier
+
+@concerts_bp.route('/<int:concert_id>/tickets/bulk', methods=['PUT'])
+@admin_required
+def bulk_update_concert_tickets(current_user, concert_id):
+    """
+    Create/update several ticket types and move capacity between them in one transaction:
+    {"tiers": [{"ticket_type_id": 1, "price": 90}, {"name": "VIP", "price": 250, "quantity_total": 100}],
+     "moves": [{"from": 1, "to": "VIP", "quantity": 500}]}
+    """
+    try:
+        concert = Concert.query.get(concert_id)
+        
+        if not concert:
+            return error_response('Concert not found', 404)
+        
+        data = request.get_json() or {}
+        tier_items = data.get('tiers', [])
+        move_items = data.get('moves', [])
+        if not isinstance(tier_items, list) or not isinstance(move_items, list):
+            return error_response('tiers and moves must be lists', 400)
+        if not tier_items and not move_items:
+            return error_response('Nothing to update: provide tiers and/or moves', 400)
+        
+        # Validate the whole payload before writing anything
+        changes, moves = [], []
+        for index, item in enumerate(tier_items):
+            try:
+                changes.append(_parse_tier(item))
+            except InventoryError as e:
+                return error_response(f'tiers[{index}]: {e.message}', e.status_code)
+        for index, item in enumerate(move_items):
+            try:
+                moves.append(_parse_move(item))
+            except InventoryError as e:
+                return error_response(f'moves[{index}]: {e.message}', e.status_code)
+        
+        tiers = {tier.ticket_type_id: tier for tier in TicketType.query.filter_by(concert_id=concert_id).all()}
+        seated = seated_ticket_type_ids(list(tiers))
+        
+        try:
+            for index, change in enumerate(changes):
+                ticket_type_id = change['ticket_type_id']
+                if ticket_type_id is None:
+                    ticket_type = TicketType(
+                        concert_id=concert_id,
+                        name=change['name'],
+                        price=change['price'],
+                        quantity_total=change['quantity_total'],
+                        quantity_available=change['quantity_total']
+                    )
+                    db.session.add(ticket_type)
+                    db.session.flush()
+                    tiers[ticket_type.ticket_type_id] = ticket_type
+                    continue
+                
+                ticket_type = tiers.get(ticket_type_id)
+                if ticket_type is None:
+                    raise InventoryError(f'tiers[{index}]: Ticket type {ticket_type_id} not found for this concert', 404)
+                if 'name' in change:
+                    ticket_type.name = change['name']
+                if 'price' in change:
+                    ticket_type.price = change['price']
+                if 'quantity_total' in change:
+                    if ticket_type_id in seated:
+                        raise InventoryError(f'tiers[{index}]: Capacity of {ticket_type.name} comes from its seat map sections', 400)
+                    db.session.flush()
+                    if not resize_tier(ticket_type_id, change['quantity_total'], concert_id):
+                        raise InventoryError(
+                            f'tiers[{index}]: Cannot reduce {ticket_type.name} below the tickets already sold')
+            
+            for index, (source, target, quantity) in enumerate(moves):
+                try:
+                    from_tier = _resolve_tier(tiers, source)
+                    to_tier = _resolve_tier(tiers, target)
+                except InventoryError as e:
+                    raise InventoryError(f'moves[{index}]: {e.message}', e.status_code)
+                if from_tier is to_tier:
+                    raise InventoryError(f'moves[{index}]: Cannot move capacity to the same ticket type', 400)
+                if {from_tier.ticket_type_id, to_tier.ticket_type_id} & seated:
+                    raise InventoryError(f'moves[{index}]: Cannot move capacity of seated ticket types', 400)
+                
+                db.session.flush()
+                if not move_capacity(concert_id, from_tier.ticket_type_id, to_tier.ticket_type_id, quantity):
+                    raise InventoryError(
+                        f'moves[{index}]: Not enough unsold {from_tier.name} tickets to move {quantity}')
+        
+        except InventoryError as e:
+            db.session.rollback()
+            return error_response(e.message, e.status_code)
+        
+        db.session.commit()
+        
+        availability_broker.publish(concert_id)
+        
+        tickets = TicketType.query.filter_by(concert_id=concert_id).order_by(TicketType.ticket_type_id).all()
+        return success_response([ticket.to_dict() for ticket in tickets], 'Ticket types updated successfully')
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to update ticket types', 500)
@@ -0,0 +1,23 @@
+from flask import Blueprint, Response, request, current_app
+from app.utils.helpers import error_response
+from app.utils.metrics import request_metrics, render_metrics
+from app.utils.pool_metrics import pool_snapshot
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    try:
+        # Optional shared secret for scrapers: Authorization: Bearer <METRICS_TOKEN>
+        token = current_app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return error_response('Invalid metrics token', 401)
+        
+        body = render_metrics(request_metrics.collect(), pool_snapshot(current_app))
+        return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8', headers={
+            'Cache-Control': 'no-store'
+        })
+        
+    except Exception as e:
+        print(f"❌ Error collecting metrics: {str(e)}")
+        return error_response('Failed to collect metrics', 500)
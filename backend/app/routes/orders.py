@@ -5,55 +5,74 @@ from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.ticket_type import TicketType
 from app.models.concert import Concert
+from app.models.serialization import FieldsetError
 from app.utils.auth import user_required, admin_required
-from app.utils.helpers import success_response, error_response, paginate_query
+from app.utils.replica import replica_read
+from app.utils.query_stats import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.helpers import success_response, error_response, paginate_query, request_fieldset
+from app.utils.events import availability_broker
+from app.utils.inventory import reserve_tickets, release_tickets, change_order_status
+from app.utils.seating import SeatingError, seated_ticket_type_ids, claim_hold, release_order_seats
+from app.utils.waitlist import checkout_allowed
+from app.utils.order_archive import ORDER_LIST_VIEWS, find_order, paginate_orders
 
 orders_bp = Blueprint('orders', __name__)
 
 @orders_bp.route('', methods=['GET'])
+@query_budget(9)
+@replica_read
 @user_required
 def get_user_orders(current_user):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', None)
-        
-        # Base query
-        query = Order.query.filter_by(user_id=current_user.user_id)
-        
-        # Filter by status
-        if status and status in ['pending', 'payment_submitted', 'paid', 'cancelled']:
-            query = query.filter(Order.status == status)
-        
-        # Order by created_at desc
-        query = query.order_by(Order.created_at.desc())
-        
-        # Paginate
-        result = paginate_query(query, page, per_page)
+        view = request.args.get('view', 'full')
+        if view not in ORDER_LIST_VIEWS:
+            return error_response(f"view must be one of: {', '.join(ORDER_LIST_VIEWS)}", 400)
+        fieldset = request_fieldset(Order)
+        if fieldset and view == 'summary':
+            return error_response('fields and include only apply to view=full', 400)
+        
+        def criteria(order_model):
+            filters = [order_model.user_id == current_user.user_id]
+            # Filter by status
+            if status and status in ['pending', 'payment_submitted', 'paid', 'cancelled']:
+                filters.append(order_model.status == status)
+            return filters
+        
+        # Newest first, across current and archived orders
+        result = paginate_orders(criteria, page, per_page, view, fieldset)
         
         return success_response(result, 'Orders retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve orders', 500)
 
 @orders_bp.route('/<int:order_id>', methods=['GET'])
+@query_budget(5)
+@replica_read
 @user_required
 def get_order(current_user, order_id):
     try:
-        order = Order.query.filter_by(
-            order_id=order_id,
-            user_id=current_user.user_id
-        ).first()
+        fieldset = request_fieldset(Order)
+        order = find_order(order_id, user_id=current_user.user_id, fieldset=fieldset)
         
         if not order:
             return error_response('Order not found', 404)
         
-        return success_response(order.to_dict(), 'Order retrieved successfully')
+        return success_response(order.to_dict(fieldset), 'Order retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve order', 500)
 
 @orders_bp.route('', methods=['POST'])
+@rate_limit('create_order')
 @user_required
 def create_order(current_user):
     try:
@@ -78,11 +97,14 @@ def create_order(current_user):
         
         total_amount = 0
         order_items = []
+        changed_concert_ids = set()
+        seated = seated_ticket_type_ids([item.get('ticket_type_id') for item in data['items'] if isinstance(item, dict)])
         
         # Process order items
         for item_data in data['items']:
             ticket_type_id = item_data.get('ticket_type_id')
             quantity = item_data.get('quantity', 0)
+            hold_id = item_data.get('hold_id')
             
             if not ticket_type_id or quantity <= 0:
                 db.session.rollback()
@@ -94,10 +116,21 @@ def create_order(current_user):
                 db.session.rollback()
                 return error_response(f'Ticket type {ticket_type_id} not found', 404)
             
-            # Check availability
-            if ticket_type.quantity_available < quantity:
+            # Assigned seating: the seats were picked by a hold (POST /api/seating/concerts/<id>/holds)
+            if (ticket_type.ticket_type_id in seated) != bool(hold_id):
                 db.session.rollback()
-                return error_response(f'Not enough tickets available for {ticket_type.name}', 400)
+                if hold_id:
+                    return error_response(f'Ticket type {ticket_type_id} has no assigned seating', 400)
+                return error_response(f'Ticket type {ticket_type_id} has assigned seating: hold seats first and pass hold_id', 400)
+            
+            # Check availability and take the tickets in one guarded UPDATE; the waitlist goes first
+            if not reserve_tickets(ticket_type_id, quantity, checkout_allowed(ticket_type.ticket_type_id)):
+                db.session.rollback()
+                if hold_id:
+                    return error_response(f'Not enough tickets available for {ticket_type.name}', 400)
+                return error_response(
+                    f'Not enough tickets available for {ticket_type.name}. Join the waitlist (POST /api/waitlist) '
+                    f'to be offered tickets that come back', 400)
             
             # Calculate subtotal
             subtotal = float(ticket_type.price) * quantity
@@ -114,8 +147,14 @@ def create_order(current_user):
             
             order_items.append(order_item)
             
-            # Update ticket availability
-            ticket_type.quantity_available -= quantity
+            if hold_id:
+                db.session.add(order_item)
+                db.session.flush()
+                if not claim_hold(hold_id, current_user.user_id, ticket_type_id, quantity, order_item.order_item_id):
+                    db.session.rollback()
+                    return error_response(f'Seat hold {hold_id} has expired or does not match this item', 409)
+            
+            changed_concert_ids.add(ticket_type.concert_id)
         
         # Update order total
         order.total_amount = total_amount
@@ -126,6 +165,8 @@ def create_order(current_user):
         
         db.session.commit()
         
+        availability_broker.publish(*changed_concert_ids)
+        
         return success_response(order.to_dict(), 'Order created successfully', 201)
         
     except Exception as e:
@@ -185,18 +226,27 @@ def cancel_order(current_user, order_id):
         if order.status not in ['pending', 'payment_submitted']:
             return error_response('Only pending orders can be cancelled', 400)
         
+        # Only the request that actually moves the order may give its tickets back
+        if not change_order_status(order_id, ('pending', 'payment_submitted'), 'cancelled'):
+            db.session.rollback()
+            return error_response('Order was changed by another request', 409)
+        
         # Restore ticket quantities
+        changed_concert_ids = set()
         for order_item in order.order_items:
-            ticket_type = order_item.ticket_type
-            ticket_type.quantity_available += order_item.quantity
-        
-        # Update order status
-        order.status = 'cancelled'
+            release_tickets(order_item.ticket_type_id, order_item.quantity)
+            changed_concert_ids.add(order_item.ticket_type.concert_id)
+        release_order_seats([order_item.order_item_id for order_item in order.order_items])
         
         db.session.commit()
         
+        availability_broker.publish(*changed_concert_ids)
+        
         return success_response(order.to_dict(), 'Order cancelled successfully')
         
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
     except Exception as e:
         db.session.rollback()
         return error_response('Failed to cancel order', 500)
\ No newline at end of file
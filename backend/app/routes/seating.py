@@ -0,0 +1,168 @@
+from flask import Blueprint, request
+from sqlalchemy import select
+from app import db
+from app.models.concert import Concert
+from app.models.seat_map import SeatMap, SeatSection
+from app.models.seat_inventory import SeatInventory, SeatHold
+from app.utils.auth import admin_required, user_required
+from app.utils.rate_limit import rate_limit
+from app.utils.helpers import success_response, error_response
+from app.utils.seating import SeatingError, create_seat_map, assign_seat_map, hold_seats, release_hold
+
+seating_bp = Blueprint('seating', __name__)
+
+@seating_bp.route('/maps', methods=['POST'])
+@admin_required
+def create_map(current_user):
+    """
+    Create a seat map: {"name", "venue", "sections": [{"name", "row_count", "seats_per_row"}
+    or {"name", "rows": [{"label": "A", "seats": 20}, ...]}]}, best sections first
+    """
+    try:
+        seat_map = create_seat_map(request.get_json() or {})
+        db.session.commit()
+
+        print(f"💺 Admin {current_user.name} created seat map #{seat_map.seat_map_id} ({seat_map.seat_count} seats)")
+
+        seat_map = SeatMap.query.options(*SeatMap.to_dict_options()).get(seat_map.seat_map_id)
+        return success_response(seat_map.to_dict(), 'Seat map created successfully', 201)
+
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to create seat map', 500)
+
+@seating_bp.route('/maps/<int:seat_map_id>', methods=['GET'])
+def get_map(seat_map_id):
+    try:
+        seat_map = SeatMap.query.options(*SeatMap.to_dict_options()).get(seat_map_id)
+
+        if not seat_map:
+            return error_response('Seat map not found', 404)
+
+        return success_response(seat_map.to_dict(), 'Seat map retrieved successfully')
+
+    except Exception as e:
+        return error_response('Failed to retrieve seat map', 500)
+
+@seating_bp.route('/concerts/<int:concert_id>', methods=['POST'])
+@admin_required
+def assign_map(current_user, concert_id):
+    """
+    Sell a concert by seat: {"seat_map_id": 1, "sections": [{"section_id": 1, "ticket_type_id": 3}, ...]}.
+    Each ticket type's capacity becomes the seats of its sections; it must not have sales yet.
+    """
+    try:
+        concert = Concert.query.get(concert_id)
+
+        if not concert:
+            return error_response('Concert not found', 404)
+
+        data = request.get_json() or {}
+        assign_seat_map(concert_id, data.get('seat_map_id'), data.get('sections'))
+        db.session.commit()
+
+        print(f"💺 Admin {current_user.name} assigned seat map #{data.get('seat_map_id')} to concert #{concert_id}")
+
+        return success_response(concert_seating(concert_id), 'Seat map assigned successfully', 201)
+
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to assign seat map', 500)
+
+def concert_seating(concert_id):
+    rows = db.session.execute(
+        select(SeatInventory, SeatSection.seat_map_id, SeatSection.name, SeatSection.rank, SeatSection.seat_count)
+        .join(SeatSection, SeatInventory.section_id == SeatSection.section_id)
+        .where(SeatInventory.concert_id == concert_id)
+        .order_by(SeatSection.rank, SeatSection.section_id)
+    ).all()
+    sections = []
+    for inventory, _, name, rank, seat_count in rows:
+        section = inventory.to_dict()
+        section.update(name=name, rank=rank, seat_count=seat_count)
+        sections.append(section)
+    return {
+        'concert_id': concert_id,
+        'seat_map_id': rows[0].seat_map_id if rows else None,
+        'sections': sections
+    }
+
+@seating_bp.route('/concerts/<int:concert_id>', methods=['GET'])
+def get_concert_seating(concert_id):
+    """Seats of every section: `taken` is a base64 bitmap, bit i of byte i // 8 (LSB first) set = seat i taken"""
+    try:
+        seating = concert_seating(concert_id)
+
+        if not seating['sections']:
+            return error_response('Concert has no assigned seating', 404)
+
+        return success_response(seating, 'Seating retrieved successfully')
+
+    except Exception as e:
+        return error_response('Failed to retrieve seating', 500)
+
+@seating_bp.route('/concerts/<int:concert_id>/holds', methods=['POST'])
+@rate_limit('seat_hold')
+@user_required
+def create_hold(current_user, concert_id):
+    """
+    Hold the best available contiguous seats: {"ticket_type_id": 3, "quantity": 4, "section_id": 7 (optional)}.
+    Order them before expires_at with {"ticket_type_id": 3, "quantity": 4, "hold_id": ...} in POST /api/orders.
+    """
+    try:
+        data = request.get_json() or {}
+        ticket_type_id = data.get('ticket_type_id')
+        quantity = data.get('quantity', 0)
+
+        if not ticket_type_id or not isinstance(quantity, int) or quantity <= 0:
+            return error_response('Invalid ticket type or quantity', 400)
+
+        hold = hold_seats(concert_id, ticket_type_id, quantity, current_user.user_id, data.get('section_id'))
+
+        if hold is None:
+            return error_response(f'No {quantity} seats together are available', 409)
+
+        return success_response(hold.to_dict(), 'Seats held successfully', 201)
+
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to hold seats', 500)
+
+@seating_bp.route('/holds/<int:hold_id>', methods=['GET'])
+@user_required
+def get_hold(current_user, hold_id):
+    try:
+        hold = SeatHold.query.filter_by(hold_id=hold_id, user_id=current_user.user_id).first()
+
+        if not hold:
+            return error_response('Seat hold not found', 404)
+
+        return success_response(hold.to_dict(), 'Seat hold retrieved successfully')
+
+    except Exception as e:
+        return error_response('Failed to retrieve seat hold', 500)
+
+@seating_bp.route('/holds/<int:hold_id>', methods=['DELETE'])
+@user_required
+def delete_hold(current_user, hold_id):
+    try:
+        if not release_hold(hold_id, current_user.user_id):
+            return error_response('Seat hold not found or no longer held', 404)
+
+        return success_response(None, 'Seats released successfully')
+
+    except SeatingError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to release seats', 500)
@@ -4,24 +4,37 @@ from app.models.ticket_type import TicketType
 from app.models.concert import Concert
 from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.user import User
+from app.models.serialization import FieldsetError
 from app.utils.auth import admin_required, user_required
-from app.utils.helpers import success_response, error_response
-from app.utils.pdf_generator import generate_ticket_pdf
-import io
-import os
+from app.utils.replica import replica_read
+from app.utils.query_stats import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.helpers import success_response, error_response, request_fieldset
+from app.utils.events import availability_broker
+from app.utils.inventory import resize_tier
+from app.utils.order_archive import find_order, ticket_type_has_orders
+from app.utils.seating import is_seated
+from app.utils.waitlist import clear_waitlist
+from app.utils.tickets import find_ticket, tickets_for_order, check_in, transfer_ticket
 
 tickets_bp = Blueprint('tickets', __name__)
 
 @tickets_bp.route('/<int:ticket_id>', methods=['GET'])
+@query_budget(1)
+@replica_read
 def get_ticket(ticket_id):
     try:
-        ticket = TicketType.query.get(ticket_id)
+        fieldset = request_fieldset(TicketType)
+        ticket = TicketType.query.options(*TicketType.fieldset_options(fieldset)).get(ticket_id)
         
         if not ticket:
             return error_response('Ticket type not found', 404)
         
-        return success_response(ticket.to_dict(), 'Ticket type retrieved successfully')
+        return success_response(ticket.to_dict(fieldset), 'Ticket type retrieved successfully')
         
+    except FieldsetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response('Failed to retrieve ticket type', 500)
 
@@ -55,16 +68,22 @@ def update_ticket(current_user, ticket_id):
                 if quantity <= 0:
                     return error_response('Quantity must be greater than 0', 400)
                 
-                # Update available quantity proportionally
-                sold = ticket.quantity_total - ticket.quantity_available
-                ticket.quantity_total = quantity
-                ticket.quantity_available = max(0, quantity - sold)
-                
             except (ValueError, TypeError):
                 return error_response('Invalid quantity format', 400)
+            
+            if is_seated(ticket_id):
+                return error_response('Capacity of a seated ticket type comes from its seat map sections', 400)
+            
+            # Relative UPDATE keeps the tickets sold so far, even ones sold while this request runs
+            db.session.flush()
+            if not resize_tier(ticket_id, quantity):
+                db.session.rollback()
+                return error_response('Quantity cannot be less than the tickets already sold', 409)
         
         db.session.commit()
         
+        availability_broker.publish(ticket.concert_id)
+        
         return success_response(ticket.to_dict(), 'Ticket type updated successfully')
         
     except Exception as e:
@@ -80,13 +99,14 @@ def delete_ticket(current_user, ticket_id):
         if not ticket:
             return error_response('Ticket type not found', 404)
         
-        # Check if ticket type has orders
-        from app.models.order_item import OrderItem
-        has_orders = OrderItem.query.filter_by(ticket_type_id=ticket_id).first()
-        
-        if has_orders:
+        # Check if ticket type has orders, archived ones included
+        if ticket_type_has_orders([ticket_id]):
             return error_response('Cannot delete ticket type with existing orders', 400)
         
+        if is_seated(ticket_id):
+            return error_response('Cannot delete ticket type with assigned seats', 400)
+        
+        clear_waitlist([ticket_id])
         db.session.delete(ticket)
         db.session.commit()
         
@@ -98,6 +118,7 @@ def delete_ticket(current_user, ticket_id):
 
 # NEW: Download PDF Ticket
 @tickets_bp.route('/download/<int:order_id>', methods=['GET'])
+@rate_limit('ticket_pdf')
 @user_required
 def download_ticket_pdf(current_user, order_id):
     try:
@@ -106,7 +127,7 @@ def download_ticket_pdf(current_user, order_id):
         print(f"Order ID: {order_id}")
         
         # Get order and verify ownership (unless admin)
-        order = Order.query.get(order_id)
+        order = find_order(order_id, options=False)
         
         if not order:
             print("Order not found")
@@ -122,10 +143,16 @@ def download_ticket_pdf(current_user, order_id):
             print(f"Order not paid: status is {order.status}")
             return error_response('Tickets can only be downloaded for paid orders', 400)
         
+        # The buyer's stored tickets; transferred ones are reprinted by their new holder
+        tickets = tickets_for_order(order, holder_id=order.user_id)
+        if not tickets:
+            return error_response('All tickets of this order have been transferred', 400)
+        
         print("Generating PDF ticket...")
         
-        # Generate PDF
-        pdf_buffer = generate_ticket_pdf(order)
+        # Generate PDF (ReportLab/qrcode are imported on first use to keep startup fast)
+        from app.utils.pdf_generator import generate_ticket_pdf
+        pdf_buffer = generate_ticket_pdf(order, tickets)
         
         if not pdf_buffer:
             print("Failed to generate PDF")
@@ -151,6 +178,7 @@ def download_ticket_pdf(current_user, order_id):
 
 # NEW: Preview PDF Ticket (opens in browser)
 @tickets_bp.route('/preview/<int:order_id>', methods=['GET'])
+@rate_limit('ticket_pdf')
 @user_required
 def preview_ticket_pdf(current_user, order_id):
     try:
@@ -159,7 +187,7 @@ def preview_ticket_pdf(current_user, order_id):
         print(f"Order ID: {order_id}")
         
         # Get order and verify ownership (unless admin)
-        order = Order.query.get(order_id)
+        order = find_order(order_id, options=False)
         
         if not order:
             return error_response('Order not found', 404)
@@ -172,10 +200,15 @@ def preview_ticket_pdf(current_user, order_id):
         if order.status != 'paid':
             return error_response('Tickets can only be previewed for paid orders', 400)
         
+        tickets = tickets_for_order(order, holder_id=order.user_id)
+        if not tickets:
+            return error_response('All tickets of this order have been transferred', 400)
+        
         print("Generating PDF preview...")
         
-        # Generate PDF
-        pdf_buffer = generate_ticket_pdf(order)
+        # Generate PDF (ReportLab/qrcode are imported on first use to keep startup fast)
+        from app.utils.pdf_generator import generate_ticket_pdf
+        pdf_buffer = generate_ticket_pdf(order, tickets)
         
         if not pdf_buffer:
             return error_response('Failed to generate ticket PDF', 500)
@@ -194,4 +227,109 @@ def preview_ticket_pdf(current_user, order_id):
         print(f"Error generating PDF preview: {str(e)}")
         import traceback
         print(traceback.format_exc())
-        return error_response('Failed to generate ticket preview', 500)
\ No newline at end of file
+        return error_response('Failed to generate ticket preview', 500)
+
+# Ticket codes: one per admitted person, printed on the PDF and in its QR code
+@tickets_bp.route('/codes/<code>', methods=['GET'])
+@user_required
+def get_ticket_by_code(current_user, code):
+    try:
+        ticket = find_ticket(code)
+        
+        if not ticket or (current_user.role != 'admin' and ticket.user_id != current_user.user_id):
+            return error_response('Ticket not found', 404)
+        
+        return success_response(ticket.to_dict(), 'Ticket retrieved successfully')
+        
+    except Exception as e:
+        return error_response('Failed to retrieve ticket', 500)
+
+@tickets_bp.route('/codes/<code>/check-in', methods=['POST'])
+@admin_required
+def check_in_ticket(current_user, code):
+    """Admit the holder at the door; each code is accepted once"""
+    try:
+        ticket = find_ticket(code)
+        
+        if not ticket:
+            return error_response('Ticket not found', 404)
+        
+        if not check_in(ticket):
+            db.session.rollback()
+            return error_response('Ticket has already been checked in', 409)
+        
+        db.session.commit()
+        db.session.refresh(ticket)
+        
+        print(f"🚪 Ticket {ticket.display_code} checked in")
+        
+        return success_response(ticket.to_dict(), 'Ticket checked in successfully')
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to check in ticket', 500)
+
+@tickets_bp.route('/codes/<code>/transfer', methods=['POST'])
+@user_required
+def transfer(current_user, code):
+    """Give an unused ticket to another account: {"email": "friend@example.com"}; the ticket gets a new code"""
+    try:
+        data = request.get_json() or {}
+        email = (data.get('email') or '').strip().lower()
+        
+        ticket = find_ticket(code)
+        if not ticket or ticket.user_id != current_user.user_id:
+            return error_response('Ticket not found', 404)
+        
+        recipient = User.query.filter_by(email=email).first() if email else None
+        if not recipient:
+            return error_response('Recipient not found', 404)
+        if recipient.user_id == current_user.user_id:
+            return error_response('You already hold this ticket', 400)
+        
+        if not transfer_ticket(ticket, current_user.user_id, recipient.user_id):
+            db.session.rollback()
+            return error_response('Ticket has already been checked in or transferred', 409)
+        
+        db.session.commit()
+        db.session.refresh(ticket)
+        
+        print(f"🔁 Ticket #{ticket.ticket_id} transferred to user {recipient.user_id}")
+        
+        return success_response(ticket.to_dict(), 'Ticket transferred successfully')
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to transfer ticket', 500)
+
+@tickets_bp.route('/codes/<code>/pdf', methods=['GET'])
+@rate_limit('ticket_pdf')
+@user_required
+def reprint_ticket_pdf(current_user, code):
+    """Reprint one ticket for its current holder"""
+    try:
+        ticket = find_ticket(code)
+        
+        if not ticket or (current_user.role != 'admin' and ticket.user_id != current_user.user_id):
+            return error_response('Ticket not found', 404)
+        
+        order = find_order(ticket.order_id, options=False)
+        
+        from app.utils.pdf_generator import generate_ticket_pdf
+        pdf_buffer = generate_ticket_pdf(order, [ticket], holder=User.query.get(ticket.user_id))
+        
+        if not pdf_buffer:
+            return error_response('Failed to generate ticket PDF', 500)
+        
+        pdf_buffer.seek(0)
+        
+        return send_file(
+            pdf_buffer,
+            as_attachment=True,
+            download_name=f"Concert_Ticket_{ticket.display_code}.pdf",
+            mimetype='application/pdf'
+        )
+        
+    except Exception as e:
+        print(f"Error reprinting ticket: {str(e)}")
+        return error_response('Failed to generate ticket PDF', 500)
@@ -0,0 +1,92 @@
+from flask import Blueprint, request
+from app import db
+from app.models.waitlist import WaitlistEntry
+from app.utils.auth import user_required
+from app.utils.rate_limit import rate_limit
+from app.utils.helpers import success_response, error_response
+from app.utils.events import availability_broker
+from app.utils.waitlist import WaitlistError, join_waitlist, claim_offer, leave_waitlist, queue_position
+
+waitlist_bp = Blueprint('waitlist', __name__)
+
+@waitlist_bp.route('', methods=['GET'])
+@user_required
+def get_waitlist(current_user):
+    """The user's waitlist entries, newest first; waiting ones carry their queue position"""
+    try:
+        entries = WaitlistEntry.query.filter_by(user_id=current_user.user_id).order_by(
+            WaitlistEntry.entry_id.desc()
+        ).limit(100).all()
+
+        return success_response(
+            [entry.to_dict(queue_position(entry) if entry.status == 'waiting' else None) for entry in entries],
+            'Waitlist retrieved successfully'
+        )
+
+    except Exception as e:
+        return error_response('Failed to retrieve waitlist', 500)
+
+@waitlist_bp.route('', methods=['POST'])
+@rate_limit('create_order')
+@user_required
+def join(current_user):
+    """Queue for a sold-out ticket type: {"ticket_type_id": 3, "quantity": 2}"""
+    try:
+        data = request.get_json() or {}
+        ticket_type_id = data.get('ticket_type_id')
+        quantity = data.get('quantity', 0)
+
+        if not ticket_type_id or not isinstance(quantity, int) or quantity <= 0:
+            return error_response('Invalid ticket type or quantity', 400)
+
+        entry = join_waitlist(ticket_type_id, current_user.user_id, quantity)
+        db.session.commit()
+
+        return success_response(entry.to_dict(queue_position(entry)), 'Joined the waitlist successfully', 201)
+
+    except WaitlistError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to join the waitlist', 500)
+
+@waitlist_bp.route('/<int:entry_id>/claim', methods=['POST'])
+@user_required
+def claim(current_user, entry_id):
+    """Order the tickets offered to this entry before offer_expires_at; the order then follows the normal payment flow"""
+    try:
+        data = request.get_json(silent=True) or {}
+        order = claim_offer(entry_id, current_user.user_id, (data.get('payment_method') or '').strip())
+        db.session.commit()
+
+        print(f"⏳ Waitlist entry #{entry_id} claimed as order #{order.order_id}")
+
+        return success_response(order.to_dict(), 'Order created successfully', 201)
+
+    except WaitlistError as e:
+        db.session.rollback()
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to claim waitlist offer', 500)
+
+@waitlist_bp.route('/<int:entry_id>', methods=['DELETE'])
+@user_required
+def leave(current_user, entry_id):
+    """Leave the queue, or decline an offer so the next buyer gets it"""
+    try:
+        entry = WaitlistEntry.query.filter_by(entry_id=entry_id, user_id=current_user.user_id).first()
+
+        if not entry or not leave_waitlist(entry):
+            return error_response('Waitlist entry not found or no longer active', 404)
+
+        db.session.commit()
+
+        availability_broker.publish(entry.ticket_type.concert_id)
+
+        return success_response(None, 'Left the waitlist successfully')
+
+    except Exception as e:
+        db.session.rollback()
+        return error_response('Failed to leave the waitlist', 500)
@@ -0,0 +1,55 @@
+from flask import current_app
+from app import db
+from app.models.ticket_type import TicketType
+from app.utils.cache import TTLCache
+
+# Field order of each availability tuple returned to clients
+AVAILABILITY_FIELDS = ['ticket_type_id', 'price', 'available']
+
+availability_cache = TTLCache()
+
+def get_availability(concert_ids):
+    """
+    Return {concert_id: [(ticket_type_id, price, available), ...]} for the
+    given concerts, serving from the short-TTL cache and loading all misses
+    with a single grouped query.
+    """
+    result, misses = availability_cache.get_many(concert_ids)
+    
+    if misses:
+        loaded = load_availability(misses)
+        ttl = current_app.config.get('AVAILABILITY_CACHE_TTL')
+        for concert_id in misses:
+            tiers = loaded.get(concert_id, [])
+            availability_cache.set(concert_id, tiers, ttl)
+            result[concert_id] = tiers
+    
+    return result
+
+def load_availability(concert_ids):
+    """Load availability tuples for many concerts straight from the database"""
+    rows = db.session.query(
+        TicketType.concert_id,
+        TicketType.ticket_type_id,
+        TicketType.price,
+        TicketType.quantity_available
+    ).filter(
+        TicketType.concert_id.in_(concert_ids)
+    ).order_by(
+        TicketType.concert_id,
+        TicketType.ticket_type_id
+    ).all()
+    
+    availability = {}
+    for concert_id, ticket_type_id, price, available in rows:
+        availability.setdefault(concert_id, []).append(
+            (ticket_type_id, float(price), available)
+        )
+    return availability
+
+def invalidate_availability(*concert_ids):
+    """Drop cached availability, for every concert when no ids are given"""
+    if concert_ids:
+        availability_cache.invalidate(*concert_ids)
+    else:
+        availability_cache.clear()
@@ -0,0 +1,64 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry"""
+
+    def __init__(self, ttl=2.0, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                if self._data.get(key) is entry:
+                    del self._data[key]
+            return default
+        return value
+
+    def get_many(self, keys):
+        """Return (hits, misses) where hits is a dict of cached values"""
+        hits = {}
+        misses = []
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                misses.append(key)
+            else:
+                hits[key] = value
+        return hits, misses
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if len(self._data) >= self.max_entries and key not in self._data:
+                self._evict_expired()
+                if len(self._data) >= self.max_entries:
+                    # Drop the oldest insertion to stay bounded
+                    self._data.pop(next(iter(self._data)))
+            self._data[key] = (expires_at, value)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+
+
+_MISSING = object()
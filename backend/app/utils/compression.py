@@ -0,0 +1,157 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Buffered responses (jsonify) are compressed once they reach
+COMPRESSION_MIN_SIZE. Streamed responses (generators such as the SSE
+availability stream) are compressed chunk by chunk with a sync flush, so
+each event still reaches the client as soon as it is yielded. Only the
+COMPRESSION_MIMETYPES are touched; PDFs, images and send_file responses
+pass through as they are.
+
+Brotli is used when the Brotli package is installed and the client asks for
+it, gzip otherwise.
+"""
+import zlib
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip always works
+    brotli = None
+
+def parse_accept_encoding(header):
+    """Accept-Encoding header -> {coding: q}"""
+    codings = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+def choose_encoding(header, algorithms=('br', 'gzip')):
+    """Best supported coding for an Accept-Encoding header, or None for identity"""
+    codings = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for algorithm in algorithms:
+        if algorithm == 'br' and brotli is None:
+            continue
+        q = codings.get(algorithm, codings.get('*', 0.0))
+        # algorithms is in preference order, so ties keep the earlier one
+        if q > best_q:
+            best, best_q = algorithm, q
+    return best
+
+class StreamCompressor:
+    """Incremental gzip / brotli encoder"""
+
+    def __init__(self, encoding, level):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            # wbits=31 -> gzip container
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data, flush=False):
+        if self.encoding == 'br':
+            out = self._compressor.process(data)
+            return out + self._compressor.flush() if flush else out
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+def compress_bytes(data, encoding, level):
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+def compression_level(config, encoding):
+    if encoding == 'br':
+        return config['COMPRESSION_BROTLI_QUALITY']
+    return config['COMPRESSION_GZIP_LEVEL']
+
+def compress_stream(iterable, encoding, level):
+    compressor = StreamCompressor(encoding, level)
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            out = compressor.compress(chunk, flush=True)
+            if out:
+                yield out
+        yield compressor.finish()
+    finally:
+        # Closing the wrapper must close the inner generator (SSE unsubscribe)
+        close = getattr(iterable, 'close', None)
+        if close is not None:
+            close()
+
+def is_compressible(response, config):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    return response.mimetype in config['COMPRESSION_MIMETYPES']
+
+def negotiate_body(data, accept_encoding, config):
+    """
+    (body, encoding, vary) of a buffered body of a compressible type:
+    encoding is None when it goes out as is, vary when it depends on
+    Accept-Encoding. Shared by compress_response and app/asgi.py.
+    """
+    if len(data) < config['COMPRESSION_MIN_SIZE']:
+        return data, None, False
+    encoding = choose_encoding(accept_encoding, config['COMPRESSION_ALGORITHMS'])
+    if encoding is None:
+        return data, None, True
+    compressed = compress_bytes(data, encoding, compression_level(config, encoding))
+    if len(compressed) >= len(data):
+        return data, None, True
+    return compressed, encoding, True
+
+def compress_response(response):
+    config = current_app.config
+    if not config['COMPRESSION_ENABLED'] or request.method == 'HEAD':
+        return response
+    if not is_compressible(response, config):
+        return response
+
+    if response.is_streamed:
+        # From here on the body depends on Accept-Encoding
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'), config['COMPRESSION_ALGORITHMS'])
+        if encoding is None:
+            return response
+        response.response = compress_stream(response.response, encoding, compression_level(config, encoding))
+        response.headers.pop('Content-Length', None)
+    else:
+        data, encoding, vary = negotiate_body(response.get_data(), request.headers.get('Accept-Encoding'), config)
+        if vary:
+            response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+        response.set_data(data)
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -0,0 +1,314 @@
+"""
+Bulk concert import from CSV or JSON.
+
+Input is parsed as a stream, so a season file is never held in memory:
+  - CSV: one row per ticket tier, with the concert columns repeated
+    (title, venue, date, time, description, banner_image, status,
+    ticket_name, ticket_price, ticket_quantity). Consecutive rows with the
+    same title/venue/date/time belong to one concert.
+  - JSON: an array (or JSON Lines) of concert objects, each with an
+    optional "ticket_types": [{"name", "price", "quantity_total"}].
+
+Rows are validated with the same rules as create_concert and
+create_concert_ticket. Invalid concerts are reported with their row number
+and skipped; valid ones are inserted IMPORT_BATCH_SIZE at a time with one
+statement for the concerts and one executemany for their ticket types,
+then committed. On MySQL and SQLite the concerts go in as a single
+multi-row INSERT, whose rows are numbered consecutively (InnoDB, for a
+simple INSERT, from LAST_INSERT_ID()); other databases get their ids back
+from a batched INSERT ... RETURNING. If the
+database rejects a batch, it is retried concert by concert so only the
+offending rows fail.
+"""
+import csv
+import io
+import json
+from datetime import datetime, date
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.concert import Concert
+from app.models.ticket_type import TicketType
+
+IMPORT_FORMATS = ('csv', 'json')
+CONCERT_STATUSES = ('upcoming', 'ongoing', 'completed')
+CONCERT_COLUMNS = ('title', 'venue', 'date', 'time', 'description', 'banner_image', 'status')
+CSV_TICKET_COLUMNS = {'ticket_name': 'name', 'ticket_price': 'price', 'ticket_quantity': 'quantity_total'}
+
+
+class ImportFormatError(ValueError):
+    """The file itself cannot be read any further"""
+
+
+def validate_concert(data):
+    """Column values for a new concert; raises ValueError with the same messages as create_concert"""
+    for field in ['title', 'venue', 'date', 'time']:
+        if not data.get(field):
+            raise ValueError(f'{field} is required')
+
+    try:
+        concert_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+        concert_time = datetime.strptime(data['time'], '%H:%M').time()
+    except (ValueError, TypeError):
+        raise ValueError('Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time')
+
+    if concert_date < date.today():
+        raise ValueError('Concert date cannot be in the past')
+
+    status = data.get('status') or 'upcoming'
+    if status not in CONCERT_STATUSES:
+        raise ValueError(f'Invalid status. Must be one of: {", ".join(CONCERT_STATUSES)}')
+
+    values = {
+        'title': str(data['title']).strip(),
+        'description': str(data.get('description') or '').strip(),
+        'venue': str(data['venue']).strip(),
+        'date': concert_date,
+        'time': concert_time,
+        'banner_image': str(data.get('banner_image') or '').strip(),
+        'status': status
+    }
+    for field in ['title', 'venue', 'banner_image']:
+        if len(values[field]) > 255:
+            raise ValueError(f'{field} must be at most 255 characters')
+    return values
+
+def validate_ticket_type(data):
+    """Column values for a new ticket type; same rules as create_concert_ticket"""
+    for field in ['name', 'price', 'quantity_total']:
+        if data.get(field) in (None, ''):
+            raise ValueError(f'{field} is required')
+
+    try:
+        price = float(data['price'])
+        quantity = int(data['quantity_total'])
+    except (ValueError, TypeError):
+        raise ValueError('Invalid price or quantity format')
+
+    if price <= 0:
+        raise ValueError('Price must be greater than 0')
+    if quantity <= 0:
+        raise ValueError('Quantity must be greater than 0')
+
+    name = str(data['name']).strip()
+    if len(name) > 100:
+        raise ValueError('name must be at most 100 characters')
+    return {'name': name, 'price': price, 'quantity_total': quantity, 'quantity_available': quantity}
+
+# Parsers: each yields (row, concert data, [(row, ticket type data)])
+
+def iter_csv_records(text):
+    reader = csv.DictReader(text)
+    if reader.fieldnames is None:
+        return
+    reader.fieldnames = [(name or '').strip().lower() for name in reader.fieldnames]
+
+    current_key, current = None, None
+    for data in reader:
+        row = reader.line_num
+        data = {key: (value or '').strip() for key, value in data.items() if key}
+        key = tuple(data.get(column, '') for column in ('title', 'venue', 'date', 'time'))
+        if key != current_key:
+            if current is not None:
+                yield current
+            current_key = key
+            current = (row, {column: data.get(column, '') for column in CONCERT_COLUMNS}, [])
+
+        if any(data.get(column) for column in CSV_TICKET_COLUMNS):
+            current[2].append((row, {field: data.get(column) for column, field in CSV_TICKET_COLUMNS.items()}))
+
+    if current is not None:
+        yield current
+
+def iter_json_records(text, chunk_size=65536, max_item_size=1048576):
+    """Concert objects from a JSON array or JSON Lines, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+    number = 0
+
+    while True:
+        # Skip whitespace and the array punctuation between objects
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] in ',]' or
+                                          (buffer[position] == '[' and not started)):
+            started = started or buffer[position] == '['
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                return
+            chunk = text.read(chunk_size)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # A broken item is not completed by reading on, so don't buffer the rest of the file
+            if eof or len(buffer) - position > max_item_size:
+                raise ImportFormatError(f'Invalid JSON in item {number + 1}: {e.msg}')
+            chunk = text.read(chunk_size)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            continue
+
+        started = True
+        position = end
+        number += 1
+        if not isinstance(item, dict):
+            yield number, None, []
+            continue
+        tiers = item.get('ticket_types') or []
+        if not isinstance(tiers, list):
+            tiers = [tiers]
+        yield number, item, [(number, tier) for tier in tiers]
+
+def iter_records(text, import_format):
+    if import_format == 'csv':
+        return iter_csv_records(text)
+    return iter_json_records(text)
+
+def detect_format(filename=None, mimetype=None):
+    name = (filename or '').lower()
+    if name.endswith('.csv') or 'csv' in (mimetype or ''):
+        return 'csv'
+    if name.endswith(('.json', '.jsonl', '.ndjson')) or 'json' in (mimetype or ''):
+        return 'json'
+    return None
+
+def open_text(binary_stream):
+    # utf-8-sig drops the BOM spreadsheet exports start with
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+
+
+class ConcertImporter:
+    def __init__(self, batch_size=500, dry_run=False, max_errors=1000, returning=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.returning = returning  # None: RETURNING except on MySQL / SQLite
+        self._id_step = None
+        self.concerts_created = 0
+        self.ticket_types_created = 0
+        self.rows_failed = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.rows_failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'message': message})
+
+    def validate(self, data, tiers):
+        if data is None:
+            raise ValueError('Each item must be an object')
+        values = validate_concert(data)
+        ticket_values = []
+        for tier_row, tier in tiers:
+            if not isinstance(tier, dict):
+                raise ValueError('Each ticket type must be an object')
+            try:
+                ticket_values.append(validate_ticket_type(tier))
+            except ValueError as e:
+                raise ValueError(f'Ticket type "{tier.get("name") or "?"}" (row {tier_row}): {e}')
+        return values, ticket_values
+
+    def run(self, records):
+        batch = []
+        try:
+            for row, data, tiers in records:
+                try:
+                    batch.append((row, *self.validate(data, tiers)))
+                except ValueError as e:
+                    self.error(row, str(e))
+                    continue
+
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+        except ImportFormatError as e:
+            self.error(None, str(e))
+        except (csv.Error, UnicodeDecodeError) as e:
+            self.error(None, f'Unreadable file: {str(e)}')
+
+        if batch:
+            self.flush(batch)
+        return self.summary()
+
+    def flush(self, batch):
+        if self.dry_run:
+            self.concerts_created += len(batch)
+            self.ticket_types_created += sum(len(tickets) for _, _, tickets in batch)
+            return
+
+        try:
+            ticket_count = self.insert(batch)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            # Find the rows the database rejects without losing the rest of the batch
+            for item in batch:
+                try:
+                    ticket_count = self.insert([item])
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    self.error(item[0], f'Database rejected the row: {e.__class__.__name__}')
+                    continue
+                self.concerts_created += 1
+                self.ticket_types_created += ticket_count
+            return
+
+        self.concerts_created += len(batch)
+        self.ticket_types_created += ticket_count
+
+        print(f"📥 Imported {len(batch)} concerts ({self.concerts_created} so far)")
+
+    def insert(self, batch):
+        concert_rows = [values for _, values, _ in batch]
+        returning = self.returning
+        if returning is None:
+            # SQLAlchemy can only keep RETURNING rows in order on SQLite / MariaDB by sending one INSERT per row
+            dialect = db.engine.dialect
+            returning = (dialect.name not in ('mysql', 'mariadb', 'sqlite')
+                         and dialect.insert_executemany_returning_sort_by_parameter_order)
+        if returning:
+            concert_ids = db.session.scalars(
+                insert(Concert).returning(Concert.concert_id, sort_by_parameter_order=True), concert_rows
+            ).all()
+        else:
+            # One multi-row INSERT, whose ids are consecutive
+            result = db.session.execute(insert(Concert).values(concert_rows))
+            concert_ids = self.inserted_ids(result, len(concert_rows))
+
+        ticket_rows = [
+            {**tickets, 'concert_id': concert_id}
+            for concert_id, (_, _, ticket_values) in zip(concert_ids, batch)
+            for tickets in ticket_values
+        ]
+        if ticket_rows:
+            db.session.execute(insert(TicketType), ticket_rows)
+        return len(ticket_rows)
+
+    def inserted_ids(self, result, count):
+        """Ids of the rows of one multi-row INSERT of count rows"""
+        if result.rowcount != count or not result.lastrowid:
+            raise SQLAlchemyError(f'Cannot tell the ids of {count} inserted concerts')
+        if self._id_step is None:
+            self._id_step = 1
+            if db.engine.dialect.name in ('mysql', 'mariadb'):
+                self._id_step = int(db.session.scalar(text('SELECT @@auto_increment_increment')) or 1)
+        # MySQL reports the first id of the statement (LAST_INSERT_ID()), SQLite the last
+        first = result.lastrowid
+        if db.engine.dialect.name not in ('mysql', 'mariadb'):
+            first -= (count - 1) * self._id_step
+        return [first + index * self._id_step for index in range(count)]
+
+    def summary(self):
+        return {
+            'concerts_created': self.concerts_created,
+            'ticket_types_created': self.ticket_types_created,
+            'rows_failed': self.rows_failed,
+            'errors': self.errors,
+            'dry_run': self.dry_run
+        }
@@ -0,0 +1,41 @@
+"""
+Concert status from the clock: upcoming -> ongoing at the start time,
+ongoing -> completed CONCERT_DURATION_HOURS later. Run by the scheduler
+every CONCERT_STATUS_INTERVAL seconds as one set-based UPDATE.
+"""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from flask import current_app
+from sqlalchemy import update, and_, or_, case
+from app import db
+from app.models.concert import Concert
+
+def local_now(timezone=None):
+    """Current time as naive local time of the concerts (CONCERT_TIMEZONE, else the server's)"""
+    if timezone:
+        return datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
+    return datetime.now()
+
+def update_concert_statuses(now=None):
+    """Move every due concert to its current status; returns the number of concerts changed"""
+    config = current_app.config
+    now = now or local_now(config['CONCERT_TIMEZONE'])
+    started = Concert.starts_before(now)
+    ended = Concert.starts_before(now - timedelta(hours=config['CONCERT_DURATION_HOURS']))
+
+    # Upcoming concerts whose start passed (straight to completed if already over), ongoing ones that ended
+    result = db.session.execute(
+        update(Concert)
+        .where(or_(
+            and_(Concert.status == 'upcoming', started),
+            and_(Concert.status == 'ongoing', ended)
+        ))
+        .values(status=case((ended, 'completed'), else_='ongoing'))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    changed = max(result.rowcount, 0)
+    if changed:
+        print(f"🕒 Concert status scheduler: {changed} concerts moved on")
+    return changed
@@ -0,0 +1,28 @@
+"""
+CORS for the API, the same on both entry points.
+
+The Flask app gets flask_cors with EXPOSE_HEADERS; app/asgi.py adds
+cors_headers() to the responses it builds itself, which are simple GETs
+and never preflighted. tests/test_asgi.py compares the two.
+"""
+from flask_cors import CORS
+from app.utils.replica import LAST_WRITE_HEADER
+
+# Response headers browser clients may read
+EXPOSE_HEADERS = [
+    LAST_WRITE_HEADER,                                 # Read-your-writes marker, see app/utils/replica.py
+    'Retry-After', 'X-RateLimit-Limit', 'X-RateLimit-Remaining',
+    'X-DB-Query-Count', 'X-DB-Query-Time-Ms', 'X-DB-N-Plus-One', 'X-DB-Query-Budget',
+]
+
+def cors_headers(origin):
+    """Headers flask_cors sends on a simple request from origin (None when there is no Origin header)"""
+    headers = [('Access-Control-Expose-Headers', ', '.join(sorted(EXPOSE_HEADERS)))]  # flask_cors sorts them
+    if origin:
+        headers += [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')]
+    else:
+        headers.append(('Access-Control-Allow-Origin', '*'))
+    return headers
+
+def init_app(app):
+    CORS(app, expose_headers=EXPOSE_HEADERS)
@@ -1,4 +1,5 @@
 from app import db
+from sqlalchemy import func
 
 def save_to_db(obj):
     """Helper function to save object to database"""
@@ -27,4 +28,29 @@ def commit_changes():
         return True
     except Exception as e:
         db.session.rollback()
-        return False
\ No newline at end of file
+        return False
+
+def verify_schema_version():
+    """
+    Cheap startup check used instead of db.create_all(): one indexed
+    MAX() on schema_migrations compared to the version the code expects.
+    """
+    from app.models.schema_migration import SchemaMigration, SCHEMA_VERSION
+    
+    try:
+        applied = db.session.query(func.max(SchemaMigration.version)).filter(
+            SchemaMigration.status == 'completed'
+        ).scalar() or 0
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f'Could not read schema_migrations ({e}). Run: python -m data_migrations run') from e
+    finally:
+        db.session.remove()
+    
+    if applied < SCHEMA_VERSION:
+        raise RuntimeError(
+            f'Database schema version {applied} is older than {SCHEMA_VERSION}. Run: python -m data_migrations run'
+        )
+    
+    return applied
+
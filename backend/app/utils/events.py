@@ -0,0 +1,280 @@
+import asyncio
+import atexit
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, func
+from app import db
+from app.models.availability_change import AvailabilityChange
+from app.utils.availability import AVAILABILITY_FIELDS, load_availability, invalidate_availability
+
+# Ids allocated by transactions that commit late can appear below the highest id already
+# read, so every poll re-reads this many ids back and skips the ones it has seen
+POLL_LOOKBACK = 100
+POLL_LIMIT = 5000
+
+
+class Subscriber:
+    """One SSE client waiting for availability updates of a single concert"""
+
+    __slots__ = ('concert_id', '_payload', '_event', '_loop')
+
+    def __init__(self, concert_id, loop=None):
+        self.concert_id = concert_id
+        self._payload = None
+        self._loop = loop
+        # Streams served by app/asgi.py wait on their event loop instead of a thread
+        self._event = asyncio.Event() if loop is not None else threading.Event()
+
+    def push(self, payload):
+        # Only the latest snapshot matters, older unsent payloads are replaced
+        self._payload = payload
+        if self._loop is None:
+            self._event.set()
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # Loop already closed, the stream is gone
+
+    def _take(self):
+        self._event.clear()
+        payload, self._payload = self._payload, None
+        return payload
+
+    def wait(self, timeout):
+        """Block until a new payload arrives, returning None on timeout"""
+        if not self._event.wait(timeout):
+            return None
+        return self._take()
+
+    async def wait_async(self, timeout):
+        """wait() for subscribers created with a loop"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._take()
+
+
+class AvailabilityBroker:
+    """
+    Fans ticket availability changes out to SSE subscribers.
+    
+    Routes call publish() after committing a change. It only marks the
+    concerts as changed; one background thread per process appends them
+    to the availability_changes table with a single INSERT per
+    SSE_MIN_INTERVAL, one row per concert however often it changed, so
+    the request path never pays for the fan-out. While a process has
+    subscribers, the same thread polls that table every SSE_MIN_INTERVAL,
+    so changes made by any worker or node reach subscribers on every
+    other. With SSE_SHARED_FANOUT off nothing is written and only local
+    subscribers are told. Changed concerts are coalesced per poll; fresh
+    availability for all of them is loaded with one query and the same
+    encoded payload goes to every subscriber, so idle subscribers never
+    hold a database connection.
+    
+    The stream is public, so it only carries aggregate availability;
+    buyers see their own waitlist offers through GET /api/waitlist.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.min_interval = 0.25
+        self.shared = True
+        self._subscribers = {}
+        self._pending = set()
+        self._unrecorded = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._sequence = 0
+        self._position = None
+        self._seen = set()
+
+    def init_app(self, app):
+        self.app = app
+        self.min_interval = app.config.get('SSE_MIN_INTERVAL', self.min_interval)
+        self.shared = app.config.get('SSE_SHARED_FANOUT', self.shared)
+        # Changes published in the last interval before exit (scripts, recycled workers)
+        atexit.unregister(self.record_changes)
+        atexit.register(self.record_changes)
+        app.extensions['availability_broker'] = self
+
+    def subscribe(self, concert_id, loop=None):
+        """Register an SSE client; pass the event loop for subscribers awaited with wait_async()"""
+        subscriber = Subscriber(concert_id, loop)
+        with self._lock:
+            self._subscribers.setdefault(concert_id, set()).add(subscriber)
+            self._ensure_thread()
+        self._wake.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.concert_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.concert_id]
+
+    def subscriber_count(self, concert_id=None):
+        with self._lock:
+            if concert_id is not None:
+                return len(self._subscribers.get(concert_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, *concert_ids):
+        """Mark concerts as changed; call after the change is committed"""
+        concert_ids = {concert_id for concert_id in concert_ids if concert_id is not None}
+        if not concert_ids:
+            return
+        
+        invalidate_availability(*concert_ids)
+        
+        with self._lock:
+            if self.shared:
+                # Written by the broker thread, coalesced with everything else published this interval
+                self._unrecorded.update(concert_ids)
+            watched = {concert_id for concert_id in concert_ids if concert_id in self._subscribers}
+            self._pending.update(watched)
+            if not self._unrecorded and not watched:
+                return
+            self._ensure_thread()
+        self._wake.set()
+
+    def record_changes(self):
+        """Append one change row per concert published since the last call, in one INSERT"""
+        with self._lock:
+            concert_ids, self._unrecorded = self._unrecorded, set()
+        if not concert_ids:
+            return
+        now = datetime.utcnow()
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(insert(AvailabilityChange), [
+                        {'concert_id': concert_id, 'created_at': now} for concert_id in sorted(concert_ids)
+                    ])
+        except Exception as e:
+            # Subscribers on other processes miss these changes, local ones still get them
+            print(f"⚠️ Could not record availability changes: {str(e)}")
+
+    def encode(self, concert_id, tiers):
+        """Encode one availability snapshot as an SSE message"""
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        data = json.dumps({
+            'concert_id': concert_id,
+            'fields': AVAILABILITY_FIELDS,
+            'availability': tiers
+        }, separators=(',', ':'))
+        return f"id: {sequence}\nevent: availability\ndata: {data}\n\n"
+
+    def _ensure_thread(self):
+        # Started lazily so pre-forked workers each get their own flusher
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='availability-broker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._subscribers and not self._unrecorded
+            if idle:
+                # Nothing to deliver: stop polling until the next subscriber, then start from the head
+                self._position = None
+                self._wake.wait()
+            else:
+                self._wake.wait(self.min_interval)
+            self._wake.clear()
+            
+            started = time.monotonic()
+            self.record_changes()
+            with self._lock:
+                polling = bool(self._subscribers)
+            
+            changed = set()
+            if polling:
+                try:
+                    changed = self._poll()
+                except Exception as e:
+                    print(f"❌ Availability broker poll failed: {str(e)}")
+            else:
+                self._position = None
+            
+            with self._lock:
+                changed |= self._pending
+                self._pending = set()
+                pending = {concert_id for concert_id in changed if concert_id in self._subscribers}
+            
+            if pending:
+                try:
+                    self._flush(pending)
+                except Exception as e:
+                    print(f"❌ Availability broker flush failed: {str(e)}")
+            
+            # Coalesce everything published during the interval into the next flush
+            elapsed = time.monotonic() - started
+            if elapsed < self.min_interval:
+                time.sleep(self.min_interval - elapsed)
+
+    def _poll(self):
+        """Concerts changed by any process since the last poll"""
+        with self.app.app_context():
+            try:
+                if self._position is None:
+                    self._position = db.session.scalar(select(func.max(AvailabilityChange.change_id))) or 0
+                    self._seen = set()
+                    return set()
+                
+                low = self._position - POLL_LOOKBACK
+                rows = db.session.execute(
+                    select(AvailabilityChange.change_id, AvailabilityChange.concert_id)
+                    .where(AvailabilityChange.change_id > low)
+                    .order_by(AvailabilityChange.change_id)
+                    .limit(POLL_LIMIT)
+                ).all()
+            finally:
+                db.session.remove()
+        
+        changed = {concert_id for change_id, concert_id in rows if change_id not in self._seen}
+        if rows:
+            self._position = max(self._position, rows[-1][0])
+        low = self._position - POLL_LOOKBACK
+        self._seen = {change_id for change_id in self._seen if change_id > low}
+        self._seen.update(change_id for change_id, _ in rows if change_id > low)
+        
+        # Also keeps this process's availability cache in step with writes made elsewhere
+        if changed:
+            invalidate_availability(*changed)
+        return changed
+
+    def _flush(self, concert_ids):
+        with self.app.app_context():
+            try:
+                availability = load_availability(list(concert_ids))
+            finally:
+                db.session.remove()
+        
+        for concert_id in concert_ids:
+            payload = self.encode(concert_id, availability.get(concert_id, []))
+            with self._lock:
+                subscribers = list(self._subscribers.get(concert_id, ()))
+            for subscriber in subscribers:
+                subscriber.push(payload)
+
+
+availability_broker = AvailabilityBroker()
+
+
+def prune_availability_changes():
+    """Scheduled: drop change rows every broker has long since polled"""
+    retention = availability_broker.app.config['SSE_CHANGE_RETENTION']
+    result = db.session.execute(
+        delete(AvailabilityChange).where(AvailabilityChange.created_at < datetime.utcnow() - timedelta(seconds=retention))
+    )
+    db.session.commit()
+    return result.rowcount
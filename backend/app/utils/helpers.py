@@ -1,5 +1,6 @@
-from flask import jsonify
+from flask import jsonify, request, current_app
 from math import ceil
+from app.models.serialization import Fieldset
 
 def success_response(data=None, message="Success", status_code=200):
     response = {
@@ -19,18 +20,31 @@ def error_response(message="Error occurred", status_code=400, errors=None):
         response['errors'] = errors
     return jsonify(response), status_code
 
-def paginate_query(query, page=1, per_page=10):
+def paginate_query(query, page=1, per_page=10, fieldset=None, rows=None):
+    """One page of query as to_dict(fieldset) items; rows (a ModelRow class) serializes without ORM instances"""
     total = query.count()
-    items = query.offset((page - 1) * per_page).limit(per_page).all()
+    if rows is not None and current_app.config['ROW_SERIALIZATION']:
+        items = rows.from_result(rows.query(query, fieldset).offset((page - 1) * per_page).limit(per_page).all(), fieldset)
+    else:
+        items = query.offset((page - 1) * per_page).limit(per_page).all()
     
     return {
-        'items': [item.to_dict() for item in items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'pages': ceil(total / per_page),
-            'has_prev': page > 1,
-            'has_next': page < ceil(total / per_page)
-        }
-    }
\ No newline at end of file
+        'items': [item.to_dict(fieldset) for item in items],
+        'pagination': pagination_meta(page, per_page, total)
+    }
+
+def pagination_meta(page, per_page, total):
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': ceil(total / per_page),
+        'has_prev': page > 1,
+        'has_next': page < ceil(total / per_page)
+    }
+
+def request_fieldset(model):
+    """Sparse fieldset from the fields= / include= query parameters (None if absent); raises FieldsetError"""
+    fieldset = Fieldset.from_args(request.args)
+    model.check_fieldset(fieldset)
+    return fieldset
@@ -0,0 +1,101 @@
+"""
+Atomic ticket inventory updates.
+
+Every change to quantity_total / quantity_available is a single relative
+UPDATE with its guard in the WHERE clause, so a purchase and a capacity
+change running at the same time can never overwrite each other's counts
+(an ORM read-modify-write would write back a stale number). Each function
+returns False when the guard did not match, i.e. when there were not
+enough tickets; the caller decides whether to roll back.
+
+Order status changes that give tickets back go through
+change_order_status() first: only the request whose guarded UPDATE moved
+the order may release its stock, so a cancel racing a payment rejection
+cannot put the same tickets back twice.
+"""
+from sqlalchemy import update
+from app import db
+from app.models.order import Order
+from app.models.ticket_type import TicketType
+
+
+class InventoryError(Exception):
+    def __init__(self, message, status_code=409):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _execute(statement):
+    # Callers reload the rows they return, so the session does not need syncing
+    result = db.session.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount == 1
+
+def reserve_tickets(ticket_type_id, quantity, *conditions):
+    """Take quantity tickets, only if that many are still available (and any extra conditions hold)"""
+    return _execute(
+        update(TicketType)
+        .where(TicketType.ticket_type_id == ticket_type_id, TicketType.quantity_available >= quantity, *conditions)
+        .values(quantity_available=TicketType.quantity_available - quantity)
+    )
+
+def release_tickets(ticket_type_id, quantity):
+    """Put quantity tickets back on sale"""
+    return _execute(
+        update(TicketType)
+        .where(TicketType.ticket_type_id == ticket_type_id)
+        .values(quantity_available=TicketType.quantity_available + quantity)
+    )
+
+def change_order_status(order_id, statuses, status, **values):
+    """Move an order from one of statuses to status; False when another request changed it first"""
+    return _execute(
+        update(Order)
+        .where(Order.order_id == order_id, Order.status.in_(statuses))
+        .values(status=status, **values)
+    )
+
+def resize_tier(ticket_type_id, quantity_total, concert_id=None):
+    """Set the capacity of a tier, keeping tickets already sold; fails if it would go below them"""
+    delta = quantity_total - TicketType.quantity_total
+    conditions = [TicketType.ticket_type_id == ticket_type_id, TicketType.quantity_available + delta >= 0]
+    if concert_id is not None:
+        conditions.append(TicketType.concert_id == concert_id)
+    # MySQL evaluates SET left to right, so quantity_available must be computed from the old total
+    return _execute(
+        update(TicketType)
+        .where(*conditions)
+        .ordered_values(
+            (TicketType.quantity_available, TicketType.quantity_available + delta),
+            (TicketType.quantity_total, quantity_total),
+        )
+    )
+
+def move_capacity(concert_id, from_ticket_type_id, to_ticket_type_id, quantity):
+    """Move unsold capacity between two tiers of the same concert"""
+    taken = _execute(
+        update(TicketType)
+        .where(
+            TicketType.ticket_type_id == from_ticket_type_id,
+            TicketType.concert_id == concert_id,
+            TicketType.quantity_available >= quantity,
+        )
+        .values(
+            quantity_total=TicketType.quantity_total - quantity,
+            quantity_available=TicketType.quantity_available - quantity,
+        )
+    )
+    if not taken:
+        return False
+
+    given = _execute(
+        update(TicketType)
+        .where(TicketType.ticket_type_id == to_ticket_type_id, TicketType.concert_id == concert_id)
+        .values(
+            quantity_total=TicketType.quantity_total + quantity,
+            quantity_available=TicketType.quantity_available + quantity,
+        )
+    )
+    if not given:
+        raise InventoryError(f'Ticket type {to_ticket_type_id} not found for this concert', 404)
+    return True
@@ -0,0 +1,318 @@
+"""
+Per-endpoint request metrics in the Prometheus text format (GET /metrics).
+
+Every thread records into its own shard (threading.local), so the request
+path never takes a lock; a scrape sums all shards. Histogram buckets are
+stored non-cumulatively and only accumulated when rendering.
+
+Under gunicorn each worker process has its own shards. When
+METRICS_MULTIPROCESS_DIR is set, every process periodically writes its
+totals to <dir>/<pid>.json and a scrape merges all the files, so whichever
+worker answers reports the whole server (other workers lag by up to
+METRICS_FLUSH_INTERVAL). When gunicorn reaps a worker, its child_exit
+hook (serve.py) folds the worker's counters into <dir>/aggregate.json and
+deletes its file, so recycled workers neither pile up files nor lose
+their counts to a new worker that reuses the pid.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+AGGREGATE_FILE = 'aggregate.json'
+
+
+class MetricsShard:
+    """Counters owned by a single thread"""
+    __slots__ = ('requests', 'latency', 'sizes', 'in_flight')
+
+    def __init__(self):
+        self.requests = {}   # (endpoint, method, status) -> count
+        self.latency = {}    # (endpoint, method) -> [bucket counts..., +Inf count, sum]
+        self.sizes = {}      # (endpoint,) -> [bucket counts..., +Inf count, sum]
+        self.in_flight = {}  # (endpoint,) -> current requests
+
+def observe(histograms, key, buckets, value):
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+    histogram[bisect_left(buckets, value)] += 1
+    histogram[-1] += value
+
+def merge_counts(target, source):
+    for key, value in source:
+        target[key] = target.get(key, 0) + value
+
+def merge_histograms(target, source):
+    for key, histogram in source:
+        existing = target.get(key)
+        if existing is None:
+            target[key] = list(histogram)
+        else:
+            for index, value in enumerate(histogram):
+                existing[index] += value
+
+def empty_totals():
+    return {'requests': {}, 'latency': {}, 'sizes': {}, 'in_flight': {}}
+
+def merge_file(totals, data, gauges=True):
+    """Add the totals of a snapshot file to totals"""
+    merge_counts(totals['requests'], ((tuple(key), value) for key, value in data['requests']))
+    merge_histograms(totals['latency'], ((tuple(key), value) for key, value in data['latency']))
+    merge_histograms(totals['sizes'], ((tuple(key), value) for key, value in data['sizes']))
+    if gauges:
+        merge_counts(totals['in_flight'], ((tuple(key), value) for key, value in data['in_flight']))
+
+def read_file(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+def write_file(path, totals, **extra):
+    data = {name: [[list(key), value] for key, value in values.items()] for name, values in totals.items()}
+    data.update(extra)
+    # The flusher and a scrape can write at the same time, so each thread gets its own temp file
+    temp_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w') as handle:
+        json.dump(data, handle)
+    os.replace(temp_path, path)
+
+def fold_process(multiprocess_dir, pid):
+    """
+    Add an exited worker's counters to aggregate.json and delete its file;
+    returns whether there was one. Only gunicorn's master calls this, so
+    aggregate.json has a single writer.
+    """
+    path = os.path.join(multiprocess_dir, f'{pid}.json')
+    try:
+        data = read_file(path)
+    except (OSError, ValueError):
+        return False
+
+    aggregate_path = os.path.join(multiprocess_dir, AGGREGATE_FILE)
+    totals = empty_totals()
+    try:
+        merge_file(totals, read_file(aggregate_path), gauges=False)
+    except (OSError, ValueError):
+        pass
+    # In-flight gauges of a dead worker are meaningless, counters are kept
+    merge_file(totals, data, gauges=False)
+
+    # Scrapes skip the folded pid's file until it is gone, so nothing is counted twice
+    write_file(aggregate_path, totals, folded=[pid])
+    os.remove(path)
+    return True
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()  # Only taken when a thread creates its shard
+        self._flusher = None
+        self._flusher_pid = None
+        self.multiprocess_dir = None
+        self.flush_interval = 5.0
+        self.enabled = False
+
+    def init_app(self, app):
+        self.enabled = app.config['METRICS_ENABLED']
+        self.multiprocess_dir = app.config['METRICS_MULTIPROCESS_DIR']
+        self.flush_interval = app.config['METRICS_FLUSH_INTERVAL']
+        if not self.enabled:
+            return
+
+        if self.multiprocess_dir:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['request_metrics'] = self
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = MetricsShard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    # Request hooks
+
+    def begin(self, endpoint):
+        """Count a request of endpoint as in flight; returns its start time for finish()"""
+        shard = self.shard()
+        shard.in_flight[(endpoint,)] = shard.in_flight.get((endpoint,), 0) + 1
+
+        if self.multiprocess_dir and self._flusher_pid != os.getpid():
+            self._start_flusher()
+        return time.perf_counter()
+
+    def finish(self, endpoint, method, status, started_at, size=None):
+        shard = self.shard()
+        shard.in_flight[(endpoint,)] -= 1
+        key = (endpoint, method, str(status))
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        observe(shard.latency, (endpoint, method), LATENCY_BUCKETS, time.perf_counter() - started_at)
+        if size is not None:  # Streamed responses have no known size
+            observe(shard.sizes, (endpoint,), SIZE_BUCKETS, size)
+
+    def _before_request(self):
+        endpoint = request.endpoint or 'unmatched'
+        g.metrics_started = (self.begin(endpoint), endpoint)
+
+    def _after_request(self, response):
+        # Registered before the compression hook, so this runs after it and sees wire size
+        g.metrics_response = (response.status_code, response.calculate_content_length())
+        return response
+
+    def _teardown_request(self, exception=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        started_at, endpoint = started
+        status, size = g.pop('metrics_response', (500, None))
+        self.finish(endpoint, request.method, status, started_at, size)
+
+    # Aggregation
+
+    def snapshot(self):
+        """Totals of this process across all thread shards"""
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        totals = empty_totals()
+        for shard in shards:
+            # list(dict.items()) copies in one step under the GIL, safe against concurrent inserts
+            merge_counts(totals['requests'], list(shard.requests.items()))
+            merge_counts(totals['in_flight'], list(shard.in_flight.items()))
+            merge_histograms(totals['latency'], list(shard.latency.items()))
+            merge_histograms(totals['sizes'], list(shard.sizes.items()))
+        return totals
+
+    def write_snapshot(self):
+        write_file(os.path.join(self.multiprocess_dir, f'{os.getpid()}.json'), self.snapshot())
+
+    def collect(self):
+        """Totals across every process sharing METRICS_MULTIPROCESS_DIR (or just this one)"""
+        if not self.multiprocess_dir:
+            return self.snapshot()
+
+        self.write_snapshot()
+        totals = empty_totals()
+        skipped = set()
+        try:
+            aggregate = read_file(os.path.join(self.multiprocess_dir, AGGREGATE_FILE))
+            merge_file(totals, aggregate, gauges=False)
+            skipped = {f'{pid}.json' for pid in aggregate.get('folded', [])}
+        except (OSError, ValueError):
+            pass
+
+        stale_before = time.time() - self.flush_interval * 3
+        for filename in os.listdir(self.multiprocess_dir):
+            if not filename.endswith('.json') or filename == AGGREGATE_FILE or filename in skipped:
+                continue
+            path = os.path.join(self.multiprocess_dir, filename)
+            try:
+                data = read_file(path)
+                modified = os.path.getmtime(path)
+            except (OSError, ValueError):
+                continue
+            # Gauges of workers that stopped flushing are meaningless, counters are kept
+            merge_file(totals, data, gauges=modified >= stale_before)
+        return totals
+
+    def _start_flusher(self):
+        with self._shards_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True)
+            self._flusher.start()
+        # Final counts for the master's child_exit fold
+        atexit.register(self._final_snapshot)
+
+    def _final_snapshot(self):
+        if self._flusher_pid != os.getpid():
+            return
+        try:
+            self.write_snapshot()
+        except Exception as e:
+            print(f"⚠️ Failed to write metrics snapshot: {str(e)}")
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                print(f"⚠️ Failed to write metrics snapshot: {str(e)}")
+
+
+request_metrics = RequestMetrics()
+
+# Prometheus text exposition
+
+def format_labels(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+def format_bucket(value):
+    return f'{value:g}' if isinstance(value, float) else str(value)
+
+def render_histogram(lines, name, help_text, label_names, histograms, buckets):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(buckets + ('+Inf',), histogram[:-1]):
+            cumulative += count
+            labels = format_labels(label_names + ('le',), key + (format_bucket(bound),))
+            lines.append(f'{name}_bucket{labels} {cumulative}')
+        labels = format_labels(label_names, key)
+        lines.append(f'{name}_sum{labels} {histogram[-1]:.6f}')
+        lines.append(f'{name}_count{labels} {cumulative}')
+
+def render_metrics(totals, pools=None):
+    lines = [
+        '# HELP http_requests_total Requests handled, by endpoint, method and status',
+        '# TYPE http_requests_total counter',
+    ]
+    for key, value in sorted(totals['requests'].items()):
+        lines.append(f"http_requests_total{format_labels(('endpoint', 'method', 'status'), key)} {value}")
+
+    lines.append('# HELP http_requests_in_progress Requests currently being handled, by endpoint')
+    lines.append('# TYPE http_requests_in_progress gauge')
+    for key, value in sorted(totals['in_flight'].items()):
+        lines.append(f"http_requests_in_progress{format_labels(('endpoint',), key)} {value}")
+
+    render_histogram(lines, 'http_request_duration_seconds', 'Time to produce the response, by endpoint and method',
+                     ('endpoint', 'method'), totals['latency'], LATENCY_BUCKETS)
+    render_histogram(lines, 'http_response_size_bytes', 'Response body size as sent (after compression), by endpoint',
+                     ('endpoint',), totals['sizes'], SIZE_BUCKETS)
+
+    if pools:
+        gauges = [
+            ('db_pool_checked_out', 'checked_out', 'Connections currently checked out'),
+            ('db_pool_size', 'size', 'Configured pool size'),
+            ('db_pool_overflow', 'overflow', 'Current overflow connections'),
+            ('db_pool_timeouts_total', 'timeouts', 'Checkouts that timed out (this process)'),
+        ]
+        for metric, field, help_text in gauges:
+            metric_type = 'counter' if metric.endswith('_total') else 'gauge'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} {metric_type}')
+            for engine, data in sorted(pools.items()):
+                if field in data:
+                    lines.append(f"{metric}{format_labels(('engine',), (engine,))} {data[field]}")
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,254 @@
+"""
+Hot/cold storage for orders.
+
+Orders whose concerts are all completed and at least ORDER_ARCHIVE_AFTER_DAYS
+old, and which are settled (paid or cancelled) and were placed before that
+cutoff, are moved with their items into orders_archive / order_items_archive.
+Each batch is one INSERT ... SELECT per table plus the DELETEs in a single
+transaction, so an order is always in exactly one place. orders /
+order_items then only hold recent and open orders and stay small enough to
+live in the buffer pool.
+
+Reads go across both transparently:
+  - paginate_orders() merges the two tables for order lists, taking only
+    offset + per_page rows from each side through its index (view='summary'
+    serializes the page from one grouped query per table instead of ORM objects),
+  - find_order() looks in the hot table first,
+  - scalar_across() / paid_items() build aggregates over both in one statement.
+"""
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, insert, delete, exists, or_, func, literal, union_all
+from app import db
+from app.models.user import User
+from app.models.concert import Concert
+from app.models.ticket_type import TicketType
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.order_archive import ArchivedOrder, ArchivedOrderItem
+from app.models.rows import ROW_CLASSES
+from app.utils.helpers import pagination_meta
+
+ARCHIVABLE_STATUSES = ('paid', 'cancelled')
+
+# (order model, item model) of each storage tier, hot first
+ORDER_TABLES = ((Order, OrderItem), (ArchivedOrder, ArchivedOrderItem))
+
+ORDER_LIST_VIEWS = ('full', 'summary')
+
+# Archival
+
+def archivable_order_ids(cutoff, limit):
+    """
+    Settled orders placed before cutoff with no item for a concert that is not
+    completed or ended after cutoff (the date check keeps orders without items hot too)
+    """
+    still_hot = select(OrderItem.order_item_id).join(
+        TicketType, OrderItem.ticket_type_id == TicketType.ticket_type_id
+    ).join(
+        Concert, TicketType.concert_id == Concert.concert_id
+    ).where(
+        OrderItem.order_id == Order.order_id,
+        or_(Concert.status != 'completed', Concert.date >= cutoff)
+    )
+    return db.session.scalars(
+        select(Order.order_id)
+        .where(Order.status.in_(ARCHIVABLE_STATUSES), Order.created_at < datetime.combine(cutoff, datetime.min.time()),
+               ~exists(still_hot))
+        .order_by(Order.order_id)
+        .limit(limit)
+    ).all()
+
+def move_orders(order_ids):
+    """Copy the orders and their items into the archive and delete them from the hot tables (no commit)"""
+    order_columns = [column.name for column in Order.__table__.columns]
+    item_columns = [column.name for column in OrderItem.__table__.columns]
+
+    db.session.execute(insert(ArchivedOrder.__table__).from_select(
+        order_columns,
+        select(*[Order.__table__.c[name] for name in order_columns]).where(Order.order_id.in_(order_ids))
+    ))
+    db.session.execute(insert(ArchivedOrderItem.__table__).from_select(
+        item_columns,
+        select(*[OrderItem.__table__.c[name] for name in item_columns]).where(OrderItem.order_id.in_(order_ids))
+    ))
+    db.session.execute(delete(OrderItem.__table__).where(OrderItem.order_id.in_(order_ids)))
+    db.session.execute(delete(Order.__table__).where(Order.order_id.in_(order_ids)))
+
+def archive_orders(batch_size=None, max_batches=None, after_days=None, sleep=None, dry_run=False):
+    """Archive settled orders of completed concerts in batches; returns the number of orders moved"""
+    config = current_app.config
+    batch_size = batch_size or config['ORDER_ARCHIVE_BATCH_SIZE']
+    max_batches = max_batches or config['ORDER_ARCHIVE_MAX_BATCHES']
+    after_days = config['ORDER_ARCHIVE_AFTER_DAYS'] if after_days is None else after_days
+    sleep = config['ORDER_ARCHIVE_SLEEP'] if sleep is None else sleep
+    cutoff = date.today() - timedelta(days=after_days)
+
+    if dry_run:
+        return len(archivable_order_ids(cutoff, batch_size * max_batches))
+
+    moved = 0
+    for _ in range(max_batches):
+        order_ids = archivable_order_ids(cutoff, batch_size)
+        if not order_ids:
+            break
+        try:
+            move_orders(order_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        moved += len(order_ids)
+        if len(order_ids) < batch_size:
+            break
+        time.sleep(sleep)  # Let replication and live traffic catch up between batches
+
+    if moved:
+        print(f"🗄️ Archived {moved} orders of completed concerts")
+    return moved
+
+# Reads across hot and archive
+
+def find_order(order_id, user_id=None, options=True, fieldset=None):
+    """The order from the hot table, else from the archive (None if in neither)"""
+    for order_model, _ in ORDER_TABLES:
+        query = order_model.query.filter_by(order_id=order_id)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        if options:
+            query = query.options(*order_model.fieldset_options(fieldset))
+        order = query.first()
+        if order is not None:
+            return order
+    return None
+
+def order_summaries(order_model, item_model, order_ids):
+    """
+    Summary dicts of these orders keyed by order_id, from one grouped join
+    over order, user, items, ticket types and concerts (one row per order
+    and concert), built straight from the result tuples.
+    """
+    rows = db.session.execute(
+        select(
+            order_model.order_id, order_model.user_id, order_model.total_amount, order_model.status,
+            order_model.payment_method, order_model.payment_submitted_at, order_model.created_at,
+            User.name, User.email, Concert.title,
+            func.count(item_model.order_item_id), func.coalesce(func.sum(item_model.quantity), 0)
+        )
+        .select_from(order_model)
+        .outerjoin(User, order_model.user_id == User.user_id)
+        .outerjoin(item_model, item_model.order_id == order_model.order_id)
+        .outerjoin(TicketType, item_model.ticket_type_id == TicketType.ticket_type_id)
+        .outerjoin(Concert, TicketType.concert_id == Concert.concert_id)
+        .where(order_model.order_id.in_(order_ids))
+        .group_by(order_model.order_id, User.user_id, Concert.concert_id)
+        .order_by(order_model.order_id, Concert.concert_id)
+    ).all()
+
+    summaries = {}
+    for (order_id, user_id, total_amount, status, payment_method, payment_submitted_at, created_at,
+         user_name, user_email, concert_title, item_count, ticket_count) in rows:
+        summary = summaries.get(order_id)
+        if summary is None:
+            summary = summaries[order_id] = {
+                'order_id': order_id,
+                'user_id': user_id,
+                'total_amount': float(total_amount),
+                'status': status,
+                'payment_method': payment_method,
+                'payment_submitted_at': payment_submitted_at.isoformat() if payment_submitted_at else None,
+                'created_at': created_at.isoformat() if created_at else None,
+                'item_count': 0,
+                'ticket_count': 0,
+                'concert_titles': [],
+                'user': {'user_id': user_id, 'name': user_name, 'email': user_email} if user_name is not None else None,
+                'archived': order_model.archived
+            }
+        summary['item_count'] += item_count
+        summary['ticket_count'] += int(ticket_count)
+        if concert_title is not None:
+            summary['concert_titles'].append(concert_title)
+    return summaries
+
+def paginate_orders(criteria, page=1, per_page=10, view='full', fieldset=None):
+    """
+    paginate_query() over both tables, newest first. criteria(order_model)
+    returns the filters to apply to each of them. view='summary' returns
+    order_summaries() instead of to_dict(fieldset) items.
+    """
+    page = max(page, 1)
+    offset = (page - 1) * per_page
+
+    branches = []
+    counts = []
+    for tier, (order_model, _) in enumerate(ORDER_TABLES):
+        filters = criteria(order_model)
+        # Each side only needs its own first offset + per_page rows, read in index order
+        branches.append(select(
+            select(order_model.order_id, order_model.created_at, literal(tier).label('tier'))
+            .where(*filters)
+            .order_by(order_model.created_at.desc(), order_model.order_id.desc())
+            .limit(offset + per_page)
+            .subquery()
+        ))
+        counts.append(select(func.count()).select_from(order_model).where(*filters).scalar_subquery())
+
+    total = db.session.scalar(select(counts[0] + counts[1]))
+    merged = union_all(*branches).subquery()
+    rows = db.session.execute(
+        select(merged).order_by(merged.c.created_at.desc(), merged.c.order_id.desc()).offset(offset).limit(per_page)
+    ).all()
+
+    loaded = {}
+    for tier, (order_model, item_model) in enumerate(ORDER_TABLES):
+        ids = [row.order_id for row in rows if row.tier == tier]
+        if not ids:
+            continue
+        if view == 'summary':
+            for order_id, summary in order_summaries(order_model, item_model, ids).items():
+                loaded[(tier, order_id)] = summary
+        elif current_app.config['ROW_SERIALIZATION']:
+            for order in ROW_CLASSES[order_model].fetch(fieldset, order_model.order_id.in_(ids)):
+                loaded[(tier, order.order_id)] = order.to_dict(fieldset)
+        else:
+            query = order_model.query.filter(order_model.order_id.in_(ids)).options(*order_model.fieldset_options(fieldset))
+            for order in query:
+                loaded[(tier, order.order_id)] = order.to_dict(fieldset)
+
+    return {
+        'items': [loaded[(row.tier, row.order_id)] for row in rows if (row.tier, row.order_id) in loaded],
+        'pagination': pagination_meta(page, per_page, total)
+    }
+
+def scalar_across(build):
+    """
+    One statement adding up an aggregate over both tables:
+    build(order_model, item_model) returns a single-value select.
+    """
+    parts = [func.coalesce(build(order_model, item_model).scalar_subquery(), 0)
+             for order_model, item_model in ORDER_TABLES]
+    return db.session.scalar(select(parts[0] + parts[1]))
+
+def paid_items(start=None, end=None):
+    """Items of paid orders from both tables as one subquery (ticket_type_id, order_item_id, quantity, subtotal)"""
+    branches = []
+    for order_model, item_model in ORDER_TABLES:
+        query = select(
+            item_model.ticket_type_id, item_model.order_item_id, item_model.quantity, item_model.subtotal
+        ).join(
+            order_model, item_model.order_id == order_model.order_id
+        ).where(order_model.status == 'paid')
+        if start is not None:
+            query = query.where(order_model.created_at >= start)
+        if end is not None:
+            query = query.where(order_model.created_at <= end)
+        branches.append(query)
+    return union_all(*branches).subquery('paid_items')
+
+def ticket_type_has_orders(ticket_type_ids):
+    """Whether any hot or archived order item references these ticket types"""
+    for _, item_model in ORDER_TABLES:
+        if item_model.query.filter(item_model.ticket_type_id.in_(ticket_type_ids)).first():
+            return True
+    return False
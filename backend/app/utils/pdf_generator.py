@@ -18,9 +18,10 @@ import qrcode
 from datetime import datetime
 import os
 
-def generate_ticket_pdf(order):
+def generate_ticket_pdf(order, tickets, holder=None):
     """
-    Generate PDF ticket for a paid order
+    Generate PDF ticket for a paid order: one ticket box per stored ticket
+    (app/models/ticket.py), for holder (default: the buyer)
     """
     try:
         print(f"Generating PDF for order {order.order_id}")
@@ -71,8 +72,8 @@ def generate_ticket_pdf(order):
         # Order Information
         order_info = [
             ['Order Number:', f"#{order.order_id}"],
-            ['Customer:', order.user.name],
-            ['Email:', order.user.email],
+            ['Customer:', (holder or order.user).name],
+            ['Email:', (holder or order.user).email],
             ['Order Date:', order.created_at.strftime('%B %d, %Y at %I:%M %p')],
             ['Total Amount:', f"Rp {order.total_amount:,.0f}"],
             ['Payment Status:', '✅ CONFIRMED']
@@ -96,15 +97,16 @@ def generate_ticket_pdf(order):
         story.append(Spacer(1, 20))
         
         # Group tickets by concert
+        prices = {item.order_item_id: item.price_per_unit for item in order.order_items}
         concerts_tickets = {}
-        for item in order.order_items:
-            concert = item.ticket_type.concert
+        for ticket in tickets:
+            concert = ticket.ticket_type.concert
             if concert.concert_id not in concerts_tickets:
                 concerts_tickets[concert.concert_id] = {
                     'concert': concert,
                     'tickets': []
                 }
-            concerts_tickets[concert.concert_id]['tickets'].append(item)
+            concerts_tickets[concert.concert_id]['tickets'].append(ticket)
         
         # Generate tickets for each concert
         for concert_id, data in concerts_tickets.items():
@@ -133,22 +135,19 @@ def generate_ticket_pdf(order):
             story.append(Spacer(1, 15))
             
             # Individual Tickets
-            for ticket_item in tickets:
-                for ticket_num in range(ticket_item.quantity):
-                    # Generate unique ticket number
-                    ticket_number = f"{order.order_id}{concert_id}{ticket_item.ticket_type_id}{ticket_num+1:02d}"
-                    
-                    # Create ticket box
-                    ticket_data = create_ticket_box(
-                        ticket_number=ticket_number,
-                        ticket_type=ticket_item.ticket_type.name,
-                        concert=concert,
-                        price=ticket_item.price_per_unit,
-                        order_id=order.order_id
-                    )
-                    
-                    story.append(ticket_data)
-                    story.append(Spacer(1, 20))
+            for ticket in tickets:
+                # Create ticket box with the ticket's stored code
+                ticket_data = create_ticket_box(
+                    ticket_number=ticket.display_code,
+                    ticket_type=ticket.ticket_type.name,
+                    concert=concert,
+                    price=prices[ticket.order_item_id],
+                    order_id=order.order_id,
+                    seat=ticket.seat
+                )
+                
+                story.append(ticket_data)
+                story.append(Spacer(1, 20))
         
         # Footer
         story.append(Spacer(1, 30))
@@ -176,7 +175,7 @@ def generate_ticket_pdf(order):
         print(traceback.format_exc())
         return None
 
-def create_ticket_box(ticket_number, ticket_type, concert, price, order_id):
+def create_ticket_box(ticket_number, ticket_type, concert, price, order_id, seat=None):
     """
     Create a styled ticket box with QR code
     """
@@ -202,6 +201,8 @@ def create_ticket_box(ticket_number, ticket_type, concert, price, order_id):
             ['VENUE:', concert.venue],
             ['PRICE:', f"Rp {price:,.0f}"],
         ]
+        if seat:
+            ticket_info.insert(2, ['SEAT:', seat])
         
         # QR Code image
         qr_image = Image(qr_buffer, width=1.5*inch, height=1.5*inch)
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Counters and checkout wait samples for one connection pool"""
+
+    def __init__(self, sample_size=2048):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self._waits.append(seconds)
+            self.wait_count += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def wait_percentiles(self, *percentiles):
+        with self._lock:
+            samples = sorted(self._waits)
+        if not samples:
+            return {f'p{p}': 0.0 for p in percentiles}
+        return {
+            f'p{p}': samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+            for p in percentiles
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait to check out a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep counters across engine.dispose() (e.g. after a worker fork)
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def configure(app):
+    """Use the instrumented pool wherever SQLAlchemy would use a QueuePool"""
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    bind_options = [
+        value for value in app.config.get('SQLALCHEMY_BINDS', {}).values()
+        if isinstance(value, dict)
+    ]
+    for engine_options in [options] + bind_options:
+        if 'pool_size' in engine_options:
+            engine_options.setdefault('poolclass', InstrumentedQueuePool)
+
+def init_app(app, db):
+    """Attach pool event listeners to every engine (primary and binds)"""
+    with app.app_context():
+        engines = dict(db.engines)
+    
+    for bind_key, engine in engines.items():
+        name = bind_key or 'default'
+        stats = getattr(engine.pool, 'stats', None) or PoolStats()
+        engine.pool.stats = stats
+        
+        event.listen(engine, 'connect', lambda *args, stats=stats: stats.incr('connects'))
+        event.listen(engine, 'checkout', lambda *args, stats=stats: stats.incr('checkouts'))
+        event.listen(engine, 'checkin', lambda *args, stats=stats: stats.incr('checkins'))
+        event.listen(engine, 'invalidate', lambda *args, stats=stats: stats.incr('invalidations'))
+        # dispose() swaps in a fresh pool (post_fork in serve.py); carry the stats over
+        event.listen(engine, 'engine_disposed', lambda engine, stats=stats: setattr(engine.pool, 'stats', stats))
+        
+        app.extensions.setdefault('pool_metrics', {})[name] = engine
+
+def pool_snapshot(app):
+    """Current pool state and checkout wait statistics per engine"""
+    snapshot = {}
+    for name, engine in app.extensions.get('pool_metrics', {}).items():
+        pool = engine.pool
+        stats = pool.stats
+        data = {
+            'pool_class': type(pool).__name__,
+            'status': pool.status(),
+            'connects': stats.connects,
+            'checkouts': stats.checkouts,
+            'checkins': stats.checkins,
+            'invalidations': stats.invalidations
+        }
+        
+        if isinstance(pool, QueuePool):
+            data.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow(),
+                'timeouts': stats.timeouts
+            })
+        else:
+            data['checked_out'] = stats.checkouts - stats.checkins
+        
+        if stats.wait_count:
+            data['checkout_wait_ms'] = {
+                'count': stats.wait_count,
+                'avg': round(stats.wait_total / stats.wait_count * 1000, 3),
+                'max': round(stats.wait_max * 1000, 3),
+                **{
+                    key: round(value * 1000, 3)
+                    for key, value in stats.wait_percentiles(50, 95, 99).items()
+                }
+            }
+        
+        snapshot[name] = data
+    return snapshot
@@ -0,0 +1,250 @@
+"""
+On-demand sampling profiler for single requests.
+
+A request is profiled when it carries "X-Profile-Token: <PROFILE_TOKEN>" or
+is picked by PROFILE_SAMPLE_RATE. While at least one profiled request is
+running, a single daemon thread wakes every PROFILE_INTERVAL_MS, reads the
+stacks of the profiled threads with sys._current_frames() and counts them.
+Unprofiled requests pay only a dict lookup. Samples are wall-clock, so
+time spent waiting on the database or locks shows up too.
+
+When the request finishes, the profile is written to PROFILE_DIR as
+speedscope JSON (open it at https://www.speedscope.app) or as collapsed
+stacks (flamegraph.pl / speedscope). The admin endpoints list the files
+and download them.
+"""
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from flask import current_app, g, request
+
+PROFILE_EXTENSIONS = {'speedscope': '.speedscope.json', 'collapsed': '.collapsed.txt'}
+
+# <timestamp>_<pid>-<seq>_<endpoint>_<method>_<duration>ms.<ext>
+PROFILE_NAME = re.compile(
+    r'^(?P<timestamp>\d{8}T\d{6})_(?P<id>\d+-\d+)_(?P<endpoint>[\w.]+)_(?P<method>[A-Z]+)_(?P<duration_ms>\d+)ms'
+    r'(?P<ext>\.speedscope\.json|\.collapsed\.txt)$'
+)
+
+
+class RequestProfile:
+    __slots__ = ('thread_id', 'endpoint', 'method', 'path', 'started', 'duration', 'samples', 'sample_count')
+
+    def __init__(self, thread_id, endpoint, method, path):
+        self.thread_id = thread_id
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.samples = Counter()  # stack tuple (outermost first) -> samples
+        self.sample_count = 0
+
+
+def frame_stack(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._targets = {}  # thread id -> RequestProfile
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self._sequence = 0
+        self.interval = 0.005
+
+    def start(self, endpoint, method, path):
+        profile = RequestProfile(threading.get_ident(), endpoint, method, path)
+        with self._lock:
+            self._targets[profile.thread_id] = profile
+            if self._thread_pid != os.getpid():
+                # Started lazily, and again in each forked worker
+                self._thread_pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return profile
+
+    def stop(self, profile):
+        with self._lock:
+            self._targets.pop(profile.thread_id, None)
+        profile.duration = time.perf_counter() - profile.started
+        return profile
+
+    def active(self):
+        return len(self._targets)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                targets = list(self._targets.values())
+                if not targets:
+                    self._wake.clear()
+                    continue
+
+            frames = sys._current_frames()
+            for profile in targets:
+                frame = frames.get(profile.thread_id)
+                if frame is not None:
+                    profile.samples[frame_stack(frame)] += 1
+                    profile.sample_count += 1
+            del frames
+            time.sleep(self.interval)
+
+    def next_id(self):
+        with self._lock:
+            self._sequence += 1
+            return f'{os.getpid()}-{self._sequence}'
+
+
+profiler = SamplingProfiler()
+
+def frame_label(frame):
+    name, filename, line = frame
+    return f'{name} ({os.path.basename(filename)}:{line})'
+
+def to_collapsed(profile):
+    lines = [
+        ';'.join(frame_label(frame) for frame in stack) + f' {count}'
+        for stack, count in profile.samples.most_common()
+    ]
+    return '\n'.join(lines) + '\n'
+
+def to_speedscope(profile, interval):
+    frames = []
+    frame_index = {}
+    samples = []
+    weights = []
+    for stack, count in profile.samples.most_common():
+        indexes = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                name, filename, line = frame
+                frames.append({'name': name, 'file': filename, 'line': line})
+            indexes.append(frame_index[frame])
+        samples.append(indexes)
+        weights.append(count * interval)
+
+    name = f'{profile.method} {profile.path} ({profile.endpoint})'
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'concert-ticketing profiler',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+def save_profile(profile, directory, output_format, interval, max_files):
+    os.makedirs(directory, exist_ok=True)
+    filename = (
+        f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}_{profiler.next_id()}_"
+        f"{profile.endpoint}_{profile.method}_{int(profile.duration * 1000)}ms{PROFILE_EXTENSIONS[output_format]}"
+    )
+    path = os.path.join(directory, filename)
+    with open(path, 'w') as handle:
+        if output_format == 'collapsed':
+            handle.write(to_collapsed(profile))
+        else:
+            json.dump(to_speedscope(profile, interval), handle)
+
+    prune_profiles(directory, max_files)
+    return filename
+
+def list_profiles(directory, limit=None):
+    """Saved profiles, newest first"""
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for filename in os.listdir(directory):
+        match = PROFILE_NAME.match(filename)
+        if not match:
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        profiles.append({
+            'name': filename,
+            'endpoint': match.group('endpoint'),
+            'method': match.group('method'),
+            'duration_ms': int(match.group('duration_ms')),
+            'format': 'collapsed' if match.group('ext') == PROFILE_EXTENSIONS['collapsed'] else 'speedscope',
+            'size': stat.st_size,
+            'created_at': stat.st_mtime,
+        })
+
+    profiles.sort(key=lambda item: item['created_at'], reverse=True)
+    return profiles[:limit] if limit else profiles
+
+def prune_profiles(directory, max_files):
+    for item in list_profiles(directory)[max_files:]:
+        try:
+            os.remove(os.path.join(directory, item['name']))
+        except OSError:
+            pass
+
+def should_profile(config):
+    token = config['PROFILE_TOKEN']
+    header = request.headers.get('X-Profile-Token')
+    if token and header and hmac.compare_digest(header, token):
+        return True
+    rate = config['PROFILE_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+def _before_request():
+    config = current_app.config
+    if profiler.active() >= config['PROFILE_MAX_CONCURRENT'] or not should_profile(config):
+        return
+    g.request_profile = profiler.start(request.endpoint or 'unmatched', request.method, request.path)
+
+def _teardown_request(exception=None):
+    profile = g.pop('request_profile', None)
+    if profile is None:
+        return
+    profiler.stop(profile)
+
+    config = current_app.config
+    output_format = request.headers.get('X-Profile-Format', config['PROFILE_FORMAT'])
+    if output_format not in PROFILE_EXTENSIONS:
+        output_format = 'speedscope'
+    try:
+        filename = save_profile(profile, config['PROFILE_DIR'], output_format, profiler.interval, config['PROFILE_MAX_FILES'])
+        print(f"🔬 Profiled {profile.method} {profile.path}: {profile.duration * 1000:.0f} ms, "
+              f"{profile.sample_count} samples -> {filename}")
+    except Exception as e:
+        print(f"⚠️ Failed to save request profile: {str(e)}")
+
+def init_app(app):
+    config = app.config
+    if not config['PROFILE_TOKEN'] and not config['PROFILE_SAMPLE_RATE']:
+        return
+
+    profiler.interval = config['PROFILE_INTERVAL_MS'] / 1000
+    app.before_request(_before_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,181 @@
+"""
+Per-request SQL statement counting and N+1 detection.
+
+Cursor events on every engine record each statement and its DB time into
+the current request (g.query_stats) and into any active count_queries()
+block. After the request:
+  - dev mode (QUERY_STATS_HEADERS) adds X-DB-Query-Count / X-DB-Query-Time-Ms,
+  - the same statement text run QUERY_STATS_N_PLUS_ONE_THRESHOLD times or
+    more is reported as a suspected N+1 (X-DB-N-Plus-One + a log line),
+  - routes decorated with @query_budget(n) are checked against their budget.
+    Outside dev mode each endpoint logs its first N+1 and its first
+    overrun only, so a hot endpoint does not print on every request.
+    With QUERY_BUDGET_STRICT the request fails with QueryBudgetExceeded,
+    so a test client run surfaces regressions as exceptions.
+
+Scripts and tests can also measure a block directly:
+
+    with count_queries() as stats:
+        client.get('/api/orders')
+    assert stats.count <= 3
+"""
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    __slots__ = ('count', 'duration', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """[(statement, times)] run at least threshold times, most frequent first"""
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+
+# (endpoint, kind) already logged by this process, outside dev mode
+_warned = set()
+_warned_lock = threading.Lock()
+
+def _warn(endpoint, kind, message, config):
+    if not (config['QUERY_STATS_HEADERS'] or config['QUERY_BUDGET_STRICT']):
+        with _warned_lock:
+            if (endpoint, kind) in _warned:
+                return
+            _warned.add((endpoint, kind))
+        message += ' (logged once per endpoint)'
+    print(message)
+
+# count_queries() collectors of the current thread
+_collectors = threading.local()
+
+# Stats of the request being served by app/asgi.py (which has no flask.g)
+request_stats = ContextVar('request_stats', default=None)
+
+def _active_collectors():
+    stack = getattr(_collectors, 'stack', None)
+    if stack is None:
+        stack = _collectors.stack = []
+    return stack
+
+@contextmanager
+def count_queries():
+    """Count the statements run by this thread inside the block"""
+    stats = QueryStats()
+    stack = _active_collectors()
+    stack.append(stats)
+    try:
+        yield stats
+    finally:
+        stack.remove(stats)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started'].pop()
+    duration = time.perf_counter() - started
+
+    if has_request_context():
+        stats = g.get('query_stats')
+        if stats is None:
+            stats = g.query_stats = QueryStats()
+        stats.record(statement, duration)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    for stats in _active_collectors():
+        stats.record(statement, duration)
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None:
+        started = context.connection.info.get('query_started')
+        if started:
+            started.pop()
+
+def query_budget(max_queries):
+    """Declare how many statements a route may run per request"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+
+        decorated_function.query_budget = max_queries
+        return decorated_function
+    return decorator
+
+def endpoint_budget(endpoint):
+    view = current_app.view_functions.get(endpoint) if endpoint else None
+    return getattr(view, 'query_budget', None)
+
+def report(stats, endpoint, budget, config):
+    """Log N+1 suspects and budget overruns of a request; returns the headers to add"""
+    headers = {}
+    if config['QUERY_STATS_HEADERS']:
+        headers['X-DB-Query-Count'] = str(stats.count)
+        headers['X-DB-Query-Time-Ms'] = f'{stats.duration * 1000:.2f}'
+
+    repeated = stats.repeated(config['QUERY_STATS_N_PLUS_ONE_THRESHOLD'])
+    if repeated:
+        statement, times = repeated[0]
+        _warn(endpoint, 'n_plus_one', f"⚠️ Suspected N+1 in {endpoint}: {times}x {' '.join(statement.split())[:200]}", config)
+        if config['QUERY_STATS_HEADERS']:
+            headers['X-DB-N-Plus-One'] = f'{times}x {" ".join(statement.split())[:120]}'
+
+    if budget is not None and stats.count > budget:
+        message = f'{endpoint} ran {stats.count} SQL statements, budget is {budget}'
+        _warn(endpoint, 'budget', f"⚠️ Query budget exceeded: {message}", config)
+        if config['QUERY_STATS_HEADERS']:
+            headers['X-DB-Query-Budget'] = f'exceeded ({stats.count}/{budget})'
+        if config['QUERY_BUDGET_STRICT']:
+            raise QueryBudgetExceeded(message)
+
+    return headers
+
+def _after_request(response):
+    stats = g.get('query_stats')
+    if stats is None:
+        return response
+
+    headers = report(stats, request.endpoint or request.path, endpoint_budget(request.endpoint), current_app.config)
+    response.headers.update(headers)
+    return response
+
+def listen(engine):
+    """Record the statements of a (sync) engine"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+def init_app(app, db):
+    if not app.config['QUERY_STATS_ENABLED']:
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    for engine in engines:
+        listen(engine)
+
+    app.after_request(_after_request)
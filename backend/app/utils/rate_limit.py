@@ -0,0 +1,214 @@
+"""
+Token-bucket rate limiting for the hot endpoints.
+
+Each policy in Config.RATE_LIMITS is "<burst>/<seconds>": a client may
+spend <burst> requests at once and gets that many back, evenly, over
+<seconds>. Clients are keyed by IP (anonymous routes such as login) or by
+JWT identity, falling back to the IP when there is no token.
+
+Storage is pluggable through RATE_LIMIT_STORAGE_URL:
+    memory://              per process, lock-striped buckets with LRU eviction
+    redis://host:6379/0    shared across nodes (needs the redis package)
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request
+from app.utils.helpers import error_response
+from app.utils.replica import current_identity
+
+
+class RateLimitPolicy:
+    __slots__ = ('name', 'capacity', 'period', 'rate')
+
+    def __init__(self, name, capacity, period):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period  # Tokens refilled per second
+
+    @classmethod
+    def parse(cls, name, spec):
+        capacity, _, period = str(spec).partition('/')
+        try:
+            capacity, period = int(capacity), float(period or 60)
+        except ValueError:
+            raise ValueError(f'Invalid rate limit for {name}: {spec!r}, expected "<burst>/<seconds>"')
+        if capacity <= 0 or period <= 0:
+            raise ValueError(f'Invalid rate limit for {name}: {spec!r}, both values must be positive')
+        return cls(name, capacity, period)
+
+
+class MemoryBackend:
+    """
+    In-process buckets. Keys are spread over independently locked stripes so
+    concurrent threads rarely contend, and each stripe is an OrderedDict kept
+    in LRU order: lookup, refill and eviction are all O(1). An evicted key
+    just starts again with a full bucket.
+    """
+
+    def __init__(self, max_keys=100000, stripes=64):
+        self._stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+        self._max_per_stripe = max(1, max_keys // stripes)
+
+    def hit(self, key, capacity, rate, cost=1):
+        """Spend cost tokens; returns (allowed, remaining, retry_after_seconds)"""
+        lock, buckets = self._stripes[hash(key) % len(self._stripes)]
+        now = time.monotonic()
+
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self._max_per_stripe:
+                    buckets.popitem(last=False)
+                bucket = buckets[key] = [float(capacity), now]
+            else:
+                buckets.move_to_end(key)
+
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return True, bucket[0], 0.0
+            bucket[0] = tokens
+            return False, tokens, (cost - tokens) / rate
+
+    def __len__(self):
+        return sum(len(buckets) for _, buckets in self._stripes)
+
+
+class RedisBackend:
+    """Buckets in Redis, refilled atomically by a Lua script on the server clock"""
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = capacity
+if state[1] then
+    tokens = math.min(capacity, tonumber(state[1]) + (now - tonumber(state[2])) * rate)
+end
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+    def __init__(self, url, prefix='ratelimit:'):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._script = self._client.register_script(self.SCRIPT)
+        self._prefix = prefix
+
+    def hit(self, key, capacity, rate, cost=1):
+        allowed, tokens, retry_after = self._script(keys=[self._prefix + key], args=[capacity, rate, cost])
+        return bool(allowed), float(tokens), float(retry_after)
+
+
+def create_backend(url, max_keys=100000):
+    if url.startswith('memory://'):
+        return MemoryBackend(max_keys=max_keys)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f'Unsupported RATE_LIMIT_STORAGE_URL: {url}')
+
+
+class RateLimiter:
+    def __init__(self):
+        self.backend = None
+        self.policies = {}
+        self.enabled = False
+        self.trust_proxy = False
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config['RATE_LIMIT_ENABLED']
+        self.trust_proxy = config['RATE_LIMIT_TRUST_PROXY']
+        self.policies = {
+            name: RateLimitPolicy.parse(name, spec)
+            for name, spec in config['RATE_LIMITS'].items()
+        }
+        self.backend = create_backend(config['RATE_LIMIT_STORAGE_URL'], config['RATE_LIMIT_MAX_KEYS'])
+        app.after_request(self._add_headers)
+        app.extensions['rate_limiter'] = self
+
+        if self.enabled:
+            print(f"🚦 Rate limiting enabled ({config['RATE_LIMIT_STORAGE_URL']}, policies: {', '.join(self.policies)})")
+
+    def client_ip(self):
+        if self.trust_proxy and request.access_route:
+            return request.access_route[0]
+        return request.remote_addr or 'unknown'
+
+    def client_key(self, key):
+        if key == 'user':
+            identity = current_identity()
+            if identity is not None:
+                return f'user:{identity}'
+        return f'ip:{self.client_ip()}'
+
+    def check(self, policy_name, key, client_key=None):
+        """Spend one token; returns (policy, allowed, remaining, retry_after)"""
+        policy = self.policies[policy_name]
+        try:
+            allowed, remaining, retry_after = self.backend.hit(
+                f'{policy.name}:{client_key or self.client_key(key)}', policy.capacity, policy.rate
+            )
+        except Exception as e:
+            # A broken shared backend must not take the endpoints down with it
+            print(f"⚠️ Rate limit backend error, allowing request: {str(e)}")
+            return policy, True, policy.capacity, 0.0
+        return policy, allowed, remaining, retry_after
+
+    def enforce(self, policy_name, key, client_key=None):
+        """
+        Spend one token for a request; returns (headers, refusal), refusal
+        being the 429 message or None. Used by @rate_limit and app/asgi.py.
+        """
+        policy, allowed, remaining, retry_after = self.check(policy_name, key, client_key)
+        headers = {'X-RateLimit-Limit': str(policy.capacity), 'X-RateLimit-Remaining': str(int(remaining))}
+        if allowed:
+            return headers, None
+        seconds = max(1, int(retry_after + 0.999))
+        headers['Retry-After'] = str(seconds)
+        return headers, f'Too many requests. Try again in {seconds} seconds'
+
+    @staticmethod
+    def _add_headers(response):
+        headers = g.get('rate_limit')
+        if headers is not None:
+            response.headers.update(headers)
+        return response
+
+
+rate_limiter = RateLimiter()
+
+def rate_limit(policy_name, key='user'):
+    """Apply a Config.RATE_LIMITS policy to a route, keyed by 'user' (JWT, else IP) or 'ip'"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not rate_limiter.enabled:
+                return f(*args, **kwargs)
+
+            g.rate_limit, refusal = rate_limiter.enforce(policy_name, key)
+            if refusal is not None:
+                return error_response(refusal, 429)
+
+            return f(*args, **kwargs)
+
+        # Read by app/asgi.py, which applies the same policy to the routes it serves
+        decorated_function.rate_limit = (policy_name, key)
+        return decorated_function
+    return decorator
@@ -0,0 +1,92 @@
+"""
+Read-replica routing for GET handlers marked @replica_read.
+
+After a request commits a write, its response carries a signed, timestamped
+marker: an X-Last-Write header (echoed back by the frontend's API client)
+and a cookie of the same name. Any worker, on any node, can verify it with
+SECRET_KEY, and while it is younger than REPLICA_STALENESS_WINDOW the
+client's reads stay on the primary, so they see their own writes however
+far the replicas lag.
+"""
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from itsdangerous import URLSafeTimedSerializer, BadData
+from sqlalchemy import event
+from app.db_routing import RoutingSession, choose_replica
+
+LAST_WRITE_HEADER = 'X-Last-Write'
+LAST_WRITE_COOKIE = 'last_write'
+
+def _serializer(config):
+    return URLSafeTimedSerializer(config['SECRET_KEY'], salt='replica-last-write')
+
+def marker_is_fresh(token, config):
+    """True while a last-write marker is within REPLICA_STALENESS_WINDOW"""
+    if not token:
+        return False
+    try:
+        _serializer(config).loads(token, max_age=config['REPLICA_STALENESS_WINDOW'])
+        return True
+    except BadData:
+        return False
+
+def wrote_recently():
+    token = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    return marker_is_fresh(token, current_app.config)
+
+def current_identity():
+    """JWT identity of the current request, or None for anonymous requests"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+def replica_read(f):
+    """Route the reads of a GET handler to a replica unless the caller wrote recently"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        replica_keys = current_app.config.get('REPLICA_BIND_KEYS')
+        if replica_keys and not wrote_recently():
+            g.db_replica_key = choose_replica(replica_keys)
+        return f(*args, **kwargs)
+    
+    # Read by app/asgi.py, which routes the reads it serves the same way
+    decorated_function.replica_read = True
+    return decorated_function
+
+def _after_flush(session, flush_context):
+    session.info['wrote'] = True
+
+def _after_commit(session):
+    if not session.info.pop('wrote', False) or not has_request_context():
+        return
+    
+    # Read-after-write within this request stays on the primary too
+    g.db_replica_key = None
+    g.db_wrote = True
+
+def _mark_last_write(response):
+    """Hand the client a fresh last-write marker after a committed write"""
+    if g.pop('db_wrote', False):
+        token = _serializer(current_app.config).dumps(current_identity() or '')
+        window = current_app.config['REPLICA_STALENESS_WINDOW']
+        response.headers[LAST_WRITE_HEADER] = token
+        response.set_cookie(LAST_WRITE_COOKIE, token, max_age=max(1, int(window + 0.999)), httponly=True, samesite='Lax')
+    return response
+
+def _after_rollback(session):
+    session.info.pop('wrote', None)
+
+def init_app(app):
+    if not app.config.get('REPLICA_BIND_KEYS'):
+        return
+    
+    if not event.contains(RoutingSession, 'after_flush', _after_flush):
+        event.listen(RoutingSession, 'after_flush', _after_flush)
+        event.listen(RoutingSession, 'after_commit', _after_commit)
+        event.listen(RoutingSession, 'after_soft_rollback', lambda session, previous: _after_rollback(session))
+    app.after_request(_mark_last_write)
+    
+    print(f"📚 Read replicas enabled: {', '.join(app.config['REPLICA_BIND_KEYS'])}")
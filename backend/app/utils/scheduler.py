@@ -0,0 +1,183 @@
+"""
+In-process scheduler for periodic background jobs.
+
+Each process runs one daemon thread per job (started on its first
+request, so they also start in every forked gunicorn worker), so a long
+order_archive run does not delay seat_hold_sweep or waitlist. Before
+running its job a thread takes the job's lease in the scheduler_leases table: a single
+conditional UPDATE that succeeds only when the lease is free, expired or
+already ours. So however many workers and nodes are up, one process
+runs each job. A lease lasts one job interval plus SCHEDULER_LEASE_GRACE
+and is renewed while the job runs, so a leader that dies is replaced
+within about one interval. A process that exits cleanly (gunicorn
+recycling a worker, see serve.py) releases its leases on the way out.
+Lease times are UTC from the node clocks, which only need to agree to
+within a fraction of the grace period.
+"""
+import atexit
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.scheduler_lease import SchedulerLease
+
+
+class Job:
+    __slots__ = ('name', 'interval', 'func')
+
+    def __init__(self, name, interval, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+
+
+def acquire_lease(name, holder, ttl):
+    """Take or renew the lease of a job; True when holder is the leader until now + ttl"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl)
+    result = db.session.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+        .values(holder=holder, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        db.session.commit()
+        return True
+
+    # No row yet: the first process to insert it wins
+    try:
+        db.session.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+def release_leases(holder):
+    """Let other processes take every lease of holder right away; returns how many were released"""
+    result = db.session.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.holder == holder)
+        .values(expires_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+class Scheduler:
+    def __init__(self):
+        self.app = None
+        self.jobs = {}
+        self.enabled = False
+        self.lease_grace = 30.0
+        self._threads = []
+        self._thread_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def holder(self):
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config['SCHEDULER_ENABLED']
+        self.lease_grace = app.config['SCHEDULER_LEASE_GRACE']
+        app.extensions['scheduler'] = self
+        if self.enabled:
+            app.before_request(self._ensure_started)
+
+    def add_job(self, name, interval, func):
+        """Run func() every interval seconds inside an app context, on the leader only; add jobs before start()"""
+        self.jobs[name] = Job(name, interval, func)
+
+    def _ensure_started(self):
+        if self._thread_pid != os.getpid():
+            self.start()
+
+    def start(self):
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, args=(job,), name=f'scheduler-{job.name}', daemon=True)
+                for job in self.jobs.values()
+            ]
+            for thread in self._threads:
+                thread.start()
+            atexit.register(self.release)
+
+    def release(self):
+        """Release this process's leases (atexit, and gunicorn's worker_exit hook)"""
+        if self._thread_pid != os.getpid():
+            return
+        with self.app.app_context():
+            try:
+                released = release_leases(self.holder)
+                if released:
+                    print(f"🔓 Released {released} scheduler lease(s) of {self.holder}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"⚠️ Failed to release scheduler leases: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def _run(self, job):
+        while True:
+            self.run_job(job)
+            time.sleep(max(1.0, job.interval))
+
+    def lease_ttl(self, job):
+        return job.interval + self.lease_grace
+
+    @contextmanager
+    def _renewing(self, job):
+        """Keep renewing the lease of job from another thread while the block runs"""
+        stopped = threading.Event()
+
+        def renew():
+            while not stopped.wait(self.lease_ttl(job) / 3):
+                with self.app.app_context():
+                    try:
+                        acquire_lease(job.name, self.holder, self.lease_ttl(job))
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"⚠️ Failed to renew the {job.name} lease: {str(e)}")
+                    finally:
+                        db.session.remove()
+
+        thread = threading.Thread(target=renew, name=f'scheduler-lease-{job.name}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def run_job(self, job):
+        """Run one job if this process holds its lease; returns whether it ran"""
+        with self.app.app_context():
+            try:
+                if not acquire_lease(job.name, self.holder, self.lease_ttl(job)):
+                    return False
+                with self._renewing(job):
+                    job.func()
+                # The next run is one interval from now; hold the lease until then
+                acquire_lease(job.name, self.holder, self.lease_ttl(job))
+                return True
+            except Exception as e:
+                db.session.rollback()
+                print(f"⚠️ Scheduled job {job.name} failed: {str(e)}")
+                return False
+            finally:
+                db.session.remove()
+
+
+scheduler = Scheduler()
@@ -0,0 +1,465 @@
+"""
+Assigned seating.
+
+A seat map (app/models/seat_map.py) numbers the seats of each section
+0 .. seat_count - 1, front row first. Per concert, each section has one
+seat_inventory row whose `taken` column is a bitmap of those seats (bit i
+set = seat i held or sold): 10 bytes for a 80-seat section, 1.25 KB for a
+10,000-seat one. Availability of a whole 80,000-seat stadium is ~10 KB.
+
+Best available: per row, shift the row's bits out of the section bitmap
+and AND the free mask with itself shifted by 1, 2, 4, ... seats, which
+leaves a bit set at every start of quantity free seats in a row, in
+O(log quantity) big-int operations; the start nearest the row centre wins.
+
+Holds: hold_seats() locks the section's inventory row (SELECT ... FOR
+UPDATE), searches it, and writes the new bitmap back with a version guard
+in the same transaction, so two buyers can never get the same seat. A
+conflict or lock timeout rolls back and retries the search a few times.
+With SEAT_HOLD_SKIP_LOCKED (FOR UPDATE SKIP LOCKED: MySQL 8+, MariaDB
+10.6+, PostgreSQL) concurrent buyers spread over the next best sections
+instead of queueing on the best one's row lock.
+A hold lives SEAT_HOLD_TTL seconds unless create_order links it to an
+order item (claim_hold); release_expired_holds() clears the rest. Holds
+cost nothing, so only upcoming concerts can be held, and each user may
+have at most SEAT_HOLD_USER_MAX_HOLDS holds and SEAT_HOLD_USER_MAX_SEATS
+seats outstanding per concert.
+
+TicketType.quantity_available keeps counting sold tickets as before (a
+seated tier's quantity_total is the number of seats assigned to it), the
+bitmaps only add which seats.
+"""
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, insert, update, delete, exists, func
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models.concert import Concert
+from app.models.ticket_type import TicketType
+from app.models.seat_map import SeatMap, SeatSection, SeatRow
+from app.models.seat_inventory import SeatInventory, SeatHold
+from app.utils.inventory import resize_tier
+
+MAX_SECTION_SEATS = 10000
+MAX_ROW_SEATS = 500
+
+
+class SeatingError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class SeatConflict(Exception):
+    """The inventory row changed between read and write; the caller retries"""
+
+
+# Bitmaps
+
+def bitmap_int(taken):
+    return int.from_bytes(taken, 'little')
+
+def int_bitmap(value, seat_count):
+    return value.to_bytes((seat_count + 7) // 8, 'little')
+
+def block_starts(free, quantity):
+    """Bit s set where bits s .. s + quantity - 1 of free are all set"""
+    starts, span = free, 1
+    while span < quantity and starts:
+        step = min(span, quantity - span)
+        starts &= starts >> step
+        span += step
+    return starts
+
+def nearest_bit(bits, target):
+    """Index of the set bit closest to target (ties go to the lower one), or None"""
+    above = bits >> target
+    below = bits & ((1 << target) - 1)
+    high = target + (above & -above).bit_length() - 1 if above else None
+    low = below.bit_length() - 1 if below else None
+    if high is None or (low is not None and target - low <= high - target):
+        return low
+    return high
+
+def best_block(taken, rows, quantity):
+    """(row, first seat index in the row) of the best quantity contiguous free seats, or None"""
+    for row in rows:
+        _, _, offset, count = row
+        if count < quantity:
+            continue
+        free = ~(taken >> offset) & ((1 << count) - 1)
+        starts = block_starts(free, quantity)
+        if starts:
+            return row, nearest_bit(starts, (count - quantity) // 2)
+    return None
+
+
+# Seat maps
+
+# Row layouts by (seat_map_id, section_id). A seat map is never edited in place: a changed
+# layout is a new map with new ids, so entries cannot go stale in any worker
+_section_rows = {}
+
+def section_rows(seat_map_id, section_id):
+    """(row_id, label, seat_offset, seat_count) of a section, front first; cached"""
+    rows = _section_rows.get((seat_map_id, section_id))
+    if rows is None:
+        rows = [tuple(row) for row in db.session.execute(
+            select(SeatRow.row_id, SeatRow.label, SeatRow.seat_offset, SeatRow.seat_count)
+            .where(SeatRow.section_id == section_id)
+            .order_by(SeatRow.position)
+        )]
+        _section_rows[(seat_map_id, section_id)] = rows
+    return rows
+
+def invalidate_section_rows(seat_map_id=None):
+    """Forget cached row layouts (of one seat map)"""
+    for key in [key for key in _section_rows if seat_map_id is None or key[0] == seat_map_id]:
+        _section_rows.pop(key, None)
+
+def row_label(index):
+    """A, B, ..., Z, AA, AB, ..."""
+    label = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+def _positive_int(value, name):
+    try:
+        value = int(value)
+    except (ValueError, TypeError):
+        raise SeatingError(f'{name} must be a number')
+    if value <= 0:
+        raise SeatingError(f'{name} must be greater than 0')
+    return value
+
+def _parse_rows(section, prefix):
+    if 'rows' in section:
+        rows = section['rows']
+        if not isinstance(rows, list) or not rows:
+            raise SeatingError(f'{prefix}.rows must be a non-empty list')
+        parsed = []
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                raise SeatingError(f'{prefix}.rows[{index}] must be an object')
+            label = str(row.get('label') or row_label(index)).strip()[:10]
+            parsed.append((label, _positive_int(row.get('seats'), f'{prefix}.rows[{index}].seats')))
+    else:
+        row_count = _positive_int(section.get('row_count'), f'{prefix}.row_count')
+        seats = _positive_int(section.get('seats_per_row'), f'{prefix}.seats_per_row')
+        parsed = [(row_label(index), seats) for index in range(row_count)]
+
+    if any(seats > MAX_ROW_SEATS for _, seats in parsed):
+        raise SeatingError(f'{prefix}: rows hold at most {MAX_ROW_SEATS} seats')
+    if sum(seats for _, seats in parsed) > MAX_SECTION_SEATS:
+        raise SeatingError(f'{prefix}: sections hold at most {MAX_SECTION_SEATS} seats, split it up')
+    return parsed
+
+def create_seat_map(data):
+    """
+    Seat map from {"name", "venue", "sections": [{"name", "rows": [{"label", "seats"}]}
+    or {"name", "row_count", "seats_per_row"}]}; sections are ranked in list order (no commit)
+    """
+    name = (data.get('name') or '').strip()
+    venue = (data.get('venue') or '').strip()
+    sections = data.get('sections')
+    if not name or not venue:
+        raise SeatingError('name and venue are required')
+    if not isinstance(sections, list) or not sections:
+        raise SeatingError('sections must be a non-empty list')
+
+    parsed = []
+    for index, section in enumerate(sections):
+        if not isinstance(section, dict) or not (section.get('name') or '').strip():
+            raise SeatingError(f'sections[{index}].name is required')
+        parsed.append((section['name'].strip()[:50], _parse_rows(section, f'sections[{index}]')))
+
+    seat_map = SeatMap(name=name[:100], venue=venue[:255],
+                       seat_count=sum(seats for _, rows in parsed for _, seats in rows))
+    db.session.add(seat_map)
+    db.session.flush()
+
+    for rank, (section_name, rows) in enumerate(parsed):
+        section = SeatSection(seat_map_id=seat_map.seat_map_id, name=section_name, rank=rank,
+                              seat_count=sum(seats for _, seats in rows))
+        db.session.add(section)
+        db.session.flush()
+
+        values, offset = [], 0
+        for position, (label, seats) in enumerate(rows):
+            values.append({'section_id': section.section_id, 'label': label, 'position': position,
+                           'seat_offset': offset, 'seat_count': seats})
+            offset += seats
+        db.session.execute(insert(SeatRow), values)
+
+    invalidate_section_rows(seat_map.seat_map_id)
+    return seat_map
+
+
+# Concerts
+
+def is_seated(ticket_type_id):
+    return db.session.scalar(select(exists().where(SeatInventory.ticket_type_id == ticket_type_id)))
+
+def seated_ticket_type_ids(ticket_type_ids):
+    if not ticket_type_ids:
+        return set()
+    return set(db.session.scalars(
+        select(SeatInventory.ticket_type_id).where(SeatInventory.ticket_type_id.in_(ticket_type_ids)).distinct()
+    ))
+
+def assign_seat_map(concert_id, seat_map_id, assignments):
+    """
+    Sell sections of a seat map for a concert: assignments is [{"section_id", "ticket_type_id"}].
+    Each ticket type must be unsold; its quantity_total becomes the seats of its sections (no commit)
+    """
+    if not db.session.get(SeatMap, seat_map_id):
+        raise SeatingError('Seat map not found', 404)
+    if db.session.scalar(select(exists().where(SeatInventory.concert_id == concert_id))):
+        raise SeatingError('Concert already has assigned seating', 409)
+    if not isinstance(assignments, list) or not assignments:
+        raise SeatingError('sections must be a non-empty list')
+
+    sections = {section.section_id: section for section in SeatSection.query.filter_by(seat_map_id=seat_map_id)}
+    tiers = {tier.ticket_type_id: tier for tier in TicketType.query.filter_by(concert_id=concert_id)}
+    seats_per_tier = defaultdict(int)
+    rows = []
+    for index, assignment in enumerate(assignments):
+        if not isinstance(assignment, dict):
+            raise SeatingError(f'sections[{index}] must be an object')
+        section = sections.get(assignment.get('section_id'))
+        tier = tiers.get(assignment.get('ticket_type_id'))
+        if section is None:
+            raise SeatingError(f'sections[{index}]: section not found in this seat map', 404)
+        if tier is None:
+            raise SeatingError(f'sections[{index}]: ticket type not found for this concert', 404)
+        if any(row['section_id'] == section.section_id for row in rows):
+            raise SeatingError(f'sections[{index}]: section {section.section_id} is assigned twice')
+        seats_per_tier[tier.ticket_type_id] += section.seat_count
+        rows.append({'concert_id': concert_id, 'section_id': section.section_id,
+                     'ticket_type_id': tier.ticket_type_id, 'taken': int_bitmap(0, section.seat_count),
+                     'seats_available': section.seat_count, 'version': 0})
+
+    for ticket_type_id, seats in seats_per_tier.items():
+        tier = tiers[ticket_type_id]
+        if tier.quantity_available != tier.quantity_total:
+            raise SeatingError(f'{tier.name} already has tickets sold; seats can only be assigned to unsold tiers', 409)
+        db.session.flush()
+        if not resize_tier(ticket_type_id, seats, concert_id):
+            raise SeatingError(f'{tier.name} already has tickets sold', 409)
+
+    db.session.execute(insert(SeatInventory), rows)
+    invalidate_section_rows(seat_map_id)
+
+def clear_concert_seating(concert_id):
+    """Drop a concert's seat inventory and holds, before deleting the concert (no commit)"""
+    db.session.execute(delete(SeatHold).where(SeatHold.concert_id == concert_id))
+    db.session.execute(delete(SeatInventory).where(SeatInventory.concert_id == concert_id))
+
+
+# Holds
+
+def _locked_inventory(concert_id, section_id, skip_locked=False):
+    """(taken, version) of a section, row-locked until commit; None if skip_locked and another buyer has it"""
+    return db.session.execute(
+        select(SeatInventory.taken, SeatInventory.version)
+        .where(SeatInventory.concert_id == concert_id, SeatInventory.section_id == section_id)
+        .with_for_update(skip_locked=skip_locked)
+    ).first()
+
+def _write_inventory(concert_id, section_id, version, taken, seats_delta):
+    result = db.session.execute(
+        update(SeatInventory)
+        .where(SeatInventory.concert_id == concert_id, SeatInventory.section_id == section_id,
+               SeatInventory.version == version)
+        .values(taken=taken, seats_available=SeatInventory.seats_available + seats_delta, version=version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise SeatConflict()
+
+def _try_hold(concert_id, ticket_type_id, quantity, user_id, section_id):
+    conditions = [SeatInventory.concert_id == concert_id, SeatInventory.ticket_type_id == ticket_type_id,
+                  SeatInventory.seats_available >= quantity]
+    if section_id is not None:
+        conditions.append(SeatInventory.section_id == section_id)
+    # Same order for every buyer, so row locks are always taken in the same order
+    candidates = db.session.execute(
+        select(SeatInventory.section_id, SeatSection.seat_map_id)
+        .join(SeatSection, SeatInventory.section_id == SeatSection.section_id)
+        .where(*conditions)
+        .order_by(SeatSection.rank, SeatInventory.section_id)
+    ).all()
+
+    skip_locked = current_app.config['SEAT_HOLD_SKIP_LOCKED']
+    skipped = False
+    for candidate, seat_map_id in candidates:
+        locked = _locked_inventory(concert_id, candidate, skip_locked)
+        if locked is None:
+            # Another buyer is in this section: look further back instead of queueing behind them
+            skipped = True
+            continue
+        taken, version = locked
+        bits = bitmap_int(taken)
+        found = best_block(bits, section_rows(seat_map_id, candidate), quantity)
+        if found is None:
+            continue
+
+        (row_id, _, offset, _), start = found
+        first_seat = offset + start
+        bits |= ((1 << quantity) - 1) << first_seat
+        _write_inventory(concert_id, candidate, version, bits.to_bytes(len(taken), 'little'), -quantity)
+
+        hold = SeatHold(
+            concert_id=concert_id, section_id=candidate, row_id=row_id, first_seat=first_seat,
+            quantity=quantity, ticket_type_id=ticket_type_id, user_id=user_id, status='held',
+            expires_at=datetime.utcnow() + timedelta(seconds=current_app.config['SEAT_HOLD_TTL'])
+        )
+        db.session.add(hold)
+        db.session.flush()
+        return hold
+    if skipped:
+        raise SeatConflict()
+    return None
+
+def _check_hold_limits(concert_id, user_id, quantity):
+    """Refuse holds for concerts not on sale and beyond the user's outstanding holds / seats"""
+    config = current_app.config
+    status = db.session.scalar(select(Concert.status).where(Concert.concert_id == concert_id))
+    if status is None:
+        raise SeatingError('Concert not found', 404)
+    if status != 'upcoming':
+        raise SeatingError('Seats can only be held for upcoming concerts', 409)
+
+    holds, seats = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(SeatHold.quantity), 0))
+        .where(SeatHold.user_id == user_id, SeatHold.concert_id == concert_id,
+               SeatHold.status == 'held', SeatHold.expires_at > datetime.utcnow())
+    ).one()
+    if holds >= config['SEAT_HOLD_USER_MAX_HOLDS']:
+        raise SeatingError(
+            f"At most {config['SEAT_HOLD_USER_MAX_HOLDS']} open holds per concert; order or release one first", 429
+        )
+    if seats + quantity > config['SEAT_HOLD_USER_MAX_SEATS']:
+        raise SeatingError(
+            f"At most {config['SEAT_HOLD_USER_MAX_SEATS']} seats held per concert; {seats} already held", 429
+        )
+
+def hold_seats(concert_id, ticket_type_id, quantity, user_id, section_id=None):
+    """Hold the best quantity contiguous seats (commits); None when no row has that many together"""
+    config = current_app.config
+    if quantity > config['SEAT_HOLD_MAX_SEATS']:
+        raise SeatingError(f"At most {config['SEAT_HOLD_MAX_SEATS']} seats per hold")
+    _check_hold_limits(concert_id, user_id, quantity)
+
+    retries = config['SEAT_HOLD_RETRIES']
+    for attempt in range(retries + 1):
+        try:
+            hold = _try_hold(concert_id, ticket_type_id, quantity, user_id, section_id)
+            db.session.commit()
+            return hold
+        except (SeatConflict, OperationalError):
+            # Lost a race or a lock wait timed out: start over from a fresh snapshot
+            db.session.rollback()
+            if attempt < retries:
+                time.sleep(random.uniform(0, 0.002 * (attempt + 1)))
+    raise SeatingError('Seats are in high demand, please try again', 409)
+
+def claim_hold(hold_id, user_id, ticket_type_id, quantity, order_item_id):
+    """Link an unexpired hold of this user to an order item; False if it is not claimable (no commit)"""
+    result = db.session.execute(
+        update(SeatHold)
+        .where(
+            SeatHold.hold_id == hold_id, SeatHold.user_id == user_id,
+            SeatHold.ticket_type_id == ticket_type_id, SeatHold.quantity == quantity,
+            SeatHold.status == 'held', SeatHold.expires_at > datetime.utcnow()
+        )
+        .values(status='ordered', order_item_id=order_item_id, expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def _clear_seats(concert_id, section_id, holds):
+    """Clear the bits of released holds [(first_seat, quantity)] in one section"""
+    taken, version = _locked_inventory(concert_id, section_id)
+    bits = bitmap_int(taken)
+    for first_seat, quantity in holds:
+        bits &= ~(((1 << quantity) - 1) << first_seat)
+    _write_inventory(concert_id, section_id, version, bits.to_bytes(len(taken), 'little'),
+                     sum(quantity for _, quantity in holds))
+
+def _release(holds, from_status, *conditions):
+    """Flip holds [(hold_id, concert_id, section_id, first_seat, quantity)] to released and clear their seats"""
+    sections = defaultdict(list)
+    for hold_id, concert_id, section_id, first_seat, quantity in holds:
+        # Only the transaction that flips the status clears the seats
+        result = db.session.execute(
+            update(SeatHold)
+            .where(SeatHold.hold_id == hold_id, SeatHold.status == from_status, *conditions)
+            .values(status='released', expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            sections[(concert_id, section_id)].append((first_seat, quantity))
+
+    for (concert_id, section_id), section_holds in sorted(sections.items()):
+        try:
+            _clear_seats(concert_id, section_id, section_holds)
+        except SeatConflict:
+            raise SeatingError('Seats are being updated, please try again', 409)
+    return sum(len(section_holds) for section_holds in sections.values())
+
+def _hold_columns():
+    return select(SeatHold.hold_id, SeatHold.concert_id, SeatHold.section_id, SeatHold.first_seat, SeatHold.quantity)
+
+def release_order_seats(order_item_ids):
+    """Give back the seats of cancelled order items; returns the number of holds released (no commit)"""
+    if not order_item_ids:
+        return 0
+    holds = db.session.execute(
+        _hold_columns().where(SeatHold.order_item_id.in_(order_item_ids), SeatHold.status == 'ordered')
+    ).all()
+    return _release(holds, 'ordered')
+
+def release_hold(hold_id, user_id):
+    """Give back a hold the user no longer wants (commits); False if it is not held"""
+    holds = db.session.execute(
+        _hold_columns().where(SeatHold.hold_id == hold_id, SeatHold.user_id == user_id, SeatHold.status == 'held')
+    ).all()
+    released = _release(holds, 'held')
+    db.session.commit()
+    return released == 1
+
+def release_expired_holds(limit=5000):
+    """Clear holds that were not ordered within SEAT_HOLD_TTL; one transaction per section"""
+    now = datetime.utcnow()
+    holds = db.session.execute(
+        _hold_columns()
+        .where(SeatHold.status == 'held', SeatHold.expires_at <= now)
+        .order_by(SeatHold.concert_id, SeatHold.section_id)
+        .limit(limit)
+    ).all()
+    db.session.commit()
+
+    sections = defaultdict(list)
+    for hold in holds:
+        sections[(hold.concert_id, hold.section_id)].append(hold)
+
+    released = 0
+    for section_holds in sections.values():
+        try:
+            released += _release(section_holds, 'held', SeatHold.expires_at <= now)
+            db.session.commit()
+        except (SeatingError, OperationalError):
+            # Busy section; its holds are picked up again next run
+            db.session.rollback()
+
+    if released:
+        print(f"💺 Released {released} expired seat holds")
+    return released
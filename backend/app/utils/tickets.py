@@ -0,0 +1,137 @@
+"""
+Per-seat ticket records.
+
+issue_tickets() creates one `tickets` row per admitted person when an
+order is paid, all of them in a single multi-row INSERT. Each row gets a
+10-character Crockford base32 code (50 random bits from `secrets`). The
+code is short enough to type at the door, cannot be guessed from the
+order, and is unambiguous when read out: there is no I, L, O or U, and
+normalize_code() maps those look-alikes back. The unique index on `code`
+makes every lookup (check-in, transfer, reprint) one index probe. A code
+collision only retries the INSERT inside a savepoint.
+
+Orders paid before the tickets table existed get their tickets the first
+time they are downloaded (tickets_for_order()).
+"""
+import secrets
+from datetime import datetime
+from sqlalchemy import select, insert, update, exists
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.ticket import Ticket
+from app.models.seat_map import SeatSection, SeatRow
+from app.models.seat_inventory import SeatHold
+
+CODE_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+CODE_LENGTH = 10
+CODE_RETRIES = 5
+
+_LOOKALIKES = str.maketrans('ILO', '110')
+
+
+def generate_code():
+    value = secrets.randbits(5 * CODE_LENGTH)
+    return ''.join(CODE_ALPHABET[(value >> (5 * index)) & 31] for index in range(CODE_LENGTH))
+
+def normalize_code(code):
+    """Stored form of a typed or scanned code (case, dashes and spaces ignored); None if it cannot be one"""
+    code = ''.join(str(code).split()).replace('-', '').upper().translate(_LOOKALIKES)
+    if len(code) != CODE_LENGTH or any(char not in CODE_ALPHABET for char in code):
+        return None
+    return code
+
+def find_ticket(code):
+    code = normalize_code(code)
+    if code is None:
+        return None
+    return Ticket.query.filter_by(code=code).first()
+
+def seat_labels(order_item_ids):
+    """{order_item_id: [seat of each unit]} for items bought with a seat hold"""
+    holds = db.session.execute(
+        select(SeatHold.order_item_id, SeatHold.first_seat, SeatHold.quantity,
+               SeatSection.name, SeatRow.label, SeatRow.seat_offset)
+        .join(SeatSection, SeatHold.section_id == SeatSection.section_id)
+        .join(SeatRow, SeatHold.row_id == SeatRow.row_id)
+        .where(SeatHold.order_item_id.in_(order_item_ids), SeatHold.status == 'ordered')
+    ).all()
+    labels = {}
+    for order_item_id, first_seat, quantity, section, row, seat_offset in holds:
+        first = first_seat - seat_offset + 1
+        labels[order_item_id] = [f'{section}, row {row}, seat {number}' for number in range(first, first + quantity)]
+    return labels
+
+def _has_tickets(order_id):
+    return db.session.scalar(select(exists().where(Ticket.order_id == order_id)))
+
+def issue_tickets(order):
+    """Ticket rows for every unit of a paid order in one INSERT (no commit); returns the number issued"""
+    items = [(item.order_item_id, item.ticket_type_id, item.quantity) for item in order.order_items]
+    if not items or _has_tickets(order.order_id):
+        return 0
+
+    seats = seat_labels([order_item_id for order_item_id, _, _ in items])
+    now = datetime.utcnow()
+    rows = []
+    for order_item_id, ticket_type_id, quantity in items:
+        item_seats = seats.get(order_item_id, [])
+        for seq in range(1, quantity + 1):
+            rows.append({
+                'order_id': order.order_id, 'order_item_id': order_item_id, 'seq': seq,
+                'ticket_type_id': ticket_type_id, 'user_id': order.user_id,
+                'seat': item_seats[seq - 1] if seq <= len(item_seats) else None,
+                'status': 'valid', 'created_at': now
+            })
+
+    for _ in range(CODE_RETRIES):
+        for row in rows:
+            row['code'] = generate_code()
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Ticket).values(rows))
+            return len(rows)
+        except IntegrityError:
+            # A code collision, or another request issued this order's tickets first
+            if _has_tickets(order.order_id):
+                return 0
+    raise RuntimeError(f'Could not generate unique ticket codes for order {order.order_id}')
+
+def tickets_for_order(order, holder_id=None):
+    """The order's tickets in issue order, issuing them first for orders paid before tickets were stored"""
+    query = Ticket.query.filter_by(order_id=order.order_id)
+    tickets = query.order_by(Ticket.ticket_id).all()
+    if not tickets and order.status == 'paid':
+        issue_tickets(order)
+        db.session.commit()
+        tickets = query.order_by(Ticket.ticket_id).all()
+    if holder_id is not None:
+        tickets = [ticket for ticket in tickets if ticket.user_id == holder_id]
+    return tickets
+
+def check_in(ticket):
+    """Admit a ticket once (no commit); False if it was already used"""
+    result = db.session.execute(
+        update(Ticket)
+        .where(Ticket.ticket_id == ticket.ticket_id, Ticket.status == 'valid')
+        .values(status='checked_in', checked_in_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def transfer_ticket(ticket, from_user_id, to_user_id):
+    """Give an unused ticket to another user under a new code, so the old print stops working (no commit)"""
+    for _ in range(CODE_RETRIES):
+        code = generate_code()
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(
+                    update(Ticket)
+                    .where(Ticket.ticket_id == ticket.ticket_id, Ticket.user_id == from_user_id,
+                           Ticket.status == 'valid')
+                    .values(user_id=to_user_id, code=code)
+                    .execution_options(synchronize_session=False)
+                )
+            return code if result.rowcount == 1 else None
+        except IntegrityError:
+            continue
+    raise RuntimeError(f'Could not generate a unique code for ticket {ticket.ticket_id}')
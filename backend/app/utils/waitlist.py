@@ -0,0 +1,218 @@
+"""
+Waitlist for sold-out ticket types.
+
+A buyer whose order failed for lack of tickets joins the ticket type's
+FIFO queue (POST /api/waitlist). While somebody waiting could be served
+from the tickets available, checkout cannot take that tier's tickets
+(checkout_allowed() is part of the reserve guard), so tickets given back by
+cancellations, rejected payments or expired offers go to the queue instead
+of to whoever retries fastest. Stock smaller than every waiting request
+stays on sale, so it is never stranded behind the queue.
+
+promote_waitlist() runs on the scheduler every WAITLIST_INTERVAL seconds:
+  1. offers past their claim window expire and their tickets go back,
+  2. for every tier with waiters and tickets available, the head of the
+     queue (WAITLIST_BATCH_SIZE entries at a time) gets its quantity
+     reserved with the same guarded UPDATE as checkout and an offer open
+     for WAITLIST_CLAIM_WINDOW seconds. An entry that does not fit keeps its
+     place and the walk moves on, giving up after WAITLIST_LOOKAHEAD such
+     entries, so leftovers go to the next requests that fit.
+Open offers are pushed to the concert's availability stream as a
+`waitlist` event (app/utils/events.py), so buyers need not poll. The buyer
+claims the offer, which places a pending order for the tickets already set
+aside, or declines it. Every status change is a guarded
+UPDATE, so a claim, a decline and the expiry sweep never both succeed.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, update, delete, exists, func
+from app import db
+from app.models.ticket_type import TicketType
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.waitlist import WaitlistEntry
+from app.utils.events import availability_broker
+from app.utils.inventory import reserve_tickets, release_tickets
+from app.utils.seating import is_seated
+
+ACTIVE_STATUSES = ('waiting', 'offered')
+
+
+class WaitlistError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def checkout_allowed(ticket_type_id, available=TicketType.quantity_available):
+    """
+    Reserve guard for checkout: nobody waiting for this ticket type could be
+    served from `available` tickets (by default the row being updated)
+    """
+    return ~exists().where(
+        WaitlistEntry.ticket_type_id == ticket_type_id,
+        WaitlistEntry.status == 'waiting',
+        WaitlistEntry.quantity <= available
+    )
+
+def _transition(entry_id, from_status, *conditions, **values):
+    result = db.session.execute(
+        update(WaitlistEntry)
+        .where(WaitlistEntry.entry_id == entry_id, WaitlistEntry.status == from_status, *conditions)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def queue_position(entry):
+    """1-based place of a waiting entry in its ticket type's queue"""
+    return db.session.scalar(
+        select(func.count()).select_from(WaitlistEntry).where(
+            WaitlistEntry.ticket_type_id == entry.ticket_type_id,
+            WaitlistEntry.status == 'waiting',
+            WaitlistEntry.entry_id <= entry.entry_id
+        )
+    )
+
+def join_waitlist(ticket_type_id, user_id, quantity):
+    """Queue a user for quantity tickets of a sold-out ticket type (no commit)"""
+    ticket_type = TicketType.query.get(ticket_type_id)
+    if not ticket_type:
+        raise WaitlistError(f'Ticket type {ticket_type_id} not found', 404)
+    if ticket_type.concert.status == 'completed':
+        raise WaitlistError('This concert has already taken place')
+    limit = min(current_app.config['WAITLIST_MAX_QUANTITY'], ticket_type.quantity_total)
+    if quantity > limit:
+        raise WaitlistError(f'At most {limit} tickets per waitlist entry')
+    if is_seated(ticket_type_id):
+        raise WaitlistError('Seated ticket types have no waitlist; hold seats instead')
+
+    active = WaitlistEntry.query.filter(
+        WaitlistEntry.ticket_type_id == ticket_type_id, WaitlistEntry.user_id == user_id,
+        WaitlistEntry.status.in_(ACTIVE_STATUSES)
+    ).first()
+    if active:
+        raise WaitlistError('You are already on the waitlist for this ticket type', 409)
+
+    available = ticket_type.quantity_available
+    if available >= quantity and db.session.scalar(select(checkout_allowed(ticket_type_id, available))):
+        raise WaitlistError(f'{ticket_type.name} tickets are available, order them directly', 409)
+
+    entry = WaitlistEntry(ticket_type_id=ticket_type_id, user_id=user_id, quantity=quantity, status='waiting')
+    db.session.add(entry)
+    db.session.flush()
+    return entry
+
+def claim_offer(entry_id, user_id, payment_method=''):
+    """Turn an open offer into a pending order for the tickets set aside for it (no commit)"""
+    entry = WaitlistEntry.query.filter_by(entry_id=entry_id, user_id=user_id).first()
+    if not entry:
+        raise WaitlistError('Waitlist entry not found', 404)
+    if not _transition(entry_id, 'offered', WaitlistEntry.offer_expires_at > datetime.utcnow(), status='claimed'):
+        raise WaitlistError('This entry has no open offer', 409)
+
+    ticket_type = entry.ticket_type
+    subtotal = float(ticket_type.price) * entry.quantity
+    order = Order(user_id=user_id, total_amount=subtotal, payment_method=payment_method, status='pending')
+    db.session.add(order)
+    db.session.flush()
+    db.session.add(OrderItem(
+        order_id=order.order_id,
+        ticket_type_id=ticket_type.ticket_type_id,
+        quantity=entry.quantity,
+        price_per_unit=ticket_type.price,
+        subtotal=subtotal
+    ))
+    _transition(entry_id, 'claimed', order_id=order.order_id)
+    db.session.flush()
+    return order
+
+def leave_waitlist(entry):
+    """Cancel a waiting entry or decline an offer, whose tickets go back (no commit); False if not active"""
+    if _transition(entry.entry_id, 'offered', status='cancelled', offer_expires_at=None):
+        release_tickets(entry.ticket_type_id, entry.quantity)
+        return True
+    return _transition(entry.entry_id, 'waiting', status='cancelled')
+
+def clear_waitlist(ticket_type_ids):
+    """Drop the entries of ticket types about to be deleted (no commit)"""
+    if ticket_type_ids:
+        db.session.execute(delete(WaitlistEntry).where(WaitlistEntry.ticket_type_id.in_(ticket_type_ids)))
+
+def expire_offers(now):
+    """Put the tickets of unclaimed offers back; returns (offers expired, concerts whose availability changed)"""
+    expired = db.session.execute(
+        select(WaitlistEntry.entry_id, WaitlistEntry.ticket_type_id, WaitlistEntry.quantity, TicketType.concert_id)
+        .join(TicketType, WaitlistEntry.ticket_type_id == TicketType.ticket_type_id)
+        .where(WaitlistEntry.status == 'offered', WaitlistEntry.offer_expires_at <= now)
+    ).all()
+    count, concert_ids = 0, set()
+    for entry_id, ticket_type_id, quantity, concert_id in expired:
+        # Loses to a claim or decline that got there first
+        if _transition(entry_id, 'offered', WaitlistEntry.offer_expires_at <= now,
+                       status='expired', offer_expires_at=None):
+            release_tickets(ticket_type_id, quantity)
+            concert_ids.add(concert_id)
+            count += 1
+    db.session.commit()
+    return count, concert_ids
+
+def offer_tickets(ticket_type_id, now, batch_size, window, lookahead):
+    """
+    Offer available tickets to the queue of one ticket type, in FIFO order;
+    returns the number of offers. Entries too large for what is left are
+    passed over, up to lookahead of them.
+    """
+    offered = skipped = 0
+    last_entry_id = 0
+    while True:
+        entries = db.session.execute(
+            select(WaitlistEntry.entry_id, WaitlistEntry.quantity)
+            .where(WaitlistEntry.ticket_type_id == ticket_type_id, WaitlistEntry.status == 'waiting',
+                   WaitlistEntry.entry_id > last_entry_id)
+            .order_by(WaitlistEntry.entry_id)
+            .limit(batch_size)
+        ).all()
+        for entry_id, quantity in entries:
+            last_entry_id = entry_id
+            if not reserve_tickets(ticket_type_id, quantity):
+                skipped += 1
+                if skipped > lookahead:
+                    db.session.commit()
+                    return offered
+                continue
+            if _transition(entry_id, 'waiting', status='offered', offered_at=now, offer_expires_at=now + window):
+                offered += 1
+            else:
+                # Left the queue meanwhile
+                release_tickets(ticket_type_id, quantity)
+        db.session.commit()
+        if len(entries) < batch_size:
+            return offered
+
+def promote_waitlist(now=None):
+    """Expire stale offers, then offer released tickets to waiting buyers; returns the number of offers made"""
+    config = current_app.config
+    now = now or datetime.utcnow()
+    window = timedelta(seconds=config['WAITLIST_CLAIM_WINDOW'])
+
+    expired, concert_ids = expire_offers(now)
+
+    tiers = db.session.execute(
+        select(TicketType.ticket_type_id, TicketType.concert_id)
+        .where(TicketType.quantity_available > 0, ~checkout_allowed(TicketType.ticket_type_id))
+    ).all()
+    offered = 0
+    for ticket_type_id, concert_id in tiers:
+        tier_offers = offer_tickets(ticket_type_id, now, config['WAITLIST_BATCH_SIZE'], window,
+                                    config['WAITLIST_LOOKAHEAD'])
+        db.session.commit()
+        if tier_offers:
+            offered += tier_offers
+            concert_ids.add(concert_id)
+
+    availability_broker.publish(*concert_ids)
+    if offered or expired:
+        print(f"⏳ Waitlist: {offered} offers made, {expired} expired")
+    return offered
@@ -0,0 +1,34 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.utils.order_archive import archive_orders
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Move settled orders of completed concerts into the archive tables (see app/utils/order_archive.py)'
+    )
+    parser.add_argument('--batch-size', type=int, help='Orders per transaction (default: ORDER_ARCHIVE_BATCH_SIZE)')
+    parser.add_argument('--max-batches', type=int, help='Stop after this many batches (default: ORDER_ARCHIVE_MAX_BATCHES)')
+    parser.add_argument('--after-days', type=int, help='Only concerts older than this (default: ORDER_ARCHIVE_AFTER_DAYS)')
+    parser.add_argument('--sleep', type=float, help='Pause between batches in seconds (default: ORDER_ARCHIVE_SLEEP)')
+    parser.add_argument('--dry-run', action='store_true', help='Count archivable orders (up to one run) without moving them')
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+
+    with app.app_context():
+        moved = archive_orders(batch_size=args.batch_size, max_batches=args.max_batches,
+                               after_days=args.after_days, sleep=args.sleep, dry_run=args.dry_run)
+
+    print(f"✅ {'Would archive' if args.dry_run else 'Archived'} {moved} orders")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""
+ASGI entry point: async catalogue reads + the Flask app for everything else.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5001 --workers 4
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
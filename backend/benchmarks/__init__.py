@@ -0,0 +1,11 @@
+"""
+Offline load-testing harness for the ticketing API.
+
+Boots create_app() against a local database (SQLite or a local MySQL),
+seeds a realistic dataset and drives scripted scenarios concurrently:
+
+    python -m benchmarks --database-url sqlite:////tmp/bench.db --concurrency 8 --duration 30 \
+        --output results/baseline.json
+
+Compare a later run against a saved baseline with --compare.
+"""
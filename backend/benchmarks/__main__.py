@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Load-test the ticketing API')
+    parser.add_argument('--database-url', default='sqlite:////tmp/concert_bench.db',
+                        help='Local database to boot create_app() against (default: %(default)s)')
+    parser.add_argument('--url', help='Drive a running server over HTTP instead of the in-process app '
+                                      '(the database it uses must already be seeded with --seed-only)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run (default: %(default)s)')
+    parser.add_argument('--iterations', type=int, help='Scenarios per virtual user instead of a fixed duration')
+    parser.add_argument('--concerts', type=int, default=200)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--no-reset', action='store_true', help='Reuse the existing database instead of re-seeding')
+    parser.add_argument('--seed-only', action='store_true', help='Seed the database and exit')
+    parser.add_argument('--output', help='Write JSON results to this path')
+    parser.add_argument('--compare', help='Baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed p95/throughput regression as a fraction (default: %(default)s)')
+    parser.add_argument('--verbose', action='store_true', help='Keep the application debug output')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # Config reads the environment at import time, so set it before importing the app
+    os.environ['DATABASE_URL'] = args.database_url
+    # Every virtual user shares one IP; the load mix would trip the login limit
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    sys.path.insert(0, BACKEND_DIR)
+    
+    from app import create_app, db
+    from app.models import Concert, TicketType, User
+    from benchmarks.clients import InProcessClient, HttpClient
+    from benchmarks.runner import run_load, run_metadata, save_results, compare_results, print_summary
+    from benchmarks.scenarios import SharedState
+    from benchmarks.seed import seed_database
+    
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    
+    with quiet:
+        app = create_app()
+        with app.app_context():
+            if not args.no_reset:
+                db.drop_all()
+                db.create_all()
+                dataset = seed_database(db, concerts=args.concerts, users=args.users, orders=args.orders)
+            else:
+                dataset = {'reused': True}
+            
+            state = SharedState(
+                concert_ids=[row[0] for row in db.session.query(Concert.concert_id)],
+                ticket_type_ids=[row[0] for row in db.session.query(TicketType.ticket_type_id)],
+                user_count=User.query.filter_by(role='user').count()
+            )
+    
+    print(f"Dataset: {dataset}")
+    if args.seed_only:
+        return 0
+    
+    if args.url:
+        client_factory = lambda: HttpClient(args.url)
+    else:
+        client_factory = lambda: InProcessClient(app)
+    
+    print(f"Running {args.concurrency} virtual users against {args.url or 'in-process app'}...")
+    with quiet:
+        summary = run_load(client_factory, state, concurrency=args.concurrency,
+                           duration=args.duration, iterations=args.iterations)
+    print_summary(summary)
+    
+    results = {
+        'meta': run_metadata(
+            database_url=args.database_url, target=args.url or 'in-process',
+            concurrency=args.concurrency, duration=args.duration, iterations=args.iterations,
+            dataset=dataset
+        ),
+        **summary
+    }
+    if args.output:
+        save_results(args.output, results)
+        print(f"\nResults saved to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        rows, regressions = compare_results(baseline, results, args.threshold)
+        print(f"\n{'Endpoint':<38} {'p95 before':>11} {'p95 now':>9} {'change':>8} {'rps before':>11} {'rps now':>9} {'change':>8}")
+        for label, p95_before, p95_now, p95_change, rps_before, rps_now, rps_change in rows:
+            print(f"{label:<38} {p95_before:>11.2f} {p95_now:>9.2f} {p95_change:>+8.0%} {rps_before:>11.1f} {rps_now:>9.1f} {rps_change:>+8.0%}")
+        if regressions:
+            print(f"\n❌ {len(regressions)} endpoint(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("\n✅ No regressions beyond threshold")
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
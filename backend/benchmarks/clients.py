@@ -0,0 +1,66 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+
+class Response:
+    __slots__ = ('status', 'body', 'elapsed')
+
+    def __init__(self, status, body, elapsed):
+        self.status = status
+        self.body = body
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class InProcessClient:
+    """Drives the Flask app through its test client, no network involved"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, json_body=None, headers=None):
+        started = time.perf_counter()
+        response = self._client.open(path, method=method, json=json_body, headers=headers or {})
+        body = response.get_data()
+        elapsed = time.perf_counter() - started
+        return Response(response.status_code, body, elapsed)
+
+
+class HttpClient:
+    """Drives a running server (e.g. the production launcher) over HTTP"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, json_body=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                body = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            body = e.read()
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            body = b''
+            status = 599
+        return Response(status, body, time.perf_counter() - started)
@@ -0,0 +1,112 @@
+"""
+Response compression benchmark: bytes saved vs CPU spent.
+
+Fetches real response bodies of the large list endpoints from a seeded
+database, then compresses each one with every gzip level / brotli quality
+and reports size, ratio and CPU time per response:
+
+    python -m benchmarks.compression --database-url sqlite:////tmp/compression.db --seed
+
+"transfer saved" is the time the smaller body saves on a --bandwidth-mbps
+link; a setting pays off while it is well above the CPU cost.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, path, needs admin token)
+ENDPOINTS = [
+    ('GET /api/concerts?per_page=50', '/api/concerts?per_page=50', False),
+    ('GET /api/admin/orders?per_page=50', '/api/admin/orders?per_page=50', True),
+    ('GET /api/admin/sales-report', '/api/admin/sales-report', True),
+    ('GET /api/admin/users?per_page=50', '/api/admin/users?per_page=50', True),
+]
+
+SETTINGS = [('gzip', 1), ('gzip', 6), ('gzip', 9), ('br', 1), ('br', 4), ('br', 6), ('br', 11)]
+
+def cpu_time_per_call(function, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        result = function()
+    return (time.process_time() - started) / repeat, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compression', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required=not os.environ.get('DATABASE_URL'))
+    parser.add_argument('--seed', action='store_true', help='Recreate the schema and seed benchmark data first')
+    parser.add_argument('--repeat', type=int, default=50, help='Compressions per setting (default: 50)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=10.0, help='Client link speed for "transfer saved"')
+    parser.add_argument('--output', help='Write JSON results to this path')
+    args = parser.parse_args(argv)
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['COMPRESSION_ENABLED'] = 'false'
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import create_app, db
+    from app.utils import compression
+    from benchmarks.seed import seed_database, ADMIN_EMAIL, BENCH_PASSWORD
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+        if args.seed:
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                seed_database(db)
+
+    client = app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        login = client.post('/api/auth/login', json={'email': ADMIN_EMAIL, 'password': BENCH_PASSWORD})
+    token = (login.get_json().get('data') or {}).get('access_token')
+    if not token:
+        print("❌ Admin login failed; run with --seed or against a seeded database")
+        return 1
+
+    settings = [(encoding, level) for encoding, level in SETTINGS
+                if encoding != 'br' or compression.brotli is not None]
+    if compression.brotli is None:
+        print("⚠️ Brotli is not installed, only gzip is measured")
+
+    bytes_per_second = args.bandwidth_mbps * 1_000_000 / 8
+    results = {}
+    for label, path, admin in ENDPOINTS:
+        headers = {'Authorization': f'Bearer {token}'} if admin else {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            body = client.get(path, headers=headers).get_data()
+
+        print(f"\n{label}: {len(body):,} bytes uncompressed")
+        print(f"  {'setting':<8} {'bytes':>9} {'ratio':>6} {'cpu ms':>8} {'MB/s':>7} {'transfer saved ms':>18}")
+        rows = []
+        for encoding, level in settings:
+            cpu, compressed = cpu_time_per_call(
+                lambda: compression.compress_bytes(body, encoding, level), args.repeat
+            )
+            row = {
+                'setting': f'{encoding}-{level}',
+                'bytes': len(compressed),
+                'ratio': round(len(body) / len(compressed), 2),
+                'cpu_ms': round(cpu * 1000, 3),
+                'mb_per_s': round(len(body) / cpu / 1_000_000, 1) if cpu else None,
+                'transfer_saved_ms': round((len(body) - len(compressed)) / bytes_per_second * 1000, 1),
+            }
+            rows.append(row)
+            print(f"  {row['setting']:<8} {row['bytes']:>9,} {row['ratio']:>6} {row['cpu_ms']:>8} "
+                  f"{row['mb_per_s'] or '-':>7} {row['transfer_saved_ms']:>18}")
+        results[label] = {'uncompressed_bytes': len(body), 'settings': rows}
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'database_url': args.database_url, 'repeat': args.repeat,
+                       'bandwidth_mbps': args.bandwidth_mbps, 'results': results}, handle, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
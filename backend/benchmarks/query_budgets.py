@@ -0,0 +1,121 @@
+"""
+Query budget check.
+
+Calls every endpoint that declares @query_budget against a seeded database
+and fails when one runs more SQL statements than its budget, or repeats a
+statement often enough to look like an N+1:
+
+    python -m benchmarks.query_budgets --database-url sqlite:////tmp/budgets.db --seed
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sample request per budgeted endpoint: (path template, auth) with {concert_id}, {ticket_type_id}, {order_id}, {user_id}
+SAMPLE_REQUESTS = {
+    'concerts.get_concerts': ('/api/concerts?per_page=50', None),
+    'concerts.get_concerts_availability': ('/api/concerts/availability?ids={concert_id}', None),
+    'concerts.get_concert': ('/api/concerts/{concert_id}', None),
+    'concerts.get_concert_tickets': ('/api/concerts/{concert_id}/tickets', None),
+    'tickets.get_ticket': ('/api/tickets/{ticket_type_id}', None),
+    'orders.get_user_orders': ('/api/orders?per_page=50', 'user'),
+    'orders.get_order': ('/api/orders/{order_id}', 'user'),
+    'admin.get_dashboard_stats': ('/api/admin/dashboard', 'admin'),
+    'admin.get_all_users': ('/api/admin/users?per_page=50', 'admin'),
+    'admin.get_user': ('/api/admin/users/{user_id}', 'admin'),
+    'admin.get_all_orders': ('/api/admin/orders?per_page=50', 'admin'),
+    'admin.get_sales_report': ('/api/admin/sales-report', 'admin'),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.query_budgets', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required=not os.environ.get('DATABASE_URL'))
+    parser.add_argument('--seed', action='store_true', help='Recreate the schema and seed benchmark data first')
+    args = parser.parse_args(argv)
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import create_app, db
+    from app.models import Order, OrderItem, TicketType, User
+    from app.utils.query_stats import count_queries, endpoint_budget
+    from benchmarks.seed import seed_database, ADMIN_EMAIL, BENCH_PASSWORD
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    threshold = app.config['QUERY_STATS_N_PLUS_ONE_THRESHOLD']
+
+    with app.app_context():
+        if args.seed:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.drop_all()
+                db.create_all()
+                seed_database(db)
+
+        # Sample the order with the most items (and its owner) so N+1s actually show up
+        sample = db.session.query(Order.user_id, Order.order_id).join(OrderItem) \
+            .group_by(Order.order_id).order_by(db.func.count(OrderItem.order_item_id).desc()).first()
+        if sample is None:
+            print("❌ No orders found; run with --seed or against a seeded database")
+            return 1
+        ticket_type = TicketType.query.first()
+        ids = {
+            'user_id': sample.user_id,
+            'order_id': sample.order_id,
+            'ticket_type_id': ticket_type.ticket_type_id,
+            'concert_id': ticket_type.concert_id,
+        }
+        sample_email = db.session.get(User, sample.user_id).email
+
+    client = app.test_client()
+    tokens = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for role, email in (('admin', ADMIN_EMAIL), ('user', sample_email)):
+            response = client.post('/api/auth/login', json={'email': email, 'password': BENCH_PASSWORD})
+            tokens[role] = ((response.get_json() or {}).get('data') or {}).get('access_token')
+
+    failures = 0
+    with app.test_request_context():
+        budgeted = sorted(endpoint for endpoint in app.view_functions if endpoint_budget(endpoint) is not None)
+        budgets = {endpoint: endpoint_budget(endpoint) for endpoint in budgeted}
+
+    for endpoint in budgeted:
+        if endpoint not in SAMPLE_REQUESTS:
+            print(f"❌ {endpoint}: has a query budget but no sample request in benchmarks/query_budgets.py")
+            failures += 1
+            continue
+
+        template, auth = SAMPLE_REQUESTS[endpoint]
+        headers = {'Authorization': f'Bearer {tokens[auth]}'} if auth else {}
+        with contextlib.redirect_stdout(io.StringIO()), count_queries() as stats:
+            response = client.get(template.format(**ids), headers=headers)
+
+        budget = budgets[endpoint]
+        problems = []
+        if response.status_code != 200:
+            problems.append(f'HTTP {response.status_code}')
+        if stats.count > budget:
+            problems.append(f'{stats.count} statements, budget {budget}')
+        for statement, times in stats.repeated(threshold):
+            problems.append(f"suspected N+1: {times}x {' '.join(statement.split())[:100]}")
+
+        status = '❌' if problems else '✅'
+        print(f"{status} {endpoint}: {stats.count}/{budget} statements, {stats.duration * 1000:.1f} ms")
+        for problem in problems:
+            print(f"   -> {problem}")
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n❌ {failures} endpoint(s) over their query budget")
+        return 1
+    print("\n✅ All endpoints within their query budget")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
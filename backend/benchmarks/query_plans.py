@@ -0,0 +1,153 @@
+"""
+Query-plan regression check.
+
+Runs EXPLAIN on the main query of each hot endpoint and fails when one
+falls back to a full table scan or a filesort:
+
+    python -m benchmarks.query_plans --database-url mysql+pymysql://root:@localhost/concert_app2
+    python -m benchmarks.query_plans --database-url sqlite:////tmp/plans.db --seed
+
+Run it against a database with realistic data volumes; on nearly empty
+tables MySQL legitimately prefers full scans.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def endpoint_queries(db):
+    """(name, statement) pairs mirroring the main query of each hot endpoint"""
+    from sqlalchemy import func
+    from app.models import User, Concert, TicketType, Order, OrderItem, ArchivedOrder, Ticket
+    
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    return [
+        ('concerts.get_concerts',
+         Concert.query.order_by(Concert.date.desc(), Concert.time.desc()).limit(10)),
+        ('concerts.get_concerts (status filter)',
+         Concert.query.filter(Concert.status == 'upcoming')
+         .order_by(Concert.date.desc(), Concert.time.desc()).limit(10)),
+        ('concerts.get_concerts (status count)',
+         db.session.query(func.count(Concert.concert_id)).filter(Concert.status == 'upcoming')),
+        ('concerts.get_concert_tickets',
+         TicketType.query.filter_by(concert_id=1)),
+        ('orders.get_user_orders',
+         Order.query.filter_by(user_id=1).order_by(Order.created_at.desc()).limit(10)),
+        ('orders.get_user_orders (status filter)',
+         Order.query.filter_by(user_id=1).filter(Order.status == 'paid')
+         .order_by(Order.created_at.desc()).limit(10)),
+        ('orders.get_user_orders (archive)',
+         ArchivedOrder.query.filter_by(user_id=1).order_by(ArchivedOrder.created_at.desc()).limit(10)),
+        ('admin.get_all_orders',
+         Order.query.order_by(Order.created_at.desc(), Order.order_id.desc()).limit(10)),
+        ('admin.get_all_orders (archive)',
+         ArchivedOrder.query.order_by(ArchivedOrder.created_at.desc(), ArchivedOrder.order_id.desc()).limit(10)),
+        ('admin.get_all_orders (status filter)',
+         Order.query.filter(Order.status == 'payment_submitted').order_by(Order.created_at.desc()).limit(10)),
+        ('admin.get_dashboard_stats (monthly revenue)',
+         db.session.query(func.sum(Order.total_amount))
+         .filter(Order.status == 'paid', Order.created_at >= month_start)),
+        ('admin.get_dashboard_stats (total users)',
+         db.session.query(func.count(User.user_id)).filter(User.role == 'user')),
+        ('admin.get_all_users',
+         User.query.order_by(User.created_at.desc()).limit(10)),
+        ('admin.get_all_users (role filter)',
+         User.query.filter(User.role == 'user').order_by(User.created_at.desc()).limit(10)),
+        ('Order.to_dict (order items)',
+         OrderItem.query.filter_by(order_id=1)),
+        ('tickets.check_in_ticket (code lookup)',
+         Ticket.query.filter_by(code='0000000000')),
+        ('tickets.download_ticket_pdf (order tickets)',
+         Ticket.query.filter_by(order_id=1).order_by(Ticket.ticket_id)),
+    ]
+
+def explain(connection, statement):
+    """Return (plan_lines, problems) for a statement on the connection's dialect"""
+    compiled = statement.compile(dialect=connection.dialect)
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled.string}', params).fetchall()
+        lines = [row[-1] for row in rows]
+        problems = []
+        for line in lines:
+            if line.startswith('SCAN ') and 'INDEX' not in line:
+                problems.append(f'full scan: {line}')
+            if 'USE TEMP B-TREE' in line:
+                problems.append(f'filesort: {line}')
+        return lines, problems
+    
+    if connection.dialect.name in ('mysql', 'mariadb'):
+        result = connection.exec_driver_sql(f'EXPLAIN {compiled.string}', params)
+        columns = list(result.keys())
+        lines = []
+        problems = []
+        for row in result:
+            row = dict(zip(columns, row))
+            extra = row.get('Extra') or ''
+            lines.append(f"{row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')} {extra}".strip())
+            if row.get('type') == 'ALL':
+                problems.append(f"full scan on {row.get('table')}")
+            if 'Using filesort' in extra:
+                problems.append(f"filesort on {row.get('table')}")
+        return lines, problems
+    
+    raise RuntimeError(f'EXPLAIN is not supported for dialect {connection.dialect.name}')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.query_plans', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required=not os.environ.get('DATABASE_URL'))
+    parser.add_argument('--seed', action='store_true', help='Recreate the schema and seed benchmark data first')
+    parser.add_argument('--verbose', action='store_true', help='Print the full plan of every query')
+    args = parser.parse_args(argv)
+    
+    os.environ['DATABASE_URL'] = args.database_url
+    sys.path.insert(0, BACKEND_DIR)
+    
+    from app import create_app, db
+    from benchmarks.seed import seed_database
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    
+    failures = 0
+    with app.app_context():
+        if args.seed:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.drop_all()
+                db.create_all()
+                seed_database(db, concerts=2000, users=2000, orders=20000)
+            if db.engine.dialect.name in ('mysql', 'mariadb'):
+                for table in ('users', 'concerts', 'ticket_types', 'orders', 'order_items', 'tickets'):
+                    db.session.execute(db.text(f'ANALYZE TABLE {table}'))
+        
+        connection = db.session.connection()
+        for name, query in endpoint_queries(db):
+            statement = getattr(query, 'statement', query)
+            lines, problems = explain(connection, statement)
+            status = '❌' if problems else '✅'
+            print(f"{status} {name}")
+            if problems or args.verbose:
+                for line in lines:
+                    print(f"      {line}")
+            for problem in problems:
+                print(f"   -> {problem}")
+            failures += bool(problems)
+    
+    if failures:
+        print(f"\n❌ {failures} query plan(s) fall back to a full scan or filesort")
+        return 1
+    print("\n✅ All endpoint queries use an index")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
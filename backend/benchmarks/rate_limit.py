@@ -0,0 +1,114 @@
+"""
+Rate limiter overhead benchmark.
+
+Measures the cost of one bucket hit in the memory backend (hot key, many
+keys, LRU eviction, several threads, striped vs a single lock) and the
+per-request overhead of @rate_limit through the Flask stack:
+
+    python -m benchmarks.rate_limit
+    python -m benchmarks.rate_limit --redis-url redis://localhost:6379/15
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def time_hits(backend, keys, hits):
+    """Single thread; returns microseconds per hit"""
+    key_count = len(keys)
+    started = time.perf_counter()
+    for index in range(hits):
+        backend.hit(keys[index % key_count], 1000000, 1000.0)
+    return (time.perf_counter() - started) / hits * 1e6
+
+def threaded_hits_per_second(backend, keys, threads, hits_per_thread):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset):
+        barrier.wait()
+        key_count = len(keys)
+        for index in range(hits_per_thread):
+            backend.hit(keys[(index + offset) % key_count], 1000000, 1000.0)
+
+    workers = [threading.Thread(target=worker, args=(n * 7919,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * hits_per_thread / (time.perf_counter() - started)
+
+def request_overhead(requests, rounds=10):
+    """Median latency of a trivial route with and without @rate_limit, in microseconds"""
+    from app import create_app
+    from app.utils.rate_limit import rate_limit
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+        app.config['RATE_LIMITS']['bench'] = f'{requests * 100}/60'
+        app.extensions['rate_limiter'].init_app(app)
+    app.add_url_rule('/bench/plain', 'bench_plain', lambda: 'ok')
+    app.add_url_rule('/bench/limited', 'bench_limited', rate_limit('bench', key='ip')(lambda: 'ok'))
+
+    client = app.test_client()
+    samples = {'/bench/plain': [], '/bench/limited': []}
+    # Interleaved rounds, median per route, to keep warm-up and GC noise out
+    for _ in range(rounds):
+        for path, timings in samples.items():
+            started = time.perf_counter()
+            for _ in range(requests // rounds):
+                client.get(path)
+            timings.append((time.perf_counter() - started) / (requests // rounds) * 1e6)
+    return statistics.median(samples['/bench/plain']), statistics.median(samples['/bench/limited'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.rate_limit', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hits', type=int, default=200000, help='Bucket hits per measurement')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=3000, help='Requests per route for the Flask overhead')
+    parser.add_argument('--redis-url', help='Also measure the Redis backend')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    os.environ['STARTUP_SCHEMA_MODE'] = 'skip'
+    os.environ['RATE_LIMIT_ENABLED'] = 'true'
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app.utils.rate_limit import MemoryBackend, RedisBackend
+
+    one_key = ['ip:10.0.0.1']
+    ten_thousand = [f'ip:10.0.{n // 256}.{n % 256}' for n in range(10000)]
+    one_million = [f'user:{n}' for n in range(1000000)]
+
+    print("Memory backend, single thread (µs per hit)")
+    print(f"  hot key                       {time_hits(MemoryBackend(), one_key, args.hits):8.2f}")
+    print(f"  10k keys                      {time_hits(MemoryBackend(), ten_thousand, args.hits):8.2f}")
+    print(f"  1M keys, 100k cap (evicting)  {time_hits(MemoryBackend(max_keys=100000), one_million, args.hits):8.2f}")
+
+    print(f"\nMemory backend, {args.threads} threads, 10k keys (hits/s)")
+    per_thread = args.hits // args.threads
+    for stripes in (1, 64):
+        rate = threaded_hits_per_second(MemoryBackend(stripes=stripes), ten_thousand, args.threads, per_thread)
+        print(f"  {stripes:>2} stripe(s)                  {rate:12,.0f}")
+
+    if args.redis_url:
+        backend = RedisBackend(args.redis_url, prefix='ratelimit-bench:')
+        print(f"\nRedis backend, single thread (µs per hit)")
+        print(f"  10k keys                      {time_hits(backend, ten_thousand, min(args.hits, 20000)):8.2f}")
+
+    plain, limited = request_overhead(args.requests)
+    print(f"\nFlask test client, trivial route (µs per request)")
+    print(f"  without @rate_limit           {plain:8.1f}")
+    print(f"  with @rate_limit              {limited:8.1f}  (+{limited - plain:.1f})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+from benchmarks.scenarios import VirtualUser, pick_scenario
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Thread-safe collection of per-endpoint latency samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, label, elapsed, ok, size):
+        with self._lock:
+            entry = self._samples.setdefault(label, {'latencies': [], 'errors': 0, 'bytes': 0})
+            entry['latencies'].append(elapsed)
+            entry['bytes'] += size
+            if not ok:
+                entry['errors'] += 1
+
+    def summary(self, wall_time):
+        endpoints = {}
+        total_requests = 0
+        total_errors = 0
+        with self._lock:
+            items = list(self._samples.items())
+        
+        for label, entry in sorted(items):
+            latencies = sorted(entry['latencies'])
+            count = len(latencies)
+            total_requests += count
+            total_errors += entry['errors']
+            endpoints[label] = {
+                'count': count,
+                'errors': entry['errors'],
+                'throughput_rps': round(count / wall_time, 2) if wall_time else 0.0,
+                'mean_ms': round(sum(latencies) / count * 1000, 3) if count else 0.0,
+                'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+                'max_ms': round(latencies[-1] * 1000, 3) if count else 0.0,
+                'avg_bytes': round(entry['bytes'] / count) if count else 0
+            }
+        
+        return {
+            'wall_time_s': round(wall_time, 3),
+            'total_requests': total_requests,
+            'total_errors': total_errors,
+            'throughput_rps': round(total_requests / wall_time, 2) if wall_time else 0.0,
+            'endpoints': endpoints
+        }
+
+
+def run_load(client_factory, state, concurrency=8, duration=30.0, iterations=None, seed=1):
+    """
+    Run `concurrency` virtual users until `duration` seconds pass (or each
+    has run `iterations` scenarios) and return the recorder summary.
+    """
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    
+    def worker(index):
+        rng = random.Random(seed + index)
+        user = VirtualUser(index, client_factory(), recorder, state, rng)
+        done = 0
+        while time.perf_counter() < deadline and (iterations is None or done < iterations):
+            getattr(user, pick_scenario(rng))()
+            done += 1
+    
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    return recorder.summary(time.perf_counter() - started)
+
+
+def run_metadata(**config):
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'git_revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': config
+    }
+
+
+def save_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as handle:
+        json.dump(results, handle, indent=2)
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compare per-endpoint p95 latency and throughput against a baseline run.
+    Returns (rows, regressions) where a regression is a p95 increase or a
+    throughput drop larger than `threshold` (a fraction).
+    """
+    rows = []
+    regressions = []
+    for label, now in current['endpoints'].items():
+        before = baseline['endpoints'].get(label)
+        if not before or not before['count']:
+            continue
+        
+        p95_change = (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        rps_change = (now['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] if before['throughput_rps'] else 0.0
+        row = (label, before['p95_ms'], now['p95_ms'], p95_change, before['throughput_rps'], now['throughput_rps'], rps_change)
+        rows.append(row)
+        if p95_change > threshold or rps_change < -threshold:
+            regressions.append(row)
+    
+    return rows, regressions
+
+
+def print_summary(summary):
+    print(f"\n{'Endpoint':<38} {'count':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print('-' * 92)
+    for label, stats in summary['endpoints'].items():
+        print(f"{label:<38} {stats['count']:>7} {stats['errors']:>5} {stats['throughput_rps']:>9.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+    print('-' * 92)
+    print(f"{'TOTAL':<38} {summary['total_requests']:>7} {summary['total_errors']:>5} {summary['throughput_rps']:>9.1f}")
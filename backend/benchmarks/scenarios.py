@@ -0,0 +1,120 @@
+import random
+import threading
+from collections import deque
+from benchmarks.seed import ADMIN_EMAIL, BENCH_PASSWORD, user_email
+
+
+class SharedState:
+    """Cross-user state so later steps (verify, download) act on real orders"""
+
+    def __init__(self, concert_ids, ticket_type_ids, user_count):
+        self.concert_ids = concert_ids
+        self.ticket_type_ids = ticket_type_ids
+        self.user_count = user_count
+        self.submitted_orders = deque(maxlen=10000)
+        self.paid_orders = deque(maxlen=10000)
+        self.lock = threading.Lock()
+        self.admin_token = None
+
+
+class VirtualUser:
+    """One simulated client looping over weighted scenarios"""
+
+    def __init__(self, index, client, recorder, state, rng):
+        self.index = index
+        self.client = client
+        self.recorder = recorder
+        self.state = state
+        self.rng = rng
+        self.token = None
+
+    def call(self, label, method, path, json_body=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else None
+        response = self.client.request(method, path, json_body=json_body, headers=headers)
+        self.recorder.record(label, response.elapsed, response.ok, len(response.body))
+        return response
+
+    def ensure_login(self):
+        if self.token is None:
+            self.login()
+        return self.token
+
+    # Scenarios
+
+    def browse(self):
+        self.call('GET /api/concerts', 'GET', f'/api/concerts?page={self.rng.randint(1, 5)}&per_page=12')
+        self.call('GET /api/concerts?status', 'GET', '/api/concerts?status=upcoming&per_page=12')
+        concert_id = self.rng.choice(self.state.concert_ids)
+        self.call('GET /api/concerts/<id>', 'GET', f'/api/concerts/{concert_id}')
+        self.call('GET /api/concerts/<id>/tickets', 'GET', f'/api/concerts/{concert_id}/tickets')
+
+    def login(self):
+        email = user_email(self.index % self.state.user_count)
+        response = self.call('POST /api/auth/login', 'POST', '/api/auth/login',
+                             {'email': email, 'password': BENCH_PASSWORD})
+        data = response.json() or {}
+        self.token = (data.get('data') or {}).get('access_token')
+
+    def buy(self):
+        token = self.ensure_login()
+        ticket_type_id = self.rng.choice(self.state.ticket_type_ids)
+        response = self.call('POST /api/orders', 'POST', '/api/orders', {
+            'items': [{'ticket_type_id': ticket_type_id, 'quantity': self.rng.randint(1, 3)}],
+            'payment_method': 'bank_transfer'
+        }, token)
+        order = ((response.json() or {}).get('data') or {})
+        if not order.get('order_id'):
+            return
+        
+        response = self.call('PUT /api/orders/<id>/pay', 'PUT', f"/api/orders/{order['order_id']}/pay",
+                             {'payment_method': 'bank_transfer'}, token)
+        if response.ok:
+            self.state.submitted_orders.append(order['order_id'])
+        self.call('GET /api/orders', 'GET', '/api/orders?per_page=10', token=token)
+
+    def admin_verify(self):
+        token = self.admin_token()
+        try:
+            order_id = self.state.submitted_orders.popleft()
+        except IndexError:
+            order_id = None
+        
+        self.call('GET /api/admin/orders', 'GET', '/api/admin/orders?status=payment_submitted&per_page=10', token=token)
+        if order_id is not None:
+            response = self.call('PUT /api/admin/orders/<id>/verify', 'PUT', f'/api/admin/orders/{order_id}/verify',
+                                 {'status': 'paid', 'admin_notes': 'verified by load test'}, token)
+            if response.ok:
+                self.state.paid_orders.append(order_id)
+        self.call('GET /api/admin/dashboard', 'GET', '/api/admin/dashboard', token=token)
+
+    def admin_report(self):
+        token = self.admin_token()
+        self.call('GET /api/admin/sales-report', 'GET', '/api/admin/sales-report', token=token)
+
+    def download_pdf(self):
+        if not self.state.paid_orders:
+            return
+        order_id = self.rng.choice(list(self.state.paid_orders))
+        self.call('GET /api/tickets/download/<id>', 'GET', f'/api/tickets/download/{order_id}', token=self.admin_token())
+
+    def admin_token(self):
+        with self.state.lock:
+            if self.state.admin_token is None:
+                response = self.call('POST /api/auth/login', 'POST', '/api/auth/login',
+                                     {'email': ADMIN_EMAIL, 'password': BENCH_PASSWORD})
+                self.state.admin_token = ((response.json() or {}).get('data') or {}).get('access_token')
+            return self.state.admin_token
+
+
+# Relative weights of each scenario in the default mix
+SCENARIO_WEIGHTS = {
+    'browse': 60,
+    'login': 5,
+    'buy': 20,
+    'admin_verify': 8,
+    'admin_report': 2,
+    'download_pdf': 5
+}
+
+def pick_scenario(rng, weights=SCENARIO_WEIGHTS):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
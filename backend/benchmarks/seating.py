@@ -0,0 +1,205 @@
+"""
+Assigned seating benchmark: best-available search and seat holds under contention.
+
+Creates a stadium seat map (default 40 sections x 50 rows x 40 seats =
+80,000 seats) and a concert selling it in 4 ticket types, then:
+
+  1. times best_block() alone on sections that are empty, 90% taken in
+     random seats, and full except for the last row (worst case scan),
+  2. runs --threads buyers calling hold_seats() in a loop for --duration
+     seconds, all on the same --ticket-types ticket types, and reports
+     holds/sec, seats/sec and hold latency:
+
+    python -m benchmarks.seating --database-url sqlite:////tmp/seating.db --seed
+    python -m benchmarks.seating --database-url mysql+pymysql://root:@localhost/concert_bench --threads 32
+
+With --ticket-types 1 every buyer competes for the same 10 sections, which
+is the hot-tier on-sale case; "conflicts" are hold attempts that lost the
+race for a section and retried (version guard or lock timeout).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def build_stadium(db, sections, rows, seats, ticket_types):
+    """Seat map, concert and ticket types (sections dealt round-robin); returns (concert_id, ticket_type_ids)"""
+    from datetime import date, time as clock
+    from app.models import Concert, TicketType
+    from app.utils.seating import create_seat_map, assign_seat_map
+
+    seat_map = create_seat_map({
+        'name': 'Bench Stadium', 'venue': 'Sunshine Stadium',
+        'sections': [{'name': f'S{index + 1}', 'row_count': rows, 'seats_per_row': seats} for index in range(sections)]
+    })
+    concert = Concert(title='Bench Seated Concert', venue='Sunshine Stadium', date=date(2099, 1, 1), time=clock(20, 0))
+    db.session.add(concert)
+    db.session.flush()
+    tiers = [TicketType(concert_id=concert.concert_id, name=f'Tier {index + 1}', price=100, quantity_total=1,
+                        quantity_available=1) for index in range(ticket_types)]
+    db.session.add_all(tiers)
+    db.session.flush()
+    assign_seat_map(concert.concert_id, seat_map.seat_map_id, [
+        {'section_id': section.section_id, 'ticket_type_id': tiers[index % ticket_types].ticket_type_id}
+        for index, section in enumerate(seat_map.sections)
+    ])
+    db.session.commit()
+    return concert.concert_id, [tier.ticket_type_id for tier in tiers]
+
+def search_timings(rows, seats, quantity, repeat):
+    """Best-available search alone, in microseconds per call"""
+    from app.utils.seating import best_block
+
+    layout = [(index, str(index), index * seats, seats) for index in range(rows)]
+    section_seats = rows * seats
+    rng = random.Random(7)
+    taken_90 = 0
+    for seat in rng.sample(range(section_seats), int(section_seats * 0.9)):
+        taken_90 |= 1 << seat
+    cases = {
+        'empty section': 0,
+        '90% taken (random seats)': taken_90,
+        'full except last row': ((1 << section_seats) - 1) & ~(((1 << seats) - 1) << (section_seats - seats)),
+    }
+    results = {}
+    for label, taken in cases.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            best_block(taken, layout, quantity)
+        results[label] = round((time.perf_counter() - started) / repeat * 1_000_000, 1)
+    return results
+
+def buyer(app, concert_id, ticket_type_ids, user_ids, max_quantity, deadline, stats, lock, seed):
+    from app.utils.seating import SeatingError, hold_seats
+
+    rng = random.Random(seed)
+    latencies, holds, seats, failed, sold_out = [], 0, 0, 0, 0
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            quantity = rng.randint(1, max_quantity)
+            started = time.perf_counter()
+            try:
+                hold = hold_seats(concert_id, rng.choice(ticket_type_ids), quantity, rng.choice(user_ids))
+            except SeatingError:
+                failed += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if hold is None:
+                sold_out += 1
+                continue
+            holds += 1
+            seats += quantity
+    with lock:
+        stats['latencies'] += latencies
+        stats['holds'] += holds
+        stats['seats'] += seats
+        stats['failed'] += failed
+        stats['sold_out'] += sold_out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.seating', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required=not os.environ.get('DATABASE_URL'))
+    parser.add_argument('--seed', action='store_true', help='Recreate the schema and seed users first')
+    parser.add_argument('--sections', type=int, default=40)
+    parser.add_argument('--rows', type=int, default=50, help='Rows per section (default: %(default)s)')
+    parser.add_argument('--seats', type=int, default=40, help='Seats per row (default: %(default)s)')
+    parser.add_argument('--ticket-types', type=int, default=4, help='Ticket types the sections are split into (default: %(default)s)')
+    parser.add_argument('--contended-types', type=int, default=1,
+                        help='Ticket types the buyers compete for (default: %(default)s, the hottest case)')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of holds (default: %(default)s)')
+    parser.add_argument('--max-quantity', type=int, default=4, help='Seats per hold, 1 .. this (default: %(default)s)')
+    parser.add_argument('--output', help='Write JSON results to this path')
+    args = parser.parse_args(argv)
+
+    os.environ['DATABASE_URL'] = args.database_url
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import create_app, db
+    from app.models import User
+    from app.utils import seating
+    from benchmarks.seed import seed_database
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+        # Buyers are drawn from 200 users; the per-user caps would turn the run into 429s
+        app.config['SEAT_HOLD_USER_MAX_HOLDS'] = app.config['SEAT_HOLD_USER_MAX_SEATS'] = sys.maxsize
+        with app.app_context():
+            if args.seed:
+                db.drop_all()
+                db.create_all()
+                seed_database(db, concerts=1, users=200, orders=1)
+            started = time.perf_counter()
+            concert_id, ticket_type_ids = build_stadium(db, args.sections, args.rows, args.seats, args.ticket_types)
+            setup_time = time.perf_counter() - started
+            user_ids = list(db.session.scalars(db.select(User.user_id).limit(200)))
+    seat_count = args.sections * args.rows * args.seats
+    print(f"🏟️ {seat_count:,} seats in {args.sections} sections of {args.rows} x {args.seats} "
+          f"({args.ticket_types} ticket types), created in {setup_time:.1f}s")
+
+    search = search_timings(args.rows, args.seats, args.max_quantity, 2000)
+    print(f"\n🔎 best_block() for {args.max_quantity} seats in one {args.rows * args.seats}-seat section")
+    for label, micros in search.items():
+        print(f"   {label:<28} {micros:>8} µs")
+
+    # Count lost races: every retry of hold_seats() goes through a rollback after SeatConflict / OperationalError
+    conflicts = [0]
+    try_hold = seating._try_hold
+    def counting_try_hold(*hold_args):
+        try:
+            return try_hold(*hold_args)
+        except Exception:
+            conflicts[0] += 1
+            raise
+    seating._try_hold = counting_try_hold
+
+    stats = {'latencies': [], 'holds': 0, 'seats': 0, 'failed': 0, 'sold_out': 0}
+    lock = threading.Lock()
+    contended = ticket_type_ids[:args.contended_types]
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=buyer, args=(app, concert_id, contended, user_ids, args.max_quantity,
+                                                    deadline, stats, lock, index))
+               for index in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    seating._try_hold = try_hold
+
+    latencies = sorted(stats['latencies']) or [0]
+    holds = {
+        'threads': args.threads,
+        'seconds': round(elapsed, 2),
+        'holds': stats['holds'],
+        'holds_per_sec': round(stats['holds'] / elapsed, 1),
+        'seats_per_sec': round(stats['seats'] / elapsed, 1),
+        'conflicts': conflicts[0],
+        'failed': stats['failed'],
+        'sold_out': stats['sold_out'],
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1 if len(latencies) > 1 else 0] * 1000, 2),
+    }
+    print(f"\n💺 {args.threads} buyers on {args.contended_types} ticket type(s) for {holds['seconds']}s")
+    print(f"   {holds['holds']} holds ({holds['holds_per_sec']}/s, {holds['seats_per_sec']} seats/s), "
+          f"{holds['conflicts']} conflicts retried, {holds['failed']} gave up, {holds['sold_out']} found no seats")
+    print(f"   latency p50 {holds['p50_ms']} ms, p99 {holds['p99_ms']} ms")
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'database_url': args.database_url, 'seats': seat_count, 'search_us': search, 'holds': holds},
+                      handle, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import random
+from datetime import date, datetime, time, timedelta
+from werkzeug.security import generate_password_hash
+
+BENCH_PASSWORD = 'bench-password'
+ADMIN_EMAIL = 'bench-admin@example.com'
+
+TIER_NAMES = ['VIP', 'Golden Circle', 'Regular', 'Standing', 'Balcony', 'Economy']
+VENUES = ['Grand Arena', 'Blue Note Club', 'Sunshine Stadium', 'Opera House', 'Beach Resort', 'City Hall']
+
+def user_email(index):
+    return f'bench-user-{index}@example.com'
+
+def seed_database(db, concerts=200, tiers_per_concert=4, users=500, orders=2000, seed=42):
+    """
+    Fill an empty database with a realistic dataset using Core bulk inserts.
+    
+    Every user shares one password hash so seeding does not spend minutes
+    hashing; logins still pay the full hash check.
+    """
+    from app.models import User, Concert, TicketType, Order, OrderItem
+    
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(BENCH_PASSWORD, method='pbkdf2:sha256')
+    
+    db.session.execute(User.__table__.insert(), [
+        {'name': 'Bench Admin', 'email': ADMIN_EMAIL, 'password': password_hash,
+         'role': 'admin', 'created_at': now, 'updated_at': now}
+    ] + [
+        {'name': f'Bench User {index}', 'email': user_email(index), 'password': password_hash,
+         'role': 'user', 'phone': f'0812{index:07d}',
+         'created_at': now - timedelta(days=rng.randint(0, 700)), 'updated_at': now}
+        for index in range(users)
+    ])
+    
+    statuses = ['upcoming'] * 6 + ['ongoing'] + ['completed'] * 3
+    db.session.execute(Concert.__table__.insert(), [
+        {'title': f'Bench Concert {index}',
+         'description': 'Seeded by the load-testing harness. ' * 8,
+         'venue': rng.choice(VENUES),
+         'date': date.today() + timedelta(days=rng.randint(-365, 365)),
+         'time': time(rng.choice([18, 19, 20, 21]), rng.choice([0, 30])),
+         'banner_image': f'https://example.com/banners/{index}.jpg',
+         'status': rng.choice(statuses),
+         'created_at': now, 'updated_at': now}
+        for index in range(concerts)
+    ])
+    
+    concert_ids = [row[0] for row in db.session.execute(Concert.__table__.select().with_only_columns(Concert.concert_id))]
+    ticket_rows = []
+    for concert_id in concert_ids:
+        for name in rng.sample(TIER_NAMES, tiers_per_concert):
+            quantity = rng.choice([50_000, 100_000, 200_000])
+            ticket_rows.append({
+                'concert_id': concert_id, 'name': name,
+                'price': rng.choice([350000, 500000, 750000, 1250000, 2500000]),
+                'quantity_total': quantity, 'quantity_available': quantity,
+                'created_at': now, 'updated_at': now
+            })
+    db.session.execute(TicketType.__table__.insert(), ticket_rows)
+    
+    user_ids = [row[0] for row in db.session.execute(User.__table__.select().with_only_columns(User.user_id).where(User.role == 'user'))]
+    tiers = [tuple(row) for row in db.session.execute(
+        TicketType.__table__.select().with_only_columns(TicketType.ticket_type_id, TicketType.price)
+    )]
+    
+    order_rows = []
+    item_plans = []
+    for index in range(orders):
+        picks = rng.sample(tiers, rng.randint(1, 3))
+        quantities = [rng.randint(1, 4) for _ in picks]
+        status = rng.choice(['pending', 'payment_submitted', 'paid', 'paid', 'paid', 'cancelled'])
+        created_at = now - timedelta(days=rng.randint(0, 700), minutes=rng.randint(0, 1440))
+        order_rows.append({
+            'user_id': rng.choice(user_ids),
+            'total_amount': sum(float(price) * quantity for (_, price), quantity in zip(picks, quantities)),
+            'status': status, 'payment_method': 'bank_transfer',
+            'payment_verified_at': created_at if status == 'paid' else None,
+            'created_at': created_at, 'updated_at': created_at
+        })
+        item_plans.append((picks, quantities, created_at))
+    db.session.execute(Order.__table__.insert(), order_rows)
+    
+    order_ids = [row[0] for row in db.session.execute(
+        Order.__table__.select().with_only_columns(Order.order_id).order_by(Order.order_id)
+    )]
+    item_rows = []
+    for order_id, (picks, quantities, created_at) in zip(order_ids, item_plans):
+        for (ticket_type_id, price), quantity in zip(picks, quantities):
+            item_rows.append({
+                'order_id': order_id, 'ticket_type_id': ticket_type_id, 'quantity': quantity,
+                'price_per_unit': price, 'subtotal': float(price) * quantity,
+                'created_at': created_at, 'updated_at': created_at
+            })
+    db.session.execute(OrderItem.__table__.insert(), item_rows)
+    db.session.commit()
+    
+    return {
+        'users': users, 'concerts': concerts, 'ticket_types': len(ticket_rows),
+        'orders': orders, 'order_items': len(item_rows)
+    }
@@ -0,0 +1,124 @@
+"""
+Serialization benchmark: ORM instances vs slotted row objects.
+
+Loads the same --rows rows (with the relationships the list endpoints
+nest) once as ORM instances and once as app/models/rows.py row objects,
+then serializes them with to_dict():
+
+    python -m benchmarks.serialization --database-url sqlite:////tmp/serialization.db --seed
+
+"memory / 10k" is the memory still allocated while the loaded objects are
+alive (tracemalloc, scaled to 10,000 top-level rows), "peak / 10k" the
+high-water mark while loading. Times are the best of --repeat runs.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def cases(limit):
+    """(label, load ORM instances, load row objects)"""
+    from app.models import Concert, TicketType, Order, OrderItem
+    from app.models.rows import ConcertRow, TicketTypeRow, OrderRow, OrderItemRow
+
+    def orm(model):
+        return lambda: model.query.order_by(*model.__mapper__.primary_key).options(*model.to_dict_options()).limit(limit).all()
+
+    def rows(row_class):
+        model = row_class.model
+        return lambda: row_class.from_result(
+            row_class.query(model.query.order_by(*model.__mapper__.primary_key)).limit(limit).all()
+        )
+
+    return [
+        ('ticket_types', orm(TicketType), rows(TicketTypeRow)),
+        ('concerts + ticket_types', orm(Concert), rows(ConcertRow)),
+        ('order_items + ticket_type', orm(OrderItem), rows(OrderItemRow)),
+        ('orders + items + ticket types + user', orm(Order), rows(OrderRow)),
+    ]
+
+def measure(db, load, repeat):
+    """(objects, load seconds, serialize seconds, retained bytes, peak bytes)"""
+    load_times, serialize_times = [], []
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        objects = load()
+        load_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        [item.to_dict() for item in objects]
+        serialize_times.append(time.perf_counter() - started)
+        del objects
+
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    objects = load()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    count = len(objects)
+    del objects
+    db.session.remove()
+    return count, min(load_times), min(serialize_times), retained, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.serialization', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required=not os.environ.get('DATABASE_URL'))
+    parser.add_argument('--seed', action='store_true', help='Recreate the schema and seed --rows concerts and orders first')
+    parser.add_argument('--rows', type=int, default=10000, help='Top-level rows per case (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (default: %(default)s)')
+    parser.add_argument('--output', help='Write JSON results to this path')
+    args = parser.parse_args(argv)
+
+    os.environ['DATABASE_URL'] = args.database_url
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import create_app, db
+    from benchmarks.seed import seed_database
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+        if args.seed:
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                seed_database(db, concerts=args.rows, users=1000, orders=args.rows)
+
+    results = {}
+    with app.app_context():
+        print(f"{'case':<38} {'path':<5} {'rows':>6} {'load ms':>9} {'to_dict ms':>11} {'memory / 10k':>13} {'peak / 10k':>11}")
+        for label, orm_load, rows_load in cases(args.rows):
+            results[label] = {}
+            for path, load in (('orm', orm_load), ('rows', rows_load)):
+                count, load_time, serialize_time, retained, peak = measure(db, load, args.repeat)
+                scale = 10000 / count if count else 0
+                result = {
+                    'rows': count,
+                    'load_ms': round(load_time * 1000, 1),
+                    'to_dict_ms': round(serialize_time * 1000, 1),
+                    'memory_mb_per_10k': round(retained * scale / 1_000_000, 2),
+                    'peak_mb_per_10k': round(peak * scale / 1_000_000, 2),
+                }
+                results[label][path] = result
+                print(f"{label:<38} {path:<5} {count:>6} {result['load_ms']:>9} {result['to_dict_ms']:>11} "
+                      f"{result['memory_mb_per_10k']:>10} MB {result['peak_mb_per_10k']:>8} MB")
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'database_url': args.database_url, 'rows': args.rows, 'repeat': args.repeat,
+                       'results': results}, handle, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
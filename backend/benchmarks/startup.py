@@ -0,0 +1,83 @@
+"""
+Startup-time benchmark: import + create_app() + first request, measured
+in fresh interpreters for each STARTUP_SCHEMA_MODE.
+
+    python -m benchmarks.startup --database-url sqlite:////tmp/startup.db --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside each child interpreter and prints one JSON line
+CHILD_SCRIPT = r'''
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+    imported = time.perf_counter()
+    application = app.create_app()
+    created = time.perf_counter()
+    response = application.test_client().get('/api/concerts')
+    first_request = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first_request - created) * 1000,
+    'total_ms': (first_request - started) * 1000,
+    'status': response.status_code,
+    'reportlab_loaded': 'reportlab' in sys.modules,
+}))
+'''
+
+def measure(mode, database_url, runs):
+    env = dict(os.environ, DATABASE_URL=database_url, STARTUP_SCHEMA_MODE=mode)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD_SCRIPT], cwd=BACKEND_DIR, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    
+    result = {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')
+    }
+    result['status'] = samples[-1]['status']
+    result['reportlab_loaded'] = samples[-1]['reportlab_loaded']
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite:////tmp/concert_startup.db')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modes', default='create,verify,skip')
+    parser.add_argument('--output', help='Write JSON results to this path')
+    args = parser.parse_args(argv)
+    
+    # Make sure the schema exists and is stamped so 'verify' mode can boot
+    env = dict(os.environ, DATABASE_URL=args.database_url, STARTUP_SCHEMA_MODE='create')
+    subprocess.run([sys.executable, '-m', 'data_migrations', 'run', '--sleep', '0'],
+                   cwd=BACKEND_DIR, env=env, capture_output=True, check=True)
+    
+    results = {}
+    print(f"{'mode':<8} {'import ms':>10} {'create_app ms':>14} {'1st request ms':>15} {'total ms':>9}  reportlab loaded")
+    for mode in args.modes.split(','):
+        result = measure(mode, args.database_url, args.runs)
+        results[mode] = result
+        print(f"{mode:<8} {result['import_ms']:>10.1f} {result['create_app_ms']:>14.1f} "
+              f"{result['first_request_ms']:>15.1f} {result['total_ms']:>9.1f}  {result['reportlab_loaded']}")
+    
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'database_url': args.database_url, 'runs': args.runs, 'results': results}, handle, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
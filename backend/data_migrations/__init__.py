@@ -0,0 +1,35 @@
+"""
+Chunked, resumable data migrations.
+
+Each migration is a list of steps: online-DDL-friendly ALTERs that are
+skipped when already applied, and backfills that walk the table in
+primary-key chunks with a checkpoint per chunk in schema_migrations.
+
+    python -m data_migrations status
+    python -m data_migrations run [name ...] [--chunk-size 1000] [--sleep 0.05] [--max-rows-per-sec 5000]
+
+To add a migration, create mNNNN_<name>.py exposing `migration` and append
+it to MIGRATIONS below.
+"""
+from data_migrations.runner import Migration, MigrationRunner
+from data_migrations import m0001_order_status, m0002_hot_path_indexes, m0003_scheduler_leases, m0004_order_archive, m0005_seating, m0006_waitlist, m0007_tickets, m0008_availability_changes, m0009_unfiltered_list_indexes
+
+MIGRATIONS = [
+    m0001_order_status.migration,
+    m0002_hot_path_indexes.migration,
+    m0003_scheduler_leases.migration,
+    m0004_order_archive.migration,
+    m0005_seating.migration,
+    m0006_waitlist.migration,
+    m0007_tickets.migration,
+    m0008_availability_changes.migration,
+    m0009_unfiltered_list_indexes.migration,
+]
+
+def get_migration(name):
+    for migration in MIGRATIONS:
+        if migration.name == name:
+            return migration
+    raise KeyError(f"Unknown migration: {name}")
+
+__all__ = ['Migration', 'MigrationRunner', 'MIGRATIONS', 'get_migration']
@@ -0,0 +1,39 @@
+from data_migrations.runner import Migration
+from data_migrations.steps import OnlineDDL, Backfill, add_column
+
+def _status_has_payment_submitted(inspector, dialect):
+    for column in inspector.get_columns('orders'):
+        if column['name'] == 'status':
+            return 'payment_submitted' in getattr(column['type'], 'enums', [])
+    return False
+
+migration = Migration(
+    version=1,
+    name='order_status',
+    description='Payment verification columns and the payment_submitted order status',
+    steps=[
+        add_column('orders', 'payment_submitted_at', 'TIMESTAMP NULL'),
+        add_column('orders', 'payment_verified_at', 'TIMESTAMP NULL'),
+        add_column('orders', 'admin_notes', 'TEXT NULL'),
+        # Appending to the end of an ENUM is a metadata-only change in MySQL;
+        # inserting in the middle would force a full table copy.
+        OnlineDDL(
+            "Add 'payment_submitted' to orders.status",
+            'orders',
+            "MODIFY COLUMN status ENUM('pending', 'paid', 'cancelled', 'payment_submitted') DEFAULT 'pending'",
+            skip_if=_status_has_payment_submitted,
+            mysql_only=True
+        ),
+        Backfill(
+            'Set payment_verified_at on existing paid orders',
+            'orders',
+            'order_id',
+            """
+            UPDATE orders
+            SET payment_verified_at = COALESCE(updated_at, created_at)
+            WHERE order_id > :lo AND order_id <= :hi
+              AND status = 'paid' AND payment_verified_at IS NULL
+            """
+        ),
+    ]
+)
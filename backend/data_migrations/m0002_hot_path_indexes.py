@@ -0,0 +1,14 @@
+from data_migrations.runner import Migration
+from data_migrations.steps import add_index
+
+migration = Migration(
+    version=2,
+    name='hot_path_indexes',
+    description='Composite indexes for order, catalogue and user list filters',
+    steps=[
+        add_index('orders', 'idx_o_user_created_at', ['user_id', 'created_at']),
+        add_index('orders', 'idx_o_status_created_at', ['status', 'created_at']),
+        add_index('concerts', 'idx_c_status_date_time', ['status', 'date', 'time']),
+        add_index('users', 'idx_u_role_created_at', ['role', 'created_at']),
+    ]
+)
@@ -0,0 +1,20 @@
+from sqlalchemy import MetaData, Table, Column, String, DateTime
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Defined here rather than imported from app.models, so later model changes don't alter this migration
+scheduler_leases = Table(
+    'scheduler_leases', MetaData(),
+    Column('name', String(100), primary_key=True),
+    Column('holder', String(255), nullable=False),
+    Column('expires_at', DateTime, nullable=False),
+)
+
+migration = Migration(
+    version=3,
+    name='scheduler_leases',
+    description='Leader lease table for background jobs',
+    steps=[
+        CreateTable(scheduler_leases),
+    ]
+)
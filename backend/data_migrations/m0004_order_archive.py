@@ -0,0 +1,49 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey, Integer, String, Text, DECIMAL, TIMESTAMP, Enum
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Same columns as orders / order_items at the time of this migration, without autoincrement
+metadata = MetaData()
+Table('users', metadata, Column('user_id', Integer, primary_key=True))
+Table('ticket_types', metadata, Column('ticket_type_id', Integer, primary_key=True))
+
+orders_archive = Table(
+    'orders_archive', metadata,
+    Column('order_id', Integer, primary_key=True, autoincrement=False),
+    Column('total_amount', DECIMAL(10, 2), nullable=False),
+    Column('status', Enum('pending', 'payment_submitted', 'paid', 'cancelled'), default='pending'),
+    Column('payment_method', String(50)),
+    Column('payment_submitted_at', TIMESTAMP, nullable=True),
+    Column('payment_verified_at', TIMESTAMP, nullable=True),
+    Column('admin_notes', Text, nullable=True),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+    Column('updated_at', TIMESTAMP, default=datetime.utcnow),
+    Column('user_id', Integer, ForeignKey('users.user_id'), nullable=False),
+    Index('idx_oa_user_created_at', 'user_id', 'created_at'),
+    Index('idx_oa_status_created_at', 'status', 'created_at'),
+)
+
+order_items_archive = Table(
+    'order_items_archive', metadata,
+    Column('order_item_id', Integer, primary_key=True, autoincrement=False),
+    Column('order_id', Integer, ForeignKey('orders_archive.order_id'), nullable=False),
+    Column('quantity', Integer, nullable=False),
+    Column('price_per_unit', DECIMAL(10, 2), nullable=False),
+    Column('subtotal', DECIMAL(10, 2), nullable=False),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+    Column('updated_at', TIMESTAMP, default=datetime.utcnow),
+    Column('ticket_type_id', Integer, ForeignKey('ticket_types.ticket_type_id'), nullable=False),
+    Index('idx_oia_order_id', 'order_id'),
+    Index('idx_oia_ticket_type_id', 'ticket_type_id'),
+)
+
+migration = Migration(
+    version=4,
+    name='order_archive',
+    description='Archive tables for orders of completed concerts',
+    steps=[
+        CreateTable(orders_archive),
+        CreateTable(order_items_archive),
+    ]
+)
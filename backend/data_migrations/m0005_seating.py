@@ -0,0 +1,83 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey, Integer, String, LargeBinary, DateTime, TIMESTAMP, Enum
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Defined here rather than imported from app.models, so later model changes don't alter this migration
+metadata = MetaData()
+Table('users', metadata, Column('user_id', Integer, primary_key=True))
+Table('concerts', metadata, Column('concert_id', Integer, primary_key=True))
+Table('ticket_types', metadata, Column('ticket_type_id', Integer, primary_key=True))
+
+seat_maps = Table(
+    'seat_maps', metadata,
+    Column('seat_map_id', Integer, primary_key=True, autoincrement=True),
+    Column('name', String(100), nullable=False),
+    Column('venue', String(255), nullable=False),
+    Column('seat_count', Integer, nullable=False),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+)
+
+seat_sections = Table(
+    'seat_sections', metadata,
+    Column('section_id', Integer, primary_key=True, autoincrement=True),
+    Column('seat_map_id', Integer, ForeignKey('seat_maps.seat_map_id'), nullable=False),
+    Column('name', String(50), nullable=False),
+    Column('rank', Integer, nullable=False, default=0),
+    Column('seat_count', Integer, nullable=False),
+    Index('idx_ss_seat_map_id', 'seat_map_id'),
+)
+
+seat_rows = Table(
+    'seat_rows', metadata,
+    Column('row_id', Integer, primary_key=True, autoincrement=True),
+    Column('section_id', Integer, ForeignKey('seat_sections.section_id'), nullable=False),
+    Column('label', String(10), nullable=False),
+    Column('position', Integer, nullable=False),
+    Column('seat_offset', Integer, nullable=False),
+    Column('seat_count', Integer, nullable=False),
+    Index('idx_sr_section_position', 'section_id', 'position'),
+)
+
+seat_inventory = Table(
+    'seat_inventory', metadata,
+    Column('concert_id', Integer, ForeignKey('concerts.concert_id'), primary_key=True),
+    Column('section_id', Integer, ForeignKey('seat_sections.section_id'), primary_key=True),
+    Column('ticket_type_id', Integer, ForeignKey('ticket_types.ticket_type_id'), nullable=False),
+    Column('taken', LargeBinary, nullable=False),
+    Column('seats_available', Integer, nullable=False),
+    Column('version', Integer, nullable=False, default=0),
+    Index('idx_si_ticket_type_id', 'ticket_type_id'),
+)
+
+seat_holds = Table(
+    'seat_holds', metadata,
+    Column('hold_id', Integer, primary_key=True, autoincrement=True),
+    Column('concert_id', Integer, ForeignKey('concerts.concert_id'), nullable=False),
+    Column('section_id', Integer, ForeignKey('seat_sections.section_id'), nullable=False),
+    Column('row_id', Integer, ForeignKey('seat_rows.row_id'), nullable=False),
+    Column('first_seat', Integer, nullable=False),
+    Column('quantity', Integer, nullable=False),
+    Column('ticket_type_id', Integer, ForeignKey('ticket_types.ticket_type_id'), nullable=False),
+    Column('user_id', Integer, ForeignKey('users.user_id'), nullable=False),
+    Column('order_item_id', Integer, nullable=True),
+    Column('status', Enum('held', 'ordered', 'released'), nullable=False, default='held'),
+    Column('expires_at', DateTime, nullable=True),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+    Index('idx_sh_status_expires_at', 'status', 'expires_at'),
+    Index('idx_sh_order_item_id', 'order_item_id'),
+    Index('idx_sh_concert_section', 'concert_id', 'section_id'),
+)
+
+migration = Migration(
+    version=5,
+    name='seating',
+    description='Seat maps, per-concert seat bitmaps and seat holds',
+    steps=[
+        CreateTable(seat_maps),
+        CreateTable(seat_sections),
+        CreateTable(seat_rows),
+        CreateTable(seat_inventory),
+        CreateTable(seat_holds),
+    ]
+)
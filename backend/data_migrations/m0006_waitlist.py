@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey, Integer, DateTime, TIMESTAMP, Enum
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Defined here rather than imported from app.models, so later model changes don't alter this migration
+metadata = MetaData()
+Table('users', metadata, Column('user_id', Integer, primary_key=True))
+Table('ticket_types', metadata, Column('ticket_type_id', Integer, primary_key=True))
+
+waitlist_entries = Table(
+    'waitlist_entries', metadata,
+    Column('entry_id', Integer, primary_key=True, autoincrement=True),
+    Column('ticket_type_id', Integer, ForeignKey('ticket_types.ticket_type_id'), nullable=False),
+    Column('user_id', Integer, ForeignKey('users.user_id'), nullable=False),
+    Column('quantity', Integer, nullable=False),
+    Column('status', Enum('waiting', 'offered', 'claimed', 'expired', 'cancelled'), nullable=False, default='waiting'),
+    Column('offered_at', DateTime, nullable=True),
+    Column('offer_expires_at', DateTime, nullable=True),
+    Column('order_id', Integer, nullable=True),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+    Index('idx_wl_ticket_type_status', 'ticket_type_id', 'status', 'entry_id'),
+    Index('idx_wl_status_offer_expires_at', 'status', 'offer_expires_at'),
+    Index('idx_wl_user_status', 'user_id', 'status'),
+)
+
+migration = Migration(
+    version=6,
+    name='waitlist',
+    description='FIFO waitlist entries for sold-out ticket types',
+    steps=[
+        CreateTable(waitlist_entries),
+    ]
+)
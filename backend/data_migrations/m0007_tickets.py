@@ -0,0 +1,37 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Index, UniqueConstraint, ForeignKey, Integer, SmallInteger, String, DateTime, TIMESTAMP, Enum
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Defined here rather than imported from app.models, so later model changes don't alter this migration
+metadata = MetaData()
+Table('users', metadata, Column('user_id', Integer, primary_key=True))
+Table('ticket_types', metadata, Column('ticket_type_id', Integer, primary_key=True))
+
+tickets = Table(
+    'tickets', metadata,
+    Column('ticket_id', Integer, primary_key=True, autoincrement=True),
+    Column('code', String(10), nullable=False),
+    Column('order_id', Integer, nullable=False),
+    Column('order_item_id', Integer, nullable=False),
+    Column('seq', SmallInteger, nullable=False),
+    Column('ticket_type_id', Integer, ForeignKey('ticket_types.ticket_type_id'), nullable=False),
+    Column('user_id', Integer, ForeignKey('users.user_id'), nullable=False),
+    Column('seat', String(80), nullable=True),
+    Column('status', Enum('valid', 'checked_in'), nullable=False, default='valid'),
+    Column('checked_in_at', DateTime, nullable=True),
+    Column('created_at', TIMESTAMP, default=datetime.utcnow),
+    UniqueConstraint('code', name='uq_tickets_code'),
+    UniqueConstraint('order_item_id', 'seq', name='uq_tickets_order_item_seq'),
+    Index('idx_tickets_order_id', 'order_id'),
+    Index('idx_tickets_user_id', 'user_id'),
+)
+
+migration = Migration(
+    version=7,
+    name='tickets',
+    description='Per-seat ticket records with unique short codes',
+    steps=[
+        CreateTable(tickets),
+    ]
+)
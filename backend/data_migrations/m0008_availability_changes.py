@@ -0,0 +1,21 @@
+from sqlalchemy import MetaData, Table, Column, Index, Integer, DateTime
+from data_migrations.runner import Migration
+from data_migrations.steps import CreateTable
+
+# Defined here rather than imported from app.models, so later model changes don't alter this migration
+availability_changes = Table(
+    'availability_changes', MetaData(),
+    Column('change_id', Integer, primary_key=True, autoincrement=True),
+    Column('concert_id', Integer, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Index('idx_availability_changes_created_at', 'created_at'),
+)
+
+migration = Migration(
+    version=8,
+    name='availability_changes',
+    description='Shared log of availability changes for SSE fan-out across processes',
+    steps=[
+        CreateTable(availability_changes),
+    ]
+)
@@ -0,0 +1,16 @@
+from data_migrations.runner import Migration
+from data_migrations.steps import add_index
+
+# The default (no status / role filter) list views order the whole table; without
+# these indexes they scan and sort it on every page
+migration = Migration(
+    version=9,
+    name='unfiltered_list_indexes',
+    description='Ordering indexes for the unfiltered catalogue, admin order and user lists',
+    steps=[
+        add_index('concerts', 'idx_c_date_time', ['date', 'time']),
+        add_index('orders', 'idx_o_created_at', ['created_at']),
+        add_index('orders_archive', 'idx_oa_created_at', ['created_at']),
+        add_index('users', 'idx_u_created_at', ['created_at']),
+    ]
+)
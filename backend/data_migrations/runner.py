@@ -0,0 +1,115 @@
+import time
+from datetime import datetime
+from sqlalchemy import select, update, insert
+from app.models.schema_migration import SchemaMigration
+
+
+class Migration:
+    """A named, versioned list of steps"""
+
+    def __init__(self, version, name, description, steps):
+        self.version = version
+        self.name = name
+        self.description = description
+        self.steps = steps
+
+
+class Checkpoint:
+    __slots__ = ('name', 'step', 'last_pk', 'rows_done')
+
+    def __init__(self, name, step, last_pk, rows_done):
+        self.name = name
+        self.step = step
+        self.last_pk = last_pk
+        self.rows_done = rows_done
+
+
+class MigrationRunner:
+    """
+    Runs migrations step by step, recording progress in schema_migrations.
+    
+    chunk_size rows are processed per backfill transaction; after each chunk
+    the runner sleeps `sleep` seconds and, if max_rows_per_sec is set, long
+    enough to stay under that rate so replicas and live traffic keep up.
+    """
+
+    def __init__(self, engine, chunk_size=1000, sleep=0.05, max_rows_per_sec=None, log=print):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.sleep = sleep
+        self.max_rows_per_sec = max_rows_per_sec
+        self.log = log
+        self.table = SchemaMigration.__table__
+
+    def ensure_table(self):
+        self.table.create(self.engine, checkfirst=True)
+
+    def status(self):
+        self.ensure_table()
+        with self.engine.connect() as connection:
+            return {row.name: row for row in connection.execute(select(self.table))}
+
+    def run(self, migration):
+        self.ensure_table()
+        checkpoint = self._start(migration)
+        if checkpoint is None:
+            self.log(f"ℹ️ {migration.name} already completed")
+            return
+        
+        self.log(f"🔄 Running migration {migration.version:04d} {migration.name}: {migration.description}")
+        started = time.perf_counter()
+        
+        try:
+            for index, step in enumerate(migration.steps):
+                if index < checkpoint.step:
+                    continue
+                
+                self.log(f"🔧 Step {index + 1}/{len(migration.steps)}: {step.description}")
+                step.run(self, checkpoint)
+                
+                with self.engine.begin() as connection:
+                    checkpoint.step = index + 1
+                    self.save_checkpoint(connection, checkpoint, last_pk=0, rows_done=0)
+        except Exception as e:
+            with self.engine.begin() as connection:
+                connection.execute(update(self.table).where(self.table.c.name == migration.name).values(status='failed'))
+            self.log(f"❌ {migration.name} failed at step {checkpoint.step + 1}: {str(e)}")
+            self.log("   Fix the cause and run again; completed steps and chunks are not repeated.")
+            raise
+        
+        with self.engine.begin() as connection:
+            connection.execute(update(self.table).where(self.table.c.name == migration.name).values(
+                status='completed', finished_at=datetime.utcnow(), updated_at=datetime.utcnow()
+            ))
+        self.log(f"💾 {migration.name} completed in {time.perf_counter() - started:.1f}s")
+
+    def save_checkpoint(self, connection, checkpoint, last_pk, rows_done):
+        checkpoint.last_pk = last_pk
+        checkpoint.rows_done = rows_done
+        connection.execute(update(self.table).where(self.table.c.name == checkpoint.name).values(
+            step=checkpoint.step, last_pk=last_pk, rows_done=rows_done, updated_at=datetime.utcnow()
+        ))
+
+    def throttle(self, rows, chunk_seconds):
+        delay = self.sleep
+        if self.max_rows_per_sec and rows:
+            delay = max(delay, rows / self.max_rows_per_sec - chunk_seconds)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _start(self, migration):
+        with self.engine.begin() as connection:
+            row = connection.execute(select(self.table).where(self.table.c.name == migration.name)).first()
+            
+            if row is None:
+                connection.execute(insert(self.table).values(
+                    name=migration.name, version=migration.version, status='running',
+                    step=0, last_pk=0, rows_done=0, started_at=datetime.utcnow(), updated_at=datetime.utcnow()
+                ))
+                return Checkpoint(migration.name, 0, 0, 0)
+            
+            if row.status == 'completed':
+                return None
+            
+            connection.execute(update(self.table).where(self.table.c.name == migration.name).values(status='running'))
+            return Checkpoint(migration.name, row.step, row.last_pk, row.rows_done)
@@ -0,0 +1,165 @@
+import time
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, InternalError
+
+
+def is_mysql(connection):
+    return connection.dialect.name in ('mysql', 'mariadb')
+
+
+class Step:
+    """One unit of a migration; steps run in order and are never repeated once done"""
+
+    description = ''
+
+    def run(self, runner, checkpoint):
+        raise NotImplementedError
+
+
+class OnlineDDL(Step):
+    """
+    ALTER TABLE that asks MySQL for an online algorithm first.
+    
+    Each entry of `algorithms` is tried in turn (INSTANT, then INPLACE with
+    LOCK=NONE); if none is supported the step fails instead of silently
+    falling back to a blocking table copy, unless allow_copy is set.
+    `skip_if(inspector, dialect_name)` makes the step idempotent and
+    `portable_sql` replaces the ALTER on other databases (e.g. SQLite).
+    """
+
+    def __init__(self, description, table, clause, skip_if=None,
+                 algorithms=('ALGORITHM=INSTANT', 'ALGORITHM=INPLACE, LOCK=NONE'),
+                 allow_copy=False, mysql_only=False, portable_sql=None):
+        self.description = description
+        self.table = table
+        self.clause = clause
+        self.portable_sql = portable_sql or f"ALTER TABLE {table} {clause}"
+        self.skip_if = skip_if
+        self.algorithms = algorithms
+        self.allow_copy = allow_copy
+        self.mysql_only = mysql_only
+
+    def run(self, runner, checkpoint):
+        with runner.engine.connect() as connection:
+            if self.mysql_only and not is_mysql(connection):
+                runner.log(f"   ℹ️ Skipped on {connection.dialect.name}: {self.description}")
+                return
+            
+            if self.skip_if and self.skip_if(inspect(connection), connection.dialect.name):
+                runner.log(f"   ℹ️ Already applied: {self.description}")
+                return
+            
+            if not is_mysql(connection):
+                connection.execute(text(self.portable_sql))
+                connection.commit()
+                runner.log(f"   ✅ {self.description}")
+                return
+            
+            last_error = None
+            for algorithm in self.algorithms:
+                try:
+                    started = time.perf_counter()
+                    connection.execute(text(f"ALTER TABLE {self.table} {self.clause}, {algorithm}"))
+                    connection.commit()
+                    runner.log(f"   ✅ {self.description} ({algorithm}, {time.perf_counter() - started:.2f}s)")
+                    return
+                except (OperationalError, InternalError) as e:
+                    # 1845/1846: algorithm or lock type not supported for this change
+                    last_error = e
+                    connection.rollback()
+            
+            if not self.allow_copy:
+                raise RuntimeError(
+                    f"{self.description} cannot run online on this server ({last_error}). "
+                    f"Use pt-online-schema-change/gh-ost or rerun with allow_copy."
+                )
+            
+            connection.execute(text(f"ALTER TABLE {self.table} {self.clause}"))
+            connection.commit()
+            runner.log(f"   ⚠️ {self.description} (table copy)")
+
+
+def add_column(table, column, definition):
+    return OnlineDDL(
+        f"Add {table}.{column}",
+        table,
+        f"ADD COLUMN {column} {definition}",
+        skip_if=lambda inspector, dialect: column in {c['name'] for c in inspector.get_columns(table)}
+    )
+
+
+def add_index(table, name, columns):
+    return OnlineDDL(
+        f"Add index {name} on {table}({', '.join(columns)})",
+        table,
+        f"ADD INDEX {name} ({', '.join(columns)})",
+        skip_if=lambda inspector, dialect: name in {i['name'] for i in inspector.get_indexes(table)},
+        algorithms=('ALGORITHM=INPLACE, LOCK=NONE',),
+        portable_sql=f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+    )
+
+
+class CreateTable(Step):
+    """CREATE TABLE for a new table, skipped when it already exists"""
+
+    def __init__(self, table):
+        self.table = table
+        self.description = f"Create table {table.name}"
+
+    def run(self, runner, checkpoint):
+        with runner.engine.begin() as connection:
+            if inspect(connection).has_table(self.table.name):
+                runner.log(f"   ℹ️ Already applied: {self.description}")
+                return
+            self.table.create(connection)
+            runner.log(f"   ✅ {self.description}")
+
+
+class Backfill(Step):
+    """
+    UPDATE run in primary-key chunks with a checkpoint after every chunk.
+    
+    `sql` must restrict itself to the chunk with `{pk} > :lo AND {pk} <= :hi`.
+    Each chunk commits together with its checkpoint, so an interrupted run
+    resumes at the first unfinished chunk.
+    """
+
+    def __init__(self, description, table, pk, sql, params=None):
+        self.description = description
+        self.table = table
+        self.pk = pk
+        self.sql = sql
+        self.params = params or {}
+
+    def run(self, runner, checkpoint):
+        with runner.engine.connect() as connection:
+            max_pk = connection.execute(text(f"SELECT MAX({self.pk}) FROM {self.table}")).scalar() or 0
+        
+        lo = checkpoint.last_pk
+        rows_done = checkpoint.rows_done
+        started = time.perf_counter()
+        rows_this_run = 0
+        
+        if lo:
+            runner.log(f"   ↪️ Resuming {self.description} after {self.pk}={lo}")
+        
+        while lo < max_pk:
+            hi = min(lo + runner.chunk_size, max_pk)
+            chunk_started = time.perf_counter()
+            
+            with runner.engine.begin() as connection:
+                result = connection.execute(text(self.sql), {**self.params, 'lo': lo, 'hi': hi})
+                rows = max(result.rowcount, 0)
+                runner.save_checkpoint(connection, checkpoint, last_pk=hi, rows_done=rows_done + rows)
+            
+            lo = hi
+            rows_done += rows
+            rows_this_run += rows
+            elapsed = time.perf_counter() - started
+            rate = rows_this_run / elapsed if elapsed else 0.0
+            runner.log(f"   📦 {self.pk} {hi}/{max_pk} ({hi / max_pk:.1%}), "
+                       f"{rows_done} rows updated, {rate:,.0f} rows/sec")
+            
+            runner.throttle(rows, time.perf_counter() - chunk_started)
+        
+        runner.log(f"   ✅ {self.description}: {rows_done} rows")
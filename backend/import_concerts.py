@@ -0,0 +1,52 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.utils.concert_import import ConcertImporter, IMPORT_FORMATS, detect_format, iter_records, open_text
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Bulk-create concerts and ticket types from a CSV or JSON file (see app/utils/concert_import.py)'
+    )
+    parser.add_argument('file', help='CSV, JSON or JSON Lines file; - reads stdin')
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help='Default: from the file extension')
+    parser.add_argument('--batch-size', type=int, help='Concerts per insert batch (default: IMPORT_BATCH_SIZE)')
+    parser.add_argument('--dry-run', action='store_true', help='Validate only, insert nothing')
+    args = parser.parse_args(argv)
+
+    import_format = args.format or detect_format(args.file)
+    if import_format is None:
+        parser.error('cannot tell the format from the file name, use --format')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+
+    with app.app_context():
+        importer = ConcertImporter(
+            batch_size=args.batch_size or app.config['IMPORT_BATCH_SIZE'],
+            dry_run=args.dry_run,
+            max_errors=app.config['IMPORT_MAX_ERRORS']
+        )
+
+        binary = sys.stdin.buffer if args.file == '-' else open(args.file, 'rb')
+        with binary:
+            summary = importer.run(iter_records(open_text(binary), import_format))
+
+    for error in summary['errors']:
+        location = f"row {error['row']}" if error['row'] is not None else 'file'
+        print(f"❌ {location}: {error['message']}")
+    if summary['rows_failed'] > len(summary['errors']):
+        print(f"   ... and {summary['rows_failed'] - len(summary['errors'])} more")
+
+    verb = 'Validated' if args.dry_run else 'Imported'
+    print(f"✅ {verb} {summary['concerts_created']} concerts with {summary['ticket_types_created']} ticket types, "
+          f"{summary['rows_failed']} failed rows")
+    return 1 if summary['rows_failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Production entry point: runs the app under gunicorn's pre-fork server.
+
+    python serve.py                      # workers/threads derived from CPU count
+    WEB_CONCURRENCY=8 GUNICORN_THREADS=4 python serve.py --bind 0.0.0.0:5001
+
+The app is preloaded in the master and forked into workers. Each worker
+disposes the inherited SQLAlchemy pools right after fork so pooled DB
+connections are never shared between processes. Workers are recycled
+after GUNICORN_MAX_REQUESTS (+ jitter) requests; an exiting worker
+releases its scheduler leases so another takes over the jobs right away.
+
+Reloading:
+    kill -HUP <master pid>     graceful restart of all workers (config reload)
+    kill -USR2 <master pid>    start a new master with new code, then
+    kill -WINCH <old master>   and -QUIT to retire the old one (zero downtime)
+With preload enabled HUP does not pick up code changes; use USR2 for deploys.
+
+GET /metrics is merged across workers through METRICS_MULTIPROCESS_DIR
+(a temp directory by default), which is emptied when the master starts.
+A reaped worker's file is folded into aggregate.json (child_exit).
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from gunicorn.app.base import BaseApplication
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def default_options():
+    cpu_count = multiprocessing.cpu_count()
+    return {
+        'bind': os.environ.get('GUNICORN_BIND', '0.0.0.0:5001'),
+        'workers': int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1)),
+        # Threads let one worker overlap DB waits and hold SSE streams
+        'worker_class': 'gthread',
+        'threads': int(os.environ.get('GUNICORN_THREADS', 4)),
+        'preload_app': True,
+        'max_requests': int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000)),
+        'max_requests_jitter': int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200)),
+        'timeout': int(os.environ.get('GUNICORN_TIMEOUT', 60)),
+        'graceful_timeout': int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30)),
+        'keepalive': int(os.environ.get('GUNICORN_KEEPALIVE', 5)),
+        'accesslog': os.environ.get('GUNICORN_ACCESS_LOG') or None,
+        'errorlog': '-',
+        'on_starting': on_starting,
+        'post_fork': post_fork,
+        'when_ready': when_ready,
+        'worker_exit': worker_exit,
+        'child_exit': child_exit,
+    }
+
+def on_starting(server):
+    """Start every run with empty per-worker metrics files"""
+    metrics_dir = os.environ.get('METRICS_MULTIPROCESS_DIR')
+    if metrics_dir and os.path.isdir(metrics_dir):
+        for filename in os.listdir(metrics_dir):
+            if filename.endswith(('.json', '.tmp')):
+                os.remove(os.path.join(metrics_dir, filename))
+
+def post_fork(server, worker):
+    """Drop connections inherited from the master so workers never share sockets"""
+    from app import db
+    
+    app = server.app.application
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False leaves the parent's connections alone and just forgets them
+            engine.dispose(close=False)
+    server.log.info(f"Worker {worker.pid} started with fresh database pools")
+
+def worker_exit(server, worker):
+    """Hand this worker's scheduler leases over now instead of when they expire"""
+    from app.utils.scheduler import scheduler
+    
+    scheduler.release()
+
+def child_exit(server, worker):
+    """Fold the reaped worker's metrics file into the aggregate so the directory does not grow"""
+    from app.utils.metrics import fold_process
+    
+    metrics_dir = os.environ.get('METRICS_MULTIPROCESS_DIR')
+    if metrics_dir and os.path.isdir(metrics_dir):
+        fold_process(metrics_dir, worker.pid)
+
+def when_ready(server):
+    options = server.cfg
+    server.log.info(
+        f"Serving on {', '.join(options.bind)} with {options.workers} workers x {options.threads} threads "
+        f"(max_requests={options.max_requests}, preload={options.preload_app})"
+    )
+
+class ConcertTicketingServer(BaseApplication):
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.application = None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        if self.application is None:
+            from app import create_app
+            self.application = create_app()
+        return self.application
+
+def main(argv=None):
+    options = default_options()
+    
+    parser = argparse.ArgumentParser(description='Run the concert ticketing API under gunicorn')
+    parser.add_argument('--bind', default=options['bind'])
+    parser.add_argument('--workers', type=int, default=options['workers'])
+    parser.add_argument('--threads', type=int, default=options['threads'])
+    args = parser.parse_args(argv)
+    
+    options.update(bind=args.bind, workers=args.workers, threads=args.threads)
+    
+    # Must be set before the app (and its Config) is imported
+    os.environ.setdefault('METRICS_MULTIPROCESS_DIR', os.path.join(tempfile.gettempdir(), 'concert_ticketing_metrics'))
+    ConcertTicketingServer(options).run()
+
+if __name__ == '__main__':
+    main()
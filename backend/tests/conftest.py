@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app.config reads the environment at import time, so this runs before the app is imported
+DATABASE_DIR = tempfile.mkdtemp(prefix='concert-tests-')
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{os.path.join(DATABASE_DIR, "test.db")}',
+    'STARTUP_SCHEMA_MODE': 'create',
+    'SCHEDULER_ENABLED': 'false',
+    'RATE_LIMIT_ENABLED': 'false',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_app()
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+        from app import db
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Create a user; returns (user_id, Authorization headers for it)"""
+    import uuid
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models import User
+
+    def make(role='user'):
+        with app.app_context():
+            user = User(name=role.title(), email=f'{role}-{uuid.uuid4().hex}@example.com', password='x', role=role)
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(identity=str(user.user_id))
+            user_id = user.user_id
+            db.session.remove()
+        return user_id, {'Authorization': f'Bearer {token}'}
+    return make
+
+
+@pytest.fixture
+def quiet():
+    """Swallow the routes' debug prints"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
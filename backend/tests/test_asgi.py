@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from datetime import date, time
+
+import pytest
+
+from app import db
+from app.asgi import AsyncCatalogueApp
+from app.models import Concert, TicketType
+from app.utils.rate_limit import MemoryBackend, RateLimitPolicy, rate_limit, rate_limiter
+
+# Differ between any two requests
+TIMING_HEADERS = {'x-db-query-time-ms'}
+
+
+@pytest.fixture(scope='module')
+def asgi_app(app):
+    return AsyncCatalogueApp(app)
+
+
+@pytest.fixture(scope='module')
+def concert(app):
+    with app.app_context():
+        concert = Concert(title='Headers', venue='Hall', date=date(2031, 2, 1), time=time(19, 0), status='upcoming')
+        concert.ticket_types = [TicketType(name=f'Tier {index}', price=10 + index,
+                                           quantity_total=100, quantity_available=100)
+                                for index in range(3)]
+        db.session.add(concert)
+        db.session.commit()
+        ids = concert.concert_id, concert.ticket_types[0].ticket_type_id
+        db.session.remove()
+    return ids
+
+
+def asgi_get(asgi_app, path, headers=None):
+    """GET through the ASGI app; returns (status, {lower-case name: [values]})"""
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'client': ('127.0.0.1', 50000),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    start = {}
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            start.update(message)
+
+    async def run():
+        try:
+            await asgi_app(scope, receive, send)
+        finally:
+            # aiosqlite connections belong to this event loop
+            await asgi_app.engine.dispose()
+
+    asyncio.run(run())
+    received = {}
+    for name, value in start['headers']:
+        received.setdefault(name.decode(), []).append(value.decode())
+    return start['status'], received
+
+
+def flask_get(client, path, headers=None):
+    response = client.get(path, headers=headers)
+    received = {}
+    for name, value in response.headers.items():
+        received.setdefault(name.lower(), []).append(value)
+    return response.status_code, received
+
+
+def comparable(headers):
+    return {name: values for name, values in headers.items() if name not in TIMING_HEADERS}
+
+
+def paths(concert):
+    concert_id, ticket_type_id = concert
+    return ['/api/concerts', f'/api/concerts/{concert_id}', f'/api/concerts/{concert_id}/tickets',
+            f'/api/tickets/{ticket_type_id}', '/api/concerts/999999']
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'Origin': 'https://shop.example'},
+    {'Origin': 'https://shop.example', 'Accept-Encoding': 'gzip'},
+])
+def test_headers_match_the_flask_routes(app, asgi_app, client, concert, quiet, monkeypatch, headers):
+    # Compress everything so the negotiation runs on every route
+    monkeypatch.setitem(app.config, 'COMPRESSION_MIN_SIZE', 0)
+    for path in paths(concert):
+        flask_status, flask_headers = flask_get(client, path, headers)
+        asgi_status, asgi_headers = asgi_get(asgi_app, path, headers)
+        assert asgi_status == flask_status, path
+        assert comparable(asgi_headers) == comparable(flask_headers), path
+        assert 'X-RateLimit-Remaining' in flask_headers['access-control-expose-headers'][0]
+
+
+def test_rate_limit_headers_match_and_the_backend_runs_off_the_event_loop(app, asgi_app, client, concert, quiet,
+                                                                         monkeypatch):
+    endpoint = 'tickets.get_ticket'
+    monkeypatch.setitem(app.view_functions, endpoint, rate_limit('test', key='ip')(app.view_functions[endpoint]))
+    monkeypatch.setitem(rate_limiter.policies, 'test', RateLimitPolicy.parse('test', '1/60'))
+    monkeypatch.setattr(rate_limiter, 'enabled', True)
+
+    threads = []
+    enforce = rate_limiter.enforce
+    def recording_enforce(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return enforce(*args, **kwargs)
+    monkeypatch.setattr(rate_limiter, 'enforce', recording_enforce)
+
+    path = f'/api/tickets/{concert[1]}'
+    responses = {}
+    for name, get in (('flask', lambda: flask_get(client, path)), ('asgi', lambda: asgi_get(asgi_app, path))):
+        monkeypatch.setattr(rate_limiter, 'backend', MemoryBackend())
+        responses[name] = [get(), get()]
+
+    for (flask_status, flask_headers), (asgi_status, asgi_headers) in zip(responses['flask'], responses['asgi']):
+        assert asgi_status == flask_status
+        assert comparable(asgi_headers) == comparable(flask_headers)
+    assert [status for status, _ in responses['asgi']] == [200, 429]
+    assert responses['asgi'][1][1]['retry-after'] == ['60']
+
+    # Flask enforces on its worker thread; the asyncio path hands the (possibly redis) call to the executor
+    assert threads[:2] == [threading.main_thread()] * 2
+    assert threading.main_thread() not in threads[2:]
+
+
+def test_handler_errors_are_logged_and_answered_like_the_flask_view(app, asgi_app, client, monkeypatch, capsys):
+    def broken(*args):
+        raise RuntimeError('database went away')
+    monkeypatch.setattr(Concert, 'catalogue_filters', broken)
+
+    flask_status, _ = flask_get(client, '/api/concerts')
+    capsys.readouterr()
+    asgi_status, _ = asgi_get(asgi_app, '/api/concerts')
+
+    assert asgi_status == flask_status == 500
+    output = capsys.readouterr().out
+    assert 'concerts.get_concerts failed' in output and 'database went away' in output
+    assert 'Traceback' in output
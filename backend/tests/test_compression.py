@@ -0,0 +1,73 @@
+import gzip
+import os
+
+import pytest
+
+import app.utils.compression as compression
+from app.utils.compression import choose_encoding, compress_response, negotiate_body
+
+CONFIG = {'COMPRESSION_MIN_SIZE': 1024, 'COMPRESSION_ALGORITHMS': ['br', 'gzip'],
+          'COMPRESSION_GZIP_LEVEL': 6, 'COMPRESSION_BROTLI_QUALITY': 4}
+JSON = b'{"concerts": [' + b'{"title": "Concert", "venue": "Hall"},' * 100 + b'{}]}'
+
+
+@pytest.mark.parametrize('header, encoding', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('br;q=0, gzip;q=0.1', 'gzip'),
+    ('BR', 'br'),
+    ('*', 'br'),
+    ('*;q=0.5, br;q=0', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=nope', None),
+    ('identity', None),
+    ('', None),
+    (None, None),
+])
+def test_choose_encoding(header, encoding):
+    assert choose_encoding(header) == encoding
+
+
+def test_gzip_when_brotli_is_not_installed(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert choose_encoding('br, gzip') == 'gzip'
+    assert choose_encoding('br') is None
+
+
+def test_negotiate_body():
+    # Small bodies do not depend on Accept-Encoding at all
+    assert negotiate_body(b'{}', 'gzip', CONFIG) == (b'{}', None, False)
+
+    body, encoding, vary = negotiate_body(JSON, 'gzip', CONFIG)
+    assert encoding == 'gzip' and vary and gzip.decompress(body) == JSON
+
+    assert negotiate_body(JSON, 'identity', CONFIG) == (JSON, None, True)
+
+    # Compression that does not pay off is skipped
+    noise = os.urandom(4096)
+    assert negotiate_body(noise, 'gzip', CONFIG) == (noise, None, True)
+
+
+def test_compress_response(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'COMPRESSION_ENABLED', True)
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = app.response_class(JSON, mimetype='application/json')
+        response.set_etag('v1')
+        response = compress_response(response)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert response.get_etag() == ('v1', True)  # The bytes differ from the identity body now
+        assert gzip.decompress(response.get_data()) == JSON
+
+        pdf = compress_response(app.response_class(JSON, mimetype='application/pdf'))
+        assert 'Content-Encoding' not in pdf.headers and 'Vary' not in pdf.headers
+
+        stream = compress_response(app.response_class(iter([b'data: 1\n\n', b'data: 2\n\n']),
+                                                      mimetype='text/event-stream'))
+        assert stream.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in stream.headers
+        assert gzip.decompress(b''.join(stream.response)) == b'data: 1\n\ndata: 2\n\n'
+
+    with app.test_request_context(method='HEAD', headers={'Accept-Encoding': 'gzip'}):
+        response = compress_response(app.response_class(JSON, mimetype='application/json'))
+        assert 'Content-Encoding' not in response.headers
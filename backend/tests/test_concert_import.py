@@ -0,0 +1,52 @@
+import contextlib
+import io
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Concert, TicketType
+from app.utils.concert_import import ConcertImporter
+
+
+def records(count, tiers=2, title='Import'):
+    for number in range(1, count + 1):
+        data = {'title': f'{title} {number}', 'venue': 'Hall', 'date': '2031-05-01', 'time': '20:00'}
+        tickets = [(number, {'name': f'Tier {tier}', 'price': 10 * tier, 'quantity_total': tier})
+                   for tier in range(1, tiers + 1)]
+        yield number, data, tickets
+
+
+@contextlib.contextmanager
+def count_inserts():
+    statements = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_two_insert_statements_per_batch(app_context):
+    # SQLite takes the same multi-row INSERT path as MySQL
+    title = 'Batch'
+    importer = ConcertImporter(batch_size=25)
+
+    with count_inserts() as statements, contextlib.redirect_stdout(io.StringIO()):
+        summary = importer.run(records(60, title=title))
+
+    assert summary['concerts_created'] == 60
+    assert summary['ticket_types_created'] == 120
+    # 3 batches (25, 25, 10): one concert INSERT and one ticket type INSERT each
+    assert len(statements) == 6
+
+    # Every ticket type landed on the concert it was listed under
+    concerts = Concert.query.filter(Concert.title.like(f'{title} %')).all()
+    assert len(concerts) == 60
+    for concert in concerts:
+        tiers = TicketType.query.filter_by(concert_id=concert.concert_id).order_by(TicketType.price).all()
+        assert [(tier.name, tier.quantity_total) for tier in tiers] == [('Tier 1', 1), ('Tier 2', 2)]
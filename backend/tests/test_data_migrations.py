@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(args, database_path):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database_path}', STARTUP_SCHEMA_MODE='verify',
+               SCHEDULER_ENABLED='false')
+    return subprocess.run([sys.executable, *args], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120)
+
+
+def test_migrate_empty_database_in_verify_mode(tmp_path):
+    database_path = tmp_path / 'empty.db'
+
+    migrate = run(['-m', 'data_migrations', 'run', '--sleep', '0'], database_path)
+    assert migrate.returncode == 0, migrate.stderr
+
+    # The app now boots with the schema check it refused before
+    boot = run(['-c', 'from app import create_app; create_app()'], database_path)
+    assert boot.returncode == 0, boot.stderr
+
+    status = run(['-m', 'data_migrations', 'status'], database_path)
+    assert status.returncode == 0, status.stderr
+    assert 'pending' not in status.stdout
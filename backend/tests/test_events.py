@@ -0,0 +1,34 @@
+from sqlalchemy import select, func
+
+from app import db
+from app.models.availability_change import AvailabilityChange
+from app.utils.events import availability_broker
+
+
+def change_rows():
+    return db.session.scalar(select(func.count()).select_from(AvailabilityChange))
+
+
+def test_publishes_are_coalesced_into_one_row_per_concert(app_context, monkeypatch):
+    # Keep the broker thread out of it so the interval's publishes are recorded together below
+    monkeypatch.setattr(availability_broker, '_ensure_thread', lambda: None)
+    before = change_rows()
+
+    for _ in range(5):
+        availability_broker.publish(101, 102)
+    availability_broker.publish(101)
+    assert change_rows() == before  # Nothing is written on the request path
+
+    availability_broker.record_changes()
+    assert change_rows() == before + 2
+
+
+def test_nothing_is_recorded_without_shared_fanout(app_context, monkeypatch):
+    monkeypatch.setattr(availability_broker, '_ensure_thread', lambda: None)
+    monkeypatch.setattr(availability_broker, 'shared', False)
+    before = change_rows()
+
+    availability_broker.publish(103)
+    availability_broker.record_changes()
+    assert change_rows() == before
+
@@ -0,0 +1,138 @@
+import threading
+from datetime import date, time
+
+from app import db
+from app.models import Concert, TicketType
+from app.utils.inventory import move_capacity, reserve_tickets, resize_tier
+
+
+def make_concert(*capacities, sold=0):
+    """A concert with one tier per capacity, sold tickets taken from the first; returns (concert_id, [ids])"""
+    concert = Concert(title='Inventory', venue='Hall', date=date(2031, 3, 1), time=time(20, 0), status='upcoming')
+    db.session.add(concert)
+    db.session.flush()
+    tiers = [TicketType(concert_id=concert.concert_id, name=f'Tier {index}', price=10,
+                        quantity_total=capacity, quantity_available=capacity)
+             for index, capacity in enumerate(capacities)]
+    db.session.add_all(tiers)
+    db.session.flush()
+    if sold:
+        assert reserve_tickets(tiers[0].ticket_type_id, sold)
+    db.session.commit()
+    return concert.concert_id, [tier.ticket_type_id for tier in tiers]
+
+
+def counts(ticket_type_id):
+    """(quantity_total, quantity_available) as committed"""
+    db.session.expire_all()
+    tier = db.session.get(TicketType, ticket_type_id)
+    return tier.quantity_total, tier.quantity_available
+
+
+def test_resize_cannot_go_below_the_tickets_sold(app_context):
+    concert_id, (tier_id,) = make_concert(10, sold=7)
+
+    assert not resize_tier(tier_id, 6, concert_id)
+    assert counts(tier_id) == (10, 3)
+
+    assert resize_tier(tier_id, 7, concert_id)
+    db.session.commit()
+    assert counts(tier_id) == (7, 0)
+
+
+def test_move_capacity_only_moves_unsold_tickets(app_context):
+    concert_id, (from_id, to_id) = make_concert(10, 5, sold=7)
+
+    assert not move_capacity(concert_id, from_id, to_id, 4)
+    assert counts(from_id) == (10, 3) and counts(to_id) == (5, 5)
+
+    assert move_capacity(concert_id, from_id, to_id, 3)
+    db.session.commit()
+    assert counts(from_id) == (7, 0) and counts(to_id) == (8, 8)
+
+
+def test_resize_after_a_sale_the_admin_has_not_seen(app, app_context):
+    concert_id, (tier_id,) = make_concert(10)
+    stale = db.session.get(TicketType, tier_id)
+    assert stale.quantity_available == 10
+
+    # A buyer takes 8 tickets after the admin loaded the tier
+    with app.app_context():
+        assert reserve_tickets(tier_id, 8)
+        db.session.commit()
+        db.session.remove()
+
+    # Judged on the database, not on the stale row
+    assert not resize_tier(tier_id, 5, concert_id)
+    assert resize_tier(tier_id, 9, concert_id)
+    db.session.commit()
+    assert counts(tier_id) == (9, 1)
+
+
+def test_resize_racing_purchases_keeps_the_sold_count(app, app_context):
+    concert_id, (tier_id,) = make_concert(20)
+    sold, start = [], threading.Barrier(21)
+
+    def buy():
+        start.wait()
+        with app.app_context():
+            if reserve_tickets(tier_id, 1):
+                db.session.commit()
+                sold.append(1)
+            db.session.remove()
+
+    def shrink():
+        start.wait()
+        with app.app_context():
+            resize_tier(tier_id, 15, concert_id)
+            db.session.commit()
+            db.session.remove()
+
+    threads = [threading.Thread(target=buy) for _ in range(20)] + [threading.Thread(target=shrink)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total, available = counts(tier_id)
+    assert total in (15, 20) and available >= 0
+    assert total - available == len(sold)
+
+
+def test_bulk_update_applies_no_tier_when_one_is_invalid(app, client, make_user, quiet):
+    _, admin_headers = make_user('admin')
+    with app.app_context():
+        concert_id, (sold_out_id, other_id) = make_concert(10, 10, sold=8)
+        db.session.remove()
+
+    response = client.put(f'/api/concerts/{concert_id}/tickets/bulk', headers=admin_headers, json={'tiers': [
+        {'ticket_type_id': other_id, 'price': 99, 'quantity_total': 20},
+        {'name': 'Added', 'price': 50, 'quantity_total': 5},
+        {'ticket_type_id': sold_out_id, 'quantity_total': 5},
+    ]})
+    assert response.status_code == 409
+    assert response.get_json()['message'].startswith('tiers[2]:')
+
+    with app.app_context():
+        tiers = TicketType.query.filter_by(concert_id=concert_id).order_by(TicketType.ticket_type_id).all()
+        assert [(tier.name, float(tier.price), tier.quantity_total, tier.quantity_available) for tier in tiers] == [
+            ('Tier 0', 10.0, 10, 2), ('Tier 1', 10.0, 10, 10)
+        ]
+        db.session.remove()
+
+
+def test_bulk_update_rolls_back_the_tiers_when_a_move_fails(app, client, make_user, quiet):
+    _, admin_headers = make_user('admin')
+    with app.app_context():
+        concert_id, (from_id, to_id) = make_concert(10, 10, sold=8)
+        db.session.remove()
+
+    response = client.put(f'/api/concerts/{concert_id}/tickets/bulk', headers=admin_headers, json={
+        'tiers': [{'ticket_type_id': to_id, 'quantity_total': 30}],
+        'moves': [{'from': from_id, 'to': to_id, 'quantity': 3}],
+    })
+    assert response.status_code == 409
+
+    with app.app_context():
+        assert counts(from_id) == (10, 2) and counts(to_id) == (10, 10)
+        db.session.remove()
@@ -0,0 +1,38 @@
+import os
+
+from app.utils.metrics import RequestMetrics, empty_totals, fold_process, write_file
+
+
+def worker_file(directory, pid, requests, latency_count):
+    totals = empty_totals()
+    totals['requests'][('concerts.get_concerts', 'GET', '200')] = requests
+    totals['latency'][('concerts.get_concerts', 'GET')] = [latency_count] + [0] * 11 + [0.5]
+    totals['in_flight'][('concerts.get_concerts',)] = 1
+    write_file(os.path.join(directory, f'{pid}.json'), totals)
+
+
+def scrape(directory):
+    metrics = RequestMetrics()
+    metrics.multiprocess_dir = str(directory)
+    totals = metrics.collect()
+    return totals['requests'][('concerts.get_concerts', 'GET', '200')], totals['latency'][('concerts.get_concerts', 'GET')][0]
+
+
+def test_exited_workers_are_folded_and_counters_never_go_back(tmp_path):
+    worker_file(tmp_path, 101, requests=5, latency_count=5)
+    worker_file(tmp_path, 102, requests=7, latency_count=7)
+    assert scrape(tmp_path) == (12, 12)
+
+    assert fold_process(str(tmp_path), 101)
+    assert not (tmp_path / '101.json').exists()
+    assert scrape(tmp_path) == (12, 12)
+
+    # A new worker reusing pid 101 adds to the dead one's counts instead of replacing them
+    worker_file(tmp_path, 101, requests=1, latency_count=1)
+    assert fold_process(str(tmp_path), 102)
+    assert scrape(tmp_path) == (13, 13)
+
+    assert fold_process(str(tmp_path), 101)
+    assert not fold_process(str(tmp_path), 101)
+    assert scrape(tmp_path) == (13, 13)
+    assert sorted(name for name in os.listdir(tmp_path) if not name.startswith(str(os.getpid()))) == ['aggregate.json']
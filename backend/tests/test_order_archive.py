@@ -0,0 +1,46 @@
+from datetime import date, datetime, time, timedelta
+
+from app import db
+from app.models import User, Concert, TicketType, Order, OrderItem
+from app.utils.order_archive import archivable_order_ids
+
+
+def make_order(user, created_at, ticket_type=None, status='paid'):
+    order = Order(user_id=user.user_id, total_amount=0, status=status, created_at=created_at)
+    db.session.add(order)
+    db.session.flush()
+    if ticket_type is not None:
+        db.session.add(OrderItem(order_id=order.order_id, ticket_type_id=ticket_type.ticket_type_id,
+                                 quantity=1, price_per_unit=10, subtotal=10))
+    return order.order_id
+
+
+def make_ticket_type(concert_date, status):
+    concert = Concert(title='Archive test', venue='Hall', date=concert_date, time=time(20, 0), status=status)
+    db.session.add(concert)
+    db.session.flush()
+    ticket_type = TicketType(concert_id=concert.concert_id, name='GA', price=10, quantity_total=10, quantity_available=10)
+    db.session.add(ticket_type)
+    db.session.flush()
+    return ticket_type
+
+
+def test_orders_without_items_respect_the_cutoff(app_context):
+    user = User(name='Archive', email='archive-test@example.com', password='x')
+    db.session.add(user)
+    db.session.flush()
+    cutoff = date.today() - timedelta(days=30)
+    now, long_ago = datetime.utcnow(), datetime.utcnow() - timedelta(days=90)
+
+    empty_recent = make_order(user, now)
+    empty_old = make_order(user, long_ago, status='cancelled')
+    completed = make_order(user, long_ago, make_ticket_type(cutoff - timedelta(days=10), 'completed'))
+    upcoming = make_order(user, long_ago, make_ticket_type(date.today() + timedelta(days=10), 'upcoming'))
+    db.session.commit()
+
+    archivable = set(archivable_order_ids(cutoff, 10000))
+
+    assert empty_recent not in archivable
+    assert empty_old in archivable
+    assert completed in archivable
+    assert upcoming not in archivable
@@ -0,0 +1,66 @@
+from datetime import date, time
+
+from app import db
+from app.models import Concert, TicketType, Order, OrderItem
+import app.routes.admin as admin_routes
+
+
+def make_pending_order(user_id, quantity=2):
+    concert = Concert(title='Race', venue='Hall', date=date(2031, 1, 1), time=time(20, 0), status='upcoming')
+    db.session.add(concert)
+    db.session.flush()
+    ticket_type = TicketType(concert_id=concert.concert_id, name='GA', price=10,
+                             quantity_total=10, quantity_available=10 - quantity)
+    db.session.add(ticket_type)
+    db.session.flush()
+    order = Order(user_id=user_id, total_amount=10 * quantity, status='pending')
+    db.session.add(order)
+    db.session.flush()
+    db.session.add(OrderItem(order_id=order.order_id, ticket_type_id=ticket_type.ticket_type_id,
+                             quantity=quantity, price_per_unit=10, subtotal=10 * quantity))
+    db.session.commit()
+    return order.order_id, ticket_type.ticket_type_id
+
+
+def test_cancel_racing_a_reject_releases_stock_once(app, client, make_user, monkeypatch, quiet):
+    user_id, user_headers = make_user()
+    _, admin_headers = make_user('admin')
+    with app.app_context():
+        order_id, ticket_type_id = make_pending_order(user_id)
+        db.session.remove()
+
+    # The user's cancel commits after the admin request has read the order as pending
+    change_order_status = admin_routes.change_order_status
+    cancels = []
+
+    def cancel_first(*args, **kwargs):
+        with app.app_context():
+            cancels.append(client.put(f'/api/orders/{order_id}/cancel', headers=user_headers))
+        return change_order_status(*args, **kwargs)
+
+    monkeypatch.setattr(admin_routes, 'change_order_status', cancel_first)
+    reject = client.put(f'/api/admin/orders/{order_id}/verify', headers=admin_headers, json={'status': 'cancelled'})
+
+    assert cancels[0].status_code == 200
+    assert reject.status_code == 409
+    with app.app_context():
+        assert db.session.get(TicketType, ticket_type_id).quantity_available == 10
+        assert db.session.get(Order, order_id).status == 'cancelled'
+        db.session.remove()
+
+
+def test_second_reject_does_not_release_again(app, client, make_user, quiet):
+    user_id, _ = make_user()
+    _, admin_headers = make_user('admin')
+    with app.app_context():
+        order_id, ticket_type_id = make_pending_order(user_id, quantity=3)
+        db.session.remove()
+
+    first = client.put(f'/api/admin/orders/{order_id}/verify', headers=admin_headers, json={'status': 'cancelled'})
+    second = client.put(f'/api/admin/orders/{order_id}/verify', headers=admin_headers, json={'status': 'cancelled'})
+
+    assert first.status_code == 200
+    assert second.status_code in (400, 409)
+    with app.app_context():
+        assert db.session.get(TicketType, ticket_type_id).quantity_available == 10
+        db.session.remove()
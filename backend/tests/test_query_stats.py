@@ -0,0 +1,31 @@
+from app.utils.query_stats import QueryStats, report
+
+PRODUCTION = {'QUERY_STATS_HEADERS': False, 'QUERY_STATS_N_PLUS_ONE_THRESHOLD': 5, 'QUERY_BUDGET_STRICT': False}
+
+
+def n_plus_one():
+    stats = QueryStats()
+    stats.record('SELECT * FROM concerts', 0.001)
+    for _ in range(6):
+        stats.record('SELECT * FROM ticket_types WHERE concert_id = ?', 0.001)
+    return stats
+
+
+def test_production_logs_each_endpoint_once(capsys):
+    for _ in range(3):
+        assert report(n_plus_one(), 'test.once', 2, PRODUCTION) == {}
+    report(n_plus_one(), 'test.other', None, PRODUCTION)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(':')[0] for line in lines] == [
+        '⚠️ Suspected N+1 in test.once', '⚠️ Query budget exceeded', '⚠️ Suspected N+1 in test.other'
+    ]
+
+
+def test_dev_mode_logs_every_request(capsys):
+    config = dict(PRODUCTION, QUERY_STATS_HEADERS=True)
+    for _ in range(3):
+        headers = report(n_plus_one(), 'test.dev', None, config)
+
+    assert headers['X-DB-N-Plus-One'].startswith('6x SELECT * FROM ticket_types')
+    assert capsys.readouterr().out.count('Suspected N+1 in test.dev') == 3
@@ -0,0 +1,88 @@
+import pytest
+
+import app.utils.rate_limit as rate_limit_module
+from app.utils.rate_limit import MemoryBackend, RateLimiter, RateLimitPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit_module.time, 'monotonic', clock)
+    return clock
+
+
+def limiter(spec):
+    limiter = RateLimiter()
+    limiter.policies = {'test': RateLimitPolicy.parse('test', spec)}
+    limiter.backend = MemoryBackend()
+    return limiter
+
+
+def test_bucket_refills_evenly_up_to_its_burst(clock):
+    backend = MemoryBackend()
+    assert backend.hit('a', 2, 1.0) == (True, 1.0, 0.0)
+    assert backend.hit('a', 2, 1.0) == (True, 0.0, 0.0)
+    assert backend.hit('a', 2, 1.0) == (False, 0.0, 1.0)
+
+    clock.now += 0.25
+    allowed, remaining, retry_after = backend.hit('a', 2, 1.0)
+    assert not allowed and remaining == 0.25 and retry_after == 0.75
+
+    clock.now += 0.75
+    assert backend.hit('a', 2, 1.0)[0]
+
+    # A long idle period refills the burst, never more
+    clock.now += 3600
+    assert backend.hit('a', 2, 1.0) == (True, 1.0, 0.0)
+
+
+def test_least_recently_used_key_is_evicted(clock):
+    backend = MemoryBackend(max_keys=2, stripes=1)
+    backend.hit('a', 1, 0.001)
+    backend.hit('b', 1, 0.001)
+    backend.hit('a', 1, 0.001)  # a is now the most recently used
+    backend.hit('c', 1, 0.001)
+
+    assert len(backend) == 2
+    # a kept its empty bucket; b was evicted and starts again with a full one
+    assert not backend.hit('a', 1, 0.001)[0]
+    assert backend.hit('b', 1, 0.001)[0]
+
+
+@pytest.mark.parametrize('waited, retry_after', [(0, '60'), (58.2, '2'), (59.5, '1'), (59.999, '1')])
+def test_retry_after_rounds_up_to_whole_seconds(clock, waited, retry_after):
+    rate_limiter = limiter('1/60')
+    headers, refusal = rate_limiter.enforce('test', 'ip', client_key='ip:10.0.0.1')
+    assert refusal is None
+    assert headers == {'X-RateLimit-Limit': '1', 'X-RateLimit-Remaining': '0'}
+
+    clock.now += waited
+    headers, refusal = rate_limiter.enforce('test', 'ip', client_key='ip:10.0.0.1')
+    assert headers['Retry-After'] == retry_after
+    assert refusal == f'Too many requests. Try again in {retry_after} seconds'
+
+
+def test_backend_errors_let_requests_through(quiet):
+    class BrokenBackend:
+        def hit(self, *args):
+            raise ConnectionError('redis is down')
+
+    rate_limiter = limiter('5/60')
+    rate_limiter.backend = BrokenBackend()
+    assert rate_limiter.enforce('test', 'ip', client_key='ip:10.0.0.1') == (
+        {'X-RateLimit-Limit': '5', 'X-RateLimit-Remaining': '5'}, None
+    )
+
+
+@pytest.mark.parametrize('spec', ['ten/60', '0/60', '5/0', '5/-1'])
+def test_invalid_policies_are_rejected(spec):
+    with pytest.raises(ValueError):
+        RateLimitPolicy.parse('test', spec)
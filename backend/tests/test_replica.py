@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from flask import g
+
+from app import db
+from app.models import User
+from app.utils.replica import (LAST_WRITE_COOKIE, LAST_WRITE_HEADER, _after_commit, _mark_last_write,
+                               _serializer, marker_is_fresh, replica_read)
+
+
+def marker(app):
+    return _serializer(app.config).dumps('')
+
+
+def test_marker_freshness(app, monkeypatch):
+    token = marker(app)
+    assert marker_is_fresh(token, app.config)
+    assert not marker_is_fresh(None, app.config)
+    assert not marker_is_fresh(token[:-2] + 'xx', app.config)
+    assert not marker_is_fresh(_serializer({'SECRET_KEY': 'another node'}).dumps(''), app.config)
+
+    monkeypatch.setitem(app.config, 'REPLICA_STALENESS_WINDOW', -1)
+    assert not marker_is_fresh(token, app.config)
+
+
+def test_recent_writers_read_from_the_primary(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'REPLICA_BIND_KEYS', ['replica_0'])
+    view = replica_read(lambda: g.get('db_replica_key'))
+
+    with app.test_request_context():
+        assert view() == 'replica_0'
+    with app.test_request_context(headers={LAST_WRITE_HEADER: marker(app)}):
+        assert view() is None
+    with app.test_request_context(headers={'Cookie': f'{LAST_WRITE_COOKIE}={marker(app)}'}):
+        assert view() is None
+    with app.test_request_context(headers={LAST_WRITE_HEADER: 'forged'}):
+        assert view() == 'replica_0'
+
+
+def test_a_committed_write_hands_out_a_marker(app):
+    with app.test_request_context():
+        g.db_replica_key = 'replica_0'
+        _after_commit(SimpleNamespace(info={'wrote': True}))
+        # The rest of the request reads its own write from the primary
+        assert g.db_replica_key is None
+
+        response = _mark_last_write(app.response_class('ok'))
+        token = response.headers[LAST_WRITE_HEADER]
+        assert marker_is_fresh(token, app.config)
+        assert f'{LAST_WRITE_COOKIE}={token}' in response.headers['Set-Cookie']
+
+    with app.test_request_context():
+        _after_commit(SimpleNamespace(info={}))
+        assert LAST_WRITE_HEADER not in _mark_last_write(app.response_class('ok')).headers
+
+
+def test_session_with_pending_writes_stays_on_the_primary(app):
+    with app.test_request_context():
+        g.db_replica_key = 'replica_0'
+        session = db.session()
+        assert session._replica_key() == 'replica_0'
+
+        user = User(name='Pending', email='pending@example.com', password='x')
+        session.add(user)
+        assert session._replica_key() is None
+        session.expunge(user)
+
+        session.info['wrote'] = True
+        assert session._replica_key() is None
+        session.info.pop('wrote')
+        db.session.remove()
@@ -0,0 +1,58 @@
+from datetime import date, time
+
+import pytest
+
+from app import db
+from app.models import Concert, Order, OrderItem, TicketType
+from app.models.rows import ConcertRow, OrderRow
+from app.models.serialization import Fieldset
+
+
+@pytest.fixture
+def order_id(app_context, make_user):
+    user_id, _ = make_user()
+    concert = Concert(title='Rows', venue='Hall', date=date(2031, 5, 1), time=time(21, 0), status='upcoming')
+    concert.ticket_types = [TicketType(name=name, price=price, quantity_total=50, quantity_available=40)
+                            for name, price in (('GA', 25), ('VIP', 90))]
+    db.session.add(concert)
+    db.session.flush()
+    order = Order(user_id=user_id, total_amount=140, status='pending')
+    order.order_items = [OrderItem(ticket_type_id=tier.ticket_type_id, quantity=2, price_per_unit=tier.price,
+                                   subtotal=2 * tier.price) for tier in concert.ticket_types]
+    db.session.add(order)
+    db.session.commit()
+    return order.order_id
+
+
+FIELDSETS = [
+    ((), ()),
+    (['status,total_amount'], ()),
+    (['status,order_items.quantity,order_items.ticket_type.name'], ()),
+    ([], ['user']),
+    (['order_items.subtotal'], ['user']),
+]
+
+
+@pytest.mark.parametrize('fields, include', FIELDSETS)
+def test_order_rows_serialize_like_the_model(order_id, fields, include):
+    fieldset = Fieldset.parse(fields, include)
+    row, = OrderRow.fetch(fieldset, Order.order_id == order_id)
+    db.session.expire_all()
+    assert row.to_dict(fieldset) == db.session.get(Order, order_id).to_dict(fieldset)
+
+
+@pytest.mark.parametrize('fields', [(), ['title'], ['title,ticket_types.quantity_available']])
+def test_concert_rows_serialize_like_the_model(order_id, fields):
+    concert_id = db.session.get(Order, order_id).order_items[0].ticket_type.concert_id
+    fieldset = Fieldset.parse(fields)
+    row, = ConcertRow.fetch(fieldset, Concert.concert_id == concert_id)
+    assert row.to_dict(fieldset) == db.session.get(Concert, concert_id).to_dict(fieldset)
+
+
+def test_rows_load_only_the_requested_columns_and_are_read_only(order_id):
+    row, = OrderRow.fetch(Fieldset.parse(['status']), Order.order_id == order_id)
+    assert row.status == 'pending'
+    assert not hasattr(row, 'total_amount')
+    assert not hasattr(row, '__dict__')
+    with pytest.raises(AttributeError, match='read-only'):
+        row.status = 'paid'
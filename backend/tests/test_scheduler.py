@@ -0,0 +1,55 @@
+import threading
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.scheduler_lease import SchedulerLease
+from app.utils.scheduler import Job, Scheduler, acquire_lease, release_leases
+
+
+def lease_expiry(name):
+    db.session.expire_all()
+    return db.session.get(SchedulerLease, name).expires_at
+
+
+def test_lease_lasts_about_one_interval(app, app_context):
+    scheduler = Scheduler()
+    scheduler.app = app
+    scheduler.lease_grace = 30
+    runs = []
+    job = Job('test_hourly', 3600, lambda: runs.append(1))
+
+    assert scheduler.run_job(job)
+    assert runs == [1]
+    remaining = (lease_expiry('test_hourly') - datetime.utcnow()).total_seconds()
+    assert 3600 < remaining <= 3630
+
+    # Another process waits for the lease
+    assert not acquire_lease('test_hourly', 'other-host:1', 60)
+
+
+def test_released_leases_can_be_taken_over(app_context):
+    assert acquire_lease('test_release', 'old-worker:1', 3600)
+    assert not acquire_lease('test_release', 'new-worker:2', 3600)
+
+    assert release_leases('old-worker:1') == 1
+    assert lease_expiry('test_release') <= datetime.utcnow() + timedelta(seconds=1)
+    assert acquire_lease('test_release', 'new-worker:2', 3600)
+
+
+def test_a_long_job_does_not_hold_up_the_others(app):
+    scheduler = Scheduler()
+    scheduler.app = app
+    archive_started, archive_released, swept = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_archive():
+        archive_started.set()
+        archive_released.wait(10)
+
+    scheduler.add_job('test_slow_archive', 3600, slow_archive)
+    scheduler.add_job('test_sweep', 3600, swept.set)
+    scheduler.start()
+    try:
+        assert archive_started.wait(5)
+        assert swept.wait(5)
+    finally:
+        archive_released.set()
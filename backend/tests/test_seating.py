@@ -0,0 +1,78 @@
+from datetime import date, time
+
+import pytest
+
+from app import db
+from app.models import Concert, TicketType
+from app.utils.seating import SeatingError, best_block, block_starts, hold_seats, create_seat_map, assign_seat_map
+
+
+def bits(pattern):
+    """Bitmap int of a seat pattern, seat 0 first: '#' taken, '.' free"""
+    return sum(1 << index for index, seat in enumerate(pattern) if seat == '#')
+
+
+def free_mask(pattern):
+    return sum(1 << index for index, seat in enumerate(pattern) if seat == '.')
+
+
+def test_block_starts_on_a_fragmented_row():
+    free = free_mask('..#...#....#.')
+    assert block_starts(free, 1) == free
+    assert block_starts(free, 3) == (1 << 3) | (1 << 7) | (1 << 8)
+    assert block_starts(free, 4) == 1 << 7
+    assert block_starts(free, 5) == 0
+
+
+def test_best_block_skips_rows_without_room_and_centres_the_block():
+    rows = [(1, 'A', 0, 10), (2, 'B', 10, 10)]
+    taken = bits('#.#.#.#.#.' + '#.....#...')
+
+    # Row A only has single seats free; row B's 3-seat starts are 1..3 and 7, 3 is nearest its centre (3)
+    assert best_block(taken, rows, 3) == (rows[1], 3)
+    assert best_block(taken, rows, 1) == (rows[0], 3)
+    assert best_block(taken, rows, 6) is None
+
+
+def make_seated_concert(status='upcoming'):
+    seat_map = create_seat_map({'name': 'Club', 'venue': 'Club',
+                                'sections': [{'name': 'Floor', 'row_count': 5, 'seats_per_row': 10}]})
+    concert = Concert(title='Seated', venue='Club', date=date(2031, 1, 1), time=time(20, 0), status=status)
+    db.session.add(concert)
+    db.session.flush()
+    tier = TicketType(concert_id=concert.concert_id, name='Floor', price=10, quantity_total=1, quantity_available=1)
+    db.session.add(tier)
+    db.session.flush()
+    assign_seat_map(concert.concert_id, seat_map.seat_map_id,
+                    [{'section_id': seat_map.sections[0].section_id, 'ticket_type_id': tier.ticket_type_id}])
+    db.session.commit()
+    return concert.concert_id, tier.ticket_type_id
+
+
+def test_holds_per_user_and_concert_are_capped(app, app_context, make_user, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEAT_HOLD_USER_MAX_HOLDS', 2)
+    monkeypatch.setitem(app.config, 'SEAT_HOLD_USER_MAX_SEATS', 6)
+    concert_id, ticket_type_id = make_seated_concert()
+    user_id, _ = make_user()
+    other_user_id, _ = make_user()
+
+    assert hold_seats(concert_id, ticket_type_id, 4, user_id)
+    with pytest.raises(SeatingError) as error:
+        hold_seats(concert_id, ticket_type_id, 3, user_id)
+    assert error.value.status_code == 429
+    assert hold_seats(concert_id, ticket_type_id, 2, user_id)
+    with pytest.raises(SeatingError) as error:
+        hold_seats(concert_id, ticket_type_id, 1, user_id)
+    assert error.value.status_code == 429
+
+    # Other buyers are not affected
+    assert hold_seats(concert_id, ticket_type_id, 4, other_user_id)
+
+
+def test_holds_need_an_upcoming_concert(app_context, make_user):
+    concert_id, ticket_type_id = make_seated_concert(status='completed')
+    user_id, _ = make_user()
+
+    with pytest.raises(SeatingError) as error:
+        hold_seats(concert_id, ticket_type_id, 2, user_id)
+    assert error.value.status_code == 409
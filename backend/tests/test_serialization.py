@@ -0,0 +1,49 @@
+from datetime import date, time
+
+import pytest
+
+from app.models import Concert, Order, TicketType
+from app.models.serialization import Fieldset, FieldsetError
+
+
+def test_parse_splits_commas_and_repeated_parameters():
+    assert Fieldset.parse() is None
+    assert Fieldset.parse([''], [' , ']) is None
+
+    fieldset = Fieldset.parse(['title, venue', 'date,'])
+    assert fieldset.fields == {'title', 'venue', 'date'}
+    assert fieldset.include == {}
+
+
+def test_dotted_fields_include_their_relationship():
+    fieldset = Fieldset.parse(['status,order_items.quantity,order_items.ticket_type.name'], ['user'])
+    assert fieldset.fields == {'status'}
+    assert set(fieldset.include) == {'order_items', 'user'}
+    assert fieldset.include['user'].fields is None  # Included whole
+    items = fieldset.include['order_items']
+    assert items.fields == {'quantity'}
+    assert items.include['ticket_type'].fields == {'name'}
+
+
+@pytest.mark.parametrize('fields, include, message', [
+    (['nope'], [], "Unknown field 'nope'"),
+    (['order_items.nope'], [], "Unknown field 'order_items.nope'"),
+    ([], ['payments'], "Unknown relationship 'payments'"),
+    ([], ['order_items.concert'], "Unknown relationship 'order_items.concert'"),
+])
+def test_unknown_names_are_rejected(fields, include, message):
+    with pytest.raises(FieldsetError, match=message):
+        Order.check_fieldset(Fieldset.parse(fields, include))
+
+
+def test_to_dict_keeps_primary_keys_and_only_the_requested_relationships():
+    concert = Concert(concert_id=7, title='Sparse', venue='Hall', date=date(2031, 4, 1), time=time(20, 30),
+                      status='upcoming')
+    concert.ticket_types = [TicketType(ticket_type_id=3, concert_id=7, name='GA', price=10,
+                                       quantity_total=5, quantity_available=5)]
+
+    assert concert.to_dict(Fieldset.parse(['title'])) == {'concert_id': 7, 'title': 'Sparse'}
+    assert concert.to_dict(Fieldset.parse(['time', 'ticket_types.price'])) == {
+        'concert_id': 7, 'time': '20:30:00', 'ticket_types': [{'ticket_type_id': 3, 'price': 10}]
+    }
+    assert 'ticket_types' in concert.to_dict()
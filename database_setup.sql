@@ -10,6 +10,7 @@ DROP TABLE IF EXISTS orders;
 DROP TABLE IF EXISTS ticket_types;
 DROP TABLE IF EXISTS concerts;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS schema_migrations;
 SET FOREIGN_KEY_CHECKS = 1;
 
 -- 2. Users Table
@@ -88,19 +89,46 @@ CREATE TABLE order_items (
       REFERENCES ticket_types(ticket_type_id)
 ) ENGINE=InnoDB;
 
+-- 6b. Schema_Migrations Table (progress/checkpoints of backend/data_migrations)
+CREATE TABLE schema_migrations (
+    name VARCHAR(100) PRIMARY KEY,
+    version INT NOT NULL UNIQUE,
+    status ENUM('running', 'completed', 'failed') NOT NULL DEFAULT 'running',
+    step INT NOT NULL DEFAULT 0,
+    last_pk BIGINT NOT NULL DEFAULT 0,
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL
+) ENGINE=InnoDB;
+
 -- 7. Indexes for Join Performance
 CREATE INDEX idx_tt_concert_id
   ON ticket_types(concert_id);
 
-CREATE INDEX idx_o_user_id
-  ON orders(user_id);
-
 CREATE INDEX idx_oi_order_id
   ON order_items(order_id);
 
 CREATE INDEX idx_oi_ticket_type_id
   ON order_items(ticket_type_id);
 
+-- 7b. Composite indexes for hot filters (also serve the foreign keys via their leftmost column)
+-- get_user_orders: WHERE user_id = ? ORDER BY created_at DESC
+CREATE INDEX idx_o_user_created_at
+  ON orders(user_id, created_at);
+
+-- Admin order list & dashboard: WHERE status = ? [AND created_at >= ?] ORDER BY created_at DESC
+CREATE INDEX idx_o_status_created_at
+  ON orders(status, created_at);
+
+-- Catalogue: WHERE status = ? ORDER BY date DESC, time DESC
+CREATE INDEX idx_c_status_date_time
+  ON concerts(status, date, time);
+
+-- Admin user list & dashboard: WHERE role = ? ORDER BY created_at DESC
+CREATE INDEX idx_u_role_created_at
+  ON users(role, created_at);
+
 -- 8. Insert Initial Admin User (password: admin123)
 INSERT INTO users (name, email, password, role)
 VALUES ('Admin User', 'kelompok1@gmail.com', '$2a$10$LCSC74YNnTqBpD9/IYKDb.WCU0iw/QwRBYXM3FmZcUNtELIZECkGW', 'admin');
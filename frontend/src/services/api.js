@@ -72,11 +72,19 @@ const api = axios.create({
   timeout: 15000, // 15 second timeout
 });
 
+// Signed marker from the backend's last write; echoing it keeps our reads
+// on the primary database until the read replicas have caught up
+let lastWriteMarker = null;
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   (config) => {
     const token = getToken();
     
+    if (lastWriteMarker) {
+      config.headers['X-Last-Write'] = lastWriteMarker;
+    }
+    
     console.log(`📤 API Request: ${config.method?.toUpperCase()} ${config.url}`);
     
     if (token) {
@@ -110,6 +118,10 @@ api.interceptors.request.use(
 // Response interceptor to handle errors and responses
 api.interceptors.response.use(
   (response) => {
+    if (response.headers?.['x-last-write']) {
+      lastWriteMarker = response.headers['x-last-write'];
+    }
+    
     // Log successful responses
     console.log(`📥 API Success: ${response.config.method?.toUpperCase()} ${response.config.url}`, {
       status: response.status,
@@ -1,5 +1,7 @@
 import api from './api';
 
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001/api';
+
 export const concertsAPI = {
   // Public endpoints
   getConcerts: (params = {}) => {
@@ -14,6 +16,14 @@ export const concertsAPI = {
   
   getConcert: (id) => api.get(`/concerts/${id}`),
   getConcertTickets: (id) => api.get(`/concerts/${id}/tickets`),
+  // Returns { fields, availability: { [concertId]: [[ticket_type_id, price, available], ...] } }
+  getAvailability: (ids = []) => api.get(`/concerts/availability?ids=${ids.join(',')}`),
+  // Live availability via Server-Sent Events; returns a function that closes the stream
+  subscribeAvailability: (id, onUpdate) => {
+    const source = new EventSource(`${API_BASE_URL}/concerts/${id}/availability/stream`);
+    source.addEventListener('availability', (event) => onUpdate(JSON.parse(event.data)));
+    return () => source.close();
+  },
   
   // Admin endpoints
   createConcert: (concertData) => api.post('/concerts', concertData),